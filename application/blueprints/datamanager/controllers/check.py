@@ -2,8 +2,6 @@ import logging
 from datetime import datetime
 
 from flask import redirect, render_template, request, session, url_for
-from shapely import wkt
-from shapely.geometry import mapping
 
 from . import ControllerError
 from .transform import _point_feature, fetch_boundary_geojson
@@ -22,12 +20,14 @@ from ..services.dataset_field import (
 from ..services.organisation import (
     get_organisation_name,
 )
+from ..services.resource_index import ResourceIndex
 from ..utils import (
     build_check_tables,
 )
 from ..utils.configure import (
     build_column_mapping_rows,
 )
+from ..utils.geometry import parse_geometry
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +66,11 @@ def handle_check_results(request_id, result):
         result.get("status") in ["PENDING", "PROCESSING", "QUEUED"]
         or result.get("response") is None
     ):
-        return render_template("datamanager/check-results-loading.html", result=result)
+        return render_template(
+            "datamanager/check-results-loading.html",
+            result=result,
+            request_id=request_id,
+        )
 
     # Check async error
     response_data = result.get("response")
@@ -85,63 +89,31 @@ def handle_check_results(request_id, result):
     page_start = start_offset + 1
     page_end = start_offset + len(resp_details)
 
-    # Geometry mapping creation
+    # Geometry mapping creation, from the page's rows indexed in one pass.
     geometries = []
     geometry_points = []
-    for row in resp_details:
-        converted_row = row.get("converted_row") or {}
-        transformed_row = row.get("transformed_row") or []
-
-        geometry_entry = None
-        point_entry = None
-        if isinstance(transformed_row, list):
-            geometry_entry = next(
-                (
-                    item
-                    for item in transformed_row
-                    if isinstance(item, dict)
-                    and (
-                        item.get("field") == "geometry" or item.get("field") == "point"
-                    )
-                ),
-                None,
+    for entry in ResourceIndex.build(resp_details).entries:
+        if not entry.first_shape_wkt:
+            continue
+        try:
+            parsed_geom = parse_geometry(entry.first_shape_wkt)
+            properties = {
+                "entity": entry.entity,
+                "reference": entry.reference,
+                "name": entry.name,
+            }
+            geometries.append(
+                {
+                    "type": "Feature",
+                    "geometry": parsed_geom.geojson,
+                    "properties": properties,
+                }
             )
-            point_entry = next(
-                (
-                    item
-                    for item in transformed_row
-                    if isinstance(item, dict) and item.get("field") == "point"
-                ),
-                None,
+            geometry_points.append(_point_feature(parsed_geom, entry.point, properties))
+        except Exception as e:
+            logger.warning(
+                f"Error parsing geometry for entry {entry.entry_number}: {e}"
             )
-        if geometry_entry and geometry_entry.get("value"):
-            try:
-                shapely_geom = wkt.loads(geometry_entry["value"])
-                geom = mapping(shapely_geom)
-                properties = {
-                    "entity": str(row.get("entity", "")),
-                    "reference": converted_row.get("reference")
-                    or converted_row.get("Reference")
-                    or f"Entry {row.get('entry_number')}",
-                    "name": converted_row.get("name", ""),
-                }
-                geometries.append(
-                    {
-                        "type": "Feature",
-                        "geometry": geom,
-                        "properties": properties,
-                    }
-                )
-                geometry_points.append(
-                    _point_feature(
-                        shapely_geom, (point_entry or {}).get("value"), properties
-                    )
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Error parsing geometry for entry {row.get('entry_number')}: {e}"
-                )
-                continue
 
     # Generate boundary GeoJSON for the LPA (shared, timed helper)
     boundary_geojson_url = fetch_boundary_geojson(organisation_code)
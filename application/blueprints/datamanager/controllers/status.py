@@ -0,0 +1,17 @@
+from flask import jsonify, request
+
+from ..services.request_status import get_request_status
+
+
+def handle_request_status(request_id):
+    """Return an async request's status as JSON, for loading pages to poll.
+
+    An optional ``wait`` query arg (seconds) long-polls for a change.
+    """
+    try:
+        wait = float(request.args.get("wait", 0))
+    except ValueError:
+        wait = 0
+    response = jsonify(get_request_status(request_id, wait=wait))
+    response.headers["Cache-Control"] = "no-store"
+    return response
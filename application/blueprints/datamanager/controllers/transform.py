@@ -1,41 +1,53 @@
 import json
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 
-import requests
+import numpy as np
+import pandas as pd
 from flask import current_app, render_template, request as flask_request
-from shapely import wkt
-from shapely.geometry import mapping
 
 from . import ControllerError
+from application.extensions import cache, process_pool
 from application.utils import compute_hash
-from ..services.async_api import fetch_response_details
+from ..services import boundary_store, prewarm
+from ..services.async_api import (
+    fetch_request,
+    fetch_response_details,
+)
 from ..services.dataset import get_dataset_name, get_dataset_typology
+from ..services.dataset_field import get_field_names_for_dataset
 from ..services.organisation import get_org_entity, get_organisation_name
+from ..services.request_status import when_done
+from ..services.resource_index import (
+    ResourceIndex,
+    get_resource_index,
+    normalise_entity_id,
+)
+from ..services.response_rows import compact_row
+from ..utils.clusters import ClusterIndex, abbreviate_count
+from ..utils.geometry import (
+    MAX_MAP_ZOOM,
+    geojson_features,
+    geometries_differ,
+    geometry_cache,
+    parse_geometry,
+)
 from ..services.doc_crawler import check_endpoint_in_doc, is_gov_uk_url
+from ..services.entity_store import get_platform_entities, high_water_mark
 from ..services.endpoint import (
     get_endpoint_log_summary_for_hashes,
     get_endpoint_info_for_hashes,
 )
 from ..services.planning_data import (
-    get_entities_for_organisation_and_dataset,
     get_entity_count_for_organisation_and_dataset,
+    iter_entities_for_organisation_and_dataset,
 )
-from ..utils import REQUESTS_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 
-def _entity_search_url(dataset_id, reference):
-    base = current_app.config["PLANNING_BASE_URL"]
-    return f"{base}/entity.json?dataset={dataset_id}&reference={reference}"
-
-
-def _entity_geojson_url(reference):
-    base = current_app.config["PLANNING_BASE_URL"]
-    return f"{base}/entity.geojson?reference={reference}"
-
-
 _TRANSFORM_COLS = [
     "entry_number",
     "entity",
@@ -69,24 +81,10 @@ _ENTITY_COL_EXCLUDE = {
 _ENTITY_COL_PRIORITY = ["entity", "reference", "name"]
 _ROWS_PER_PAGE = 500
 _PLATFORM_ENTITY_LIMIT = 10000
+_ENTITY_COMPARISON_CACHE_TIMEOUT = 3600  # seconds
 _GEO_FIELDS = {"geometry", "point"}
 _DATE_PREFIX_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ]")
 _CHANGED_VALUE_MAX_LEN = 200
-# Hausdorff-distance tolerance in EPSG:4326 degrees. 1e-4 deg is roughly 10m
-# of perpendicular deviation at UK latitudes: large enough to absorb
-# reprocessing noise (coordinate precision, vertex ordering/sliding,
-# geometry-type wrapping) but still small enough to detect a genuinely moved
-# boundary.
-_GEO_TOLERANCE = 1e-4
-
-
-def _normalise_entity_id(raw) -> str:
-    if raw is None or raw == "":
-        return ""
-    try:
-        return str(int(float(str(raw))))
-    except (ValueError, TypeError):
-        return str(raw)
 
 
 def _normalise_field_value(value) -> str:
@@ -109,127 +107,210 @@ def _normalise_field_value(value) -> str:
     return s
 
 
-def _geometries_differ(res_wkt: str, plat_wkt: str) -> bool:
+def _batch_geometries_differ(res_wkts: list, plat_wkts: list) -> list:
+    """geometries_differ, split across the process pool for a large batch."""
+    return [
+        differs
+        for chunk in process_pool.map_chunks(geometries_differ, res_wkts, plat_wkts)
+        for differs in chunk
+    ]
+
+
+def _has_value(value) -> bool:
+    return bool(str(value or "").strip())
+
+
+_NO_VALUE_ON_PLATFORM = "(no value on platform)"
+
+
+def _entity_frame(records: list) -> pd.DataFrame:
+    """
+    Many dicts as one object-dtype frame: values keep their types (no 1 ->
+    1.0 or None -> NaN inference) and a field a record doesn't have is NaN.
     """
-    True when two WKT geometries represent meaningfully different shapes.
+    return pd.DataFrame(records, dtype=object)
+
 
-    Uses Hausdorff distance so that reprocessing artefacts (coordinate
-    precision, vertex ordering, POINT vs MULTIPOINT wrapping) are ignored,
-    while a genuine move of a boundary or point is detected.
+def _frame_arrays(frame: pd.DataFrame, records: list, columns: list) -> tuple:
     """
-    try:
-        g1 = wkt.loads(res_wkt)
-        g2 = wkt.loads(plat_wkt)
-    except Exception:
-        # Unparseable — fall back to an exact text comparison.
-        return str(res_wkt).strip() != str(plat_wkt).strip()
-    if g1.is_empty or g2.is_empty:
-        return g1.is_empty != g2.is_empty
-    try:
-        return g1.hausdorff_distance(g2) > _GEO_TOLERANCE
-    except Exception:
-        return not g1.equals(g2)
+    Return (values, absent, display) 2-D arrays of the columns of a frame of
+    records (see _entity_frame): the values, a mask of the fields each record
+    doesn't have, and each value as the entities table shows it (str(), blank
+    if absent).
+    """
+    values = frame.reindex(columns=columns).to_numpy(dtype=object)
+    # Missing fields are NaN, but so is a field whose value is NaN; only the
+    # keys tell them apart, so just the NaN cells are looked up.
+    absent = pd.isna(values) & (values != None)  # noqa: E711
+    rows, cols = np.nonzero(absent)
+    for i, c in zip(rows.tolist(), cols.tolist()):
+        if columns[c] in records[i]:
+            absent[i, c] = False
+    display = pd.DataFrame(values).astype(str).to_numpy(dtype=object)
+    display[absent] = ""
+    return values, absent, display
+
+
+def _normalised_column(display: np.ndarray, blank: np.ndarray) -> np.ndarray:
+    """
+    _normalise_field_value over a column given its display text, "" where
+    blank (None or absent). Values are factorised by their text and only the
+    uniques normalised.
+    """
+    if not len(display):
+        return display
+    codes, uniques = pd.factorize(display)
+    normalised = np.array([_normalise_field_value(u) for u in uniques], dtype=object)
+    return np.where(blank, "", normalised[codes])
 
 
-def _diff_entity_fields(resource_fields: dict, platform_entity: dict) -> dict:
+def _changed_field_masks(res: tuple, plat: tuple, columns: list):
     """
-    Return {column: platform_value} for fields whose resource value differs
-    from the platform entity's value. Only fields the resource provided are
-    compared. Geometry/point are compared by shape (see _geometries_differ)
-    rather than raw WKT, since platform geometry is reprocessed and never
-    matches the submitted text.
+    Compare matched (resource fields, platform entity) pairs column by column.
+    res and plat are the pairs' (values, absent, display) arrays (see
+    _frame_arrays), row-aligned. Yields (column, positions, platform texts)
+    for the pairs whose value differs; only fields the resource provided are
+    compared. Values are compared normalised (_normalise_field_value), and
+    geometry/point by shape (utils.geometry) rather than raw WKT, since
+    platform geometry is reprocessed and never matches the submitted text.
     """
-    changed = {}
-    for col, res_val in resource_fields.items():
+    res_values, res_absent, res_display = res
+    plat_values, plat_absent, plat_display = plat
+    geo_keys, geo_res, geo_plat = [], [], []
+    for c, col in enumerate(columns):
         if col == "entity" or col in _ENTITY_COL_EXCLUDE:
             continue
-        plat_val = platform_entity.get(col)
+        present = ~res_absent[:, c]
+        if not present.any():
+            continue
+        plat_blank = plat_absent[:, c] | (plat_values[:, c] == None)  # noqa: E711
         if col in _GEO_FIELDS:
-            res_has = bool(str(res_val or "").strip())
-            plat_has = bool(str(plat_val or "").strip())
-            if res_has != plat_has:
-                changed[col] = "on platform" if plat_has else "(no value on platform)"
-            elif res_has and plat_has and _geometries_differ(res_val, plat_val):
-                changed[col] = "(different geometry on platform)"
+            res_has = present & np.fromiter(
+                map(_has_value, res_values[:, c]), dtype=bool, count=len(present)
+            )
+            plat_has = ~plat_absent[:, c] & np.fromiter(
+                map(_has_value, plat_values[:, c]), dtype=bool, count=len(present)
+            )
+            mismatch = np.flatnonzero(present & (res_has != plat_has))
+            yield col, mismatch, np.where(
+                plat_has[mismatch], "on platform", _NO_VALUE_ON_PLATFORM
+            ).tolist()
+            both = np.flatnonzero(res_has & plat_has)
+            geo_keys.extend((col, i) for i in both.tolist())
+            geo_res.extend(res_values[both, c].tolist())
+            geo_plat.extend(plat_values[both, c].tolist())
             continue
-        if _normalise_field_value(res_val) != _normalise_field_value(plat_val):
-            changed[col] = str(
-                plat_val if plat_val not in (None, "") else "(no value on platform)"
-            )[:_CHANGED_VALUE_MAX_LEN]
-    return changed
+        # Normalise both sides together so values they share are done once.
+        res_blank = res_values[present, c] == None  # noqa: E711
+        normalised = _normalised_column(
+            np.concatenate([res_display[present, c], plat_display[:, c]]),
+            np.concatenate([res_blank, plat_blank]),
+        )
+        res_norm = np.full(len(present), "", dtype=object)
+        res_norm[present] = normalised[: len(res_blank)]
+        differs = np.flatnonzero(present & (res_norm != normalised[len(res_blank) :]))
+        yield col, differs, [
+            (
+                _NO_VALUE_ON_PLATFORM
+                if plat_blank[i] or text == ""
+                else text[:_CHANGED_VALUE_MAX_LEN]
+            )
+            for i, text in zip(differs.tolist(), plat_display[differs, c].tolist())
+        ]
 
+    if geo_keys:
+        differs = _batch_geometries_differ(geo_res, geo_plat)
+        for col in columns:
+            positions = [i for (c, i), d in zip(geo_keys, differs) if d and c == col]
+            yield col, positions, ["(different geometry on platform)"] * len(positions)
 
-def _build_entities_data(resp_details: list, platform_entities: list) -> dict:
+
+def _build_entities_data(resource: ResourceIndex, platform_entities: list) -> dict:
     """
-    Pivot transformed facts from resp_details by entity and combine with
-    platform entities. Returns a dict with 'columns' and 'rows', where each
+    Combine the resource's entities (a ResourceIndex) with platform
+    entities. Returns a dict with 'columns' and 'rows', where each
     row has 'fields' (dict), 'category' (str), and 'changed_fields' (dict).
+
+    Columnar: each side is one object array, entities are aligned by
+    normalised entity id, each column is normalised and diffed as a whole
+    (_changed_field_masks) and the categories are array operations; rows are
+    only assembled at the end.
     """
-    pivoted = {}
-    for item in resp_details:
-        facts = item.get("transformed_row") or []
-        if not isinstance(facts, list) or not facts:
-            continue
-        entity_id = _normalise_entity_id(facts[0].get("entity", ""))
-        if not entity_id:
-            continue
-        pivoted[entity_id] = {
-            fact.get("field", ""): fact.get("value", "")
-            for fact in facts
-            if fact.get("field")
-        }
+    pivoted = resource.entities
+    res_ids = list(pivoted)
 
     platform_by_id = {
-        _normalise_entity_id(e.get("entity", "")): e for e in platform_entities
+        normalise_entity_id(e.get("entity", "")): e for e in platform_entities
     }
-    platform_entity_ids = set(platform_by_id)
-    in_both_ids = set(pivoted.keys()) & platform_entity_ids
-
-    all_col_keys = set(_ENTITY_COL_PRIORITY)
-    for fields in pivoted.values():
-        all_col_keys.update(fields.keys())
-    for e in platform_entities:
-        all_col_keys.update(e.keys())
+    plat_ids = pd.Index(list(platform_by_id), dtype=object)
+
+    res_records = list(pivoted.values())
+    plat_records = list(platform_by_id.values())
+    res_frame = _entity_frame(res_records)
+    plat_frame = _entity_frame(plat_records)
+    # Every platform entity's fields count, including those of duplicates
+    # dropped above.
+    all_col_keys = set(_ENTITY_COL_PRIORITY).union(res_frame.columns)
+    if len(platform_by_id) == len(platform_entities):
+        all_col_keys.update(plat_frame.columns)
+    else:
+        all_col_keys.update(*(e.keys() for e in platform_entities))
     all_col_keys -= _ENTITY_COL_EXCLUDE
     columns = _ENTITY_COL_PRIORITY + sorted(all_col_keys - set(_ENTITY_COL_PRIORITY))
 
-    rows = []
-    for entity_id, fields in pivoted.items():
-        entity_on_platform = entity_id in in_both_ids
-        changed_fields = (
-            _diff_entity_fields(fields, platform_by_id[entity_id])
-            if entity_on_platform
-            else {}
-        )
-        # Category drives both the row colour and the table filter:
-        #   new      - only in this resource (green)
-        #   changed  - on the platform and in this resource, with a difference (orange)
-        #   in_both  - on the platform and in this resource, unchanged (yellow)
-        if not entity_on_platform:
-            category = "new"
-        elif changed_fields:
-            category = "changed"
-        else:
-            category = "in_both"
-        rows.append(
-            {
-                "fields": {
-                    col: (entity_id if col == "entity" else str(fields.get(col, "")))
-                    for col in columns
-                },
-                "category": category,
-                "changed_fields": changed_fields,
-            }
-        )
-    for entity_id, e in platform_by_id.items():
-        if entity_id not in pivoted:
-            rows.append(
-                {
-                    "fields": {col: str(e.get(col, "")) for col in columns},
-                    "category": "existing",
-                    "changed_fields": {},
-                }
-            )
+    res_values, res_absent, res_display = _frame_arrays(res_frame, res_records, columns)
+    plat_values, plat_absent, plat_display = _frame_arrays(
+        plat_frame, plat_records, columns
+    )
+
+    # Position of each resource entity among the platform's, -1 if not there.
+    match = plat_ids.get_indexer(pd.Index(res_ids, dtype=object))
+    in_both = np.flatnonzero(match >= 0)
+    on_platform = match[in_both]
+
+    changed_fields = {i: {} for i in in_both.tolist()}
+    changed_any = np.zeros(len(res_ids), dtype=bool)
+    for col, positions, texts in _changed_field_masks(
+        (res_values[in_both], res_absent[in_both], res_display[in_both]),
+        (
+            plat_values[on_platform],
+            plat_absent[on_platform],
+            plat_display[on_platform],
+        ),
+        columns,
+    ):
+        rows_changed = in_both[positions]
+        changed_any[rows_changed] = True
+        for i, text in zip(rows_changed.tolist(), texts):
+            changed_fields[i][col] = text
+
+    # Category drives both the row colour and the table filter:
+    #   new      - only in this resource (green)
+    #   changed  - on the platform and in this resource, with a difference (orange)
+    #   in_both  - on the platform and in this resource, unchanged (yellow)
+    #   existing - only on the platform (blue)
+    categories = np.where(
+        match < 0, "new", np.where(changed_any, "changed", "in_both")
+    ).tolist()
+
+    res_display[:, columns.index("entity")] = res_ids
+    rows = [
+        {
+            "fields": dict(zip(columns, values)),
+            "category": category,
+            "changed_fields": changed_fields.get(i, {}),
+        }
+        for i, (values, category) in enumerate(zip(res_display.tolist(), categories))
+    ]
+    existing = np.flatnonzero(~plat_ids.isin(res_ids))
+    rows.extend(
+        {
+            "fields": dict(zip(columns, values)),
+            "category": "existing",
+            "changed_fields": {},
+        }
+        for values in plat_display[existing].tolist()
+    )
 
     return {"columns": columns, "rows": rows}
 
@@ -282,19 +363,48 @@ def _add_assign_entities_selection_metadata(
     return entities_data
 
 
-def _entity_row_matches_search(row: dict, search_query: str) -> bool:
-    if not search_query:
-        return True
-
+def _entity_search_text(row: dict) -> str:
+    # Geometry/point WKT is left out: it's never searched for, and would
+    # otherwise make up nearly all of the text held for polygon datasets.
     fields = row.get("fields") or {}
-    row_text = " ".join(str(value) for value in fields.values()).lower()
-    return search_query.lower() in row_text
+    return " ".join(
+        str(value) for col, value in fields.items() if col not in _GEO_FIELDS
+    ).lower()
 
 
-def _entity_row_matches_filter(row: dict, category_filter: str) -> bool:
-    if not category_filter:
-        return True
-    return row.get("category") == category_filter
+def _build_search_index(rows: list) -> dict:
+    """
+    Precompute what entity search and filtering need, once per comparison:
+    'texts' holds each row's lowercased field text (by row position) and
+    'categories' the row positions in each category.
+    """
+    categories = {}
+    for position, row in enumerate(rows):
+        categories.setdefault(row.get("category"), []).append(position)
+    return {
+        "texts": [_entity_search_text(row) for row in rows],
+        "categories": categories,
+    }
+
+
+def _matching_row_positions(
+    search_index: dict, search_query: str, category_filter: str
+) -> list:
+    """
+    Positions of the rows in category_filter (all rows if empty) whose field
+    text contains search_query, case-insensitively. A reference or name prefix
+    matches, as does any part of any non-geometry field.
+    """
+    texts = search_index["texts"]
+    positions = (
+        search_index["categories"].get(category_filter, [])
+        if category_filter
+        else range(len(texts))
+    )
+    if not search_query:
+        return list(positions)
+    query = search_query.lower()
+    return [position for position in positions if query in texts[position]]
 
 
 def _dedup_candidate_redirect_key(candidate: dict) -> tuple[str, str]:
@@ -456,49 +566,245 @@ def _resolve_existing_endpoints(
     return existing_endpoints
 
 
+def _platform_entity_fields(dataset_id: str):
+    """
+    The platform entity fields the entities table and map use for a dataset,
+    as a sorted tuple, or None (every field) if the dataset's fields can't be
+    read. That is the dataset's specification fields, which are all a resource
+    can provide, plus entity/reference/name, and geometry/point for the map of
+    a geography dataset. Other datasets' entities come without geometry.
+    """
+    try:
+        fields = set(get_field_names_for_dataset(dataset_id))
+    except Exception as e:
+        logger.warning(f"Fetching every platform entity field for {dataset_id}: {e}")
+        return None
+    if not fields:
+        return None
+    fields = (fields | set(_ENTITY_COL_PRIORITY)) - _ENTITY_COL_EXCLUDE
+    if get_dataset_typology(dataset_id) == "geography":
+        fields |= _GEO_FIELDS
+    return tuple(sorted(fields))
+
+
 def _fetch_platform_entities(organisation_code: str, dataset_id: str) -> tuple:
     org_entity = get_org_entity(organisation_code)
-    existing_count = (
-        get_entity_count_for_organisation_and_dataset(org_entity, dataset_id)
-        if org_entity is not None
-        else 0
+    if org_entity is None:
+        return [], False, 0
+    # None if the count couldn't be read: the entities are then read in full,
+    # and the entity store skips the checks it would make against the count.
+    existing_count = get_entity_count_for_organisation_and_dataset(
+        org_entity, dataset_id, default=None
     )
-    platform_too_large = existing_count > _PLATFORM_ENTITY_LIMIT
-    platform_entities = (
-        get_entities_for_organisation_and_dataset(org_entity, dataset_id)
-        if org_entity is not None and not platform_too_large
-        else []
+    if existing_count is not None and existing_count > _PLATFORM_ENTITY_LIMIT:
+        return [], True, existing_count
+    platform_entities = get_platform_entities(
+        org_entity,
+        dataset_id,
+        count=existing_count,
+        fields=_platform_entity_fields(dataset_id),
     )
-    return platform_entities, platform_too_large, existing_count
+    if existing_count is None:
+        existing_count = len(platform_entities)
+    return platform_entities, False, existing_count
+
+
+def _compare_entities(resource: ResourceIndex, platform_entities: list) -> dict:
+    """
+    The full entity comparison: _build_entities_data plus the category counts,
+    which cover every entity regardless of search or filter so the summary
+    boxes always show the full picture, and the search index each entity
+    search and filter is answered from (see _build_search_index).
+    """
+    comparison = _build_entities_data(resource, platform_entities)
+    comparison["category_counts"] = _count_categories(comparison["rows"])
+    comparison["search_index"] = _build_search_index(comparison["rows"])
+    return comparison
+
+
+def _entity_sort_key(entity_id: str) -> tuple:
+    # Entity numbers order numerically; anything else sorts after them.
+    return (0, int(entity_id), "") if entity_id.isdigit() else (1, 0, entity_id)
+
+
+def _merge_join_platform_entities(
+    resource_entity_ids, platform_entities, existing_limit: int = _PLATFORM_ENTITY_LIMIT
+) -> tuple:
+    """
+    Merge-join a stream of platform entities, in entity number order, against
+    the resource's entity ids sorted the same way.
+
+    Returns (matched, existing, existing_total): the platform entities that are
+    also in the resource, the first existing_limit platform-only entities, and
+    how many platform-only entities there were in all. Nothing else from the
+    stream is kept, so memory is bounded by the resource and existing_limit
+    however many entities the platform holds. Raises ValueError if the stream
+    isn't in entity order, since the join would then misclassify entities.
+    """
+    resource_keys = sorted(_entity_sort_key(eid) for eid in resource_entity_ids)
+    i = 0
+    previous = None
+    matched, existing, existing_total = [], [], 0
+    for entity in platform_entities:
+        entity_id = normalise_entity_id(entity.get("entity", ""))
+        if not entity_id:
+            continue
+        key = _entity_sort_key(entity_id)
+        if previous is not None and key < previous:
+            raise ValueError(
+                f"Platform entities are not in entity order at entity {entity_id}"
+            )
+        previous = key
+        while i < len(resource_keys) and resource_keys[i] < key:
+            i += 1
+        if i < len(resource_keys) and resource_keys[i] == key:
+            matched.append(entity)
+        else:
+            existing_total += 1
+            if len(existing) < existing_limit:
+                existing.append(entity)
+    return matched, existing, existing_total
+
+
+def _stream_compare_entities(
+    resource: ResourceIndex, organisation_entity, dataset_id: str
+) -> dict:
+    """
+    _compare_entities for organisations with more than _PLATFORM_ENTITY_LIMIT
+    platform entities: pages are streamed and merge-joined against the
+    resource, so every resource entity is categorised without loading the
+    platform's entities. The table lists the first _PLATFORM_ENTITY_LIMIT
+    platform-only entities, while category_counts covers all of them.
+
+    'platform_entities' holds the platform entities kept (matched plus listed
+    platform-only ones), for the map.
+    """
+    matched, existing, existing_total = _merge_join_platform_entities(
+        resource.entities,
+        iter_entities_for_organisation_and_dataset(
+            organisation_entity, dataset_id, _platform_entity_fields(dataset_id)
+        ),
+        existing_limit=_PLATFORM_ENTITY_LIMIT,
+    )
+    platform_entities = matched + existing
+    comparison = _compare_entities(resource, platform_entities)
+    comparison["category_counts"]["existing"] = existing_total
+    comparison["existing_rows_shown"] = len(existing)
+    comparison["platform_entities"] = platform_entities
+    return comparison
+
+
+def _streamed_entity_comparison(
+    request_id: str,
+    resource: ResourceIndex,
+    organisation_code: str,
+    dataset_id: str,
+    existing_count: int,
+) -> dict:
+    """
+    _stream_compare_entities for a request, cached like _entity_comparison.
+    Streaming is what avoids holding the platform's entities, so the platform
+    entity count stands in for the snapshot (see _platform_snapshot).
+    """
+    snapshot = f"streamed.{organisation_code}.{dataset_id}.{existing_count}"
+    key = f"transform.entity_comparison.{request_id}.{snapshot}"
+    comparison = cache.get(key)
+    if comparison is None:
+        comparison = _stream_compare_entities(
+            resource, get_org_entity(organisation_code), dataset_id
+        )
+        comparison["snapshot"] = snapshot
+        cache.set(key, comparison, timeout=_ENTITY_COMPARISON_CACHE_TIMEOUT)
+    return comparison
+
+
+def _platform_snapshot(platform_entities: list) -> str:
+    """
+    Identify a read of the platform entities without serialising them: their
+    count and high-water mark (see entity_store). Adding or editing an entity
+    on the platform moves the latter and removing one changes the former.
+    """
+    return f"{len(platform_entities)}.{high_water_mark(platform_entities)}"
+
+
+def _entity_comparison(
+    request_id: str, resource: ResourceIndex, platform_entities: list
+) -> dict:
+    """
+    _compare_entities for a request, cached per (request_id, platform snapshot).
+
+    The resource side of a finished request never changes, so the comparison
+    (and every geometry diff in it) is only redone when the platform entities
+    do; paging, search and filtering then just slice the cached rows.
+    """
+    snapshot = _platform_snapshot(platform_entities)
+    key = f"transform.entity_comparison.{request_id}.{snapshot}"
+    comparison = cache.get(key)
+    if comparison is None:
+        comparison = _compare_entities(resource, platform_entities)
+        comparison["snapshot"] = snapshot
+        cache.set(key, comparison, timeout=_ENTITY_COMPARISON_CACHE_TIMEOUT)
+    return comparison
+
+
+def _request_comparison(
+    request_id: str,
+    resource: ResourceIndex,
+    organisation_code: str,
+    dataset_id: str,
+    platform_result: tuple,
+) -> tuple:
+    """
+    The entity comparison for a request, given _fetch_platform_entities'
+    result. Organisations with more than _PLATFORM_ENTITY_LIMIT entities
+    aren't loaded whole: their pages are streamed and merge-joined instead.
+
+    Returns (comparison, platform_entities, platform_too_large), where
+    platform_entities are those the comparison and map were built from and
+    platform_too_large is only still True if streaming failed.
+    """
+    platform_entities, platform_too_large, existing_count = platform_result
+    if not platform_too_large:
+        comparison = _entity_comparison(request_id, resource, platform_entities)
+        return comparison, platform_entities, False
+    try:
+        comparison = _streamed_entity_comparison(
+            request_id, resource, organisation_code, dataset_id, existing_count
+        )
+        return comparison, comparison["platform_entities"], False
+    except Exception as e:
+        logger.warning(
+            f"Streamed entity comparison failed for {organisation_code}/"
+            f"{dataset_id}: {e}"
+        )
+        return _entity_comparison(request_id, resource, []), [], True
 
 
 def _paginate_entity_data(
-    all_resp_details: list,
-    platform_entities: list,
+    comparison: dict,
     entity_page: int,
     entity_search: str,
     entity_filter: str = "",
     include_selection: bool = False,
     excluded_references=None,
 ) -> tuple:
+    """Slice one page of entity rows out of a comparison (see _compare_entities)."""
     entity_start_offset = (entity_page - 1) * _ROWS_PER_PAGE
-    entities_data_full = _build_entities_data(all_resp_details, platform_entities)
-
-    # Counts cover every entity, independent of the current search/filter, so the
-    # summary boxes always show the full picture.
-    category_counts = _count_categories(entities_data_full["rows"])
+    category_counts = comparison["category_counts"]
+    rows = comparison["rows"]
     if entity_search or entity_filter:
-        entities_data_full["rows"] = [
-            row
-            for row in entities_data_full["rows"]
-            if _entity_row_matches_search(row, entity_search)
-            and _entity_row_matches_filter(row, entity_filter)
+        rows = [
+            rows[position]
+            for position in _matching_row_positions(
+                comparison["search_index"], entity_search, entity_filter
+            )
         ]
-    has_next_entity_page = (
-        len(entities_data_full["rows"]) > entity_start_offset + _ROWS_PER_PAGE
-    )
-    entity_page_rows = entities_data_full["rows"][
-        entity_start_offset : entity_start_offset + _ROWS_PER_PAGE
+    has_next_entity_page = len(rows) > entity_start_offset + _ROWS_PER_PAGE
+    # Copy the page's rows: selection metadata is added to them below, and the
+    # comparison may be shared.
+    entity_page_rows = [
+        dict(row)
+        for row in rows[entity_start_offset : entity_start_offset + _ROWS_PER_PAGE]
     ]
     entity_page_start = (
         entity_page_rows[0]["fields"].get("entity", "") if entity_page_rows else ""
@@ -507,7 +813,7 @@ def _paginate_entity_data(
         entity_page_rows[-1]["fields"].get("entity", "") if entity_page_rows else ""
     )
     entities_data = {
-        "columns": entities_data_full["columns"],
+        "columns": comparison["columns"],
         "rows": entity_page_rows,
     }
     if include_selection:
@@ -527,10 +833,9 @@ def _paginate_entity_data(
 def _build_transform_table(resp_details: list) -> dict:
     rows = []
     for item in resp_details:
+        item = compact_row(item)
         entry_number = str(item.get("entry_number", ""))
-        for fact in item.get("transformed_row") or []:
-            if not isinstance(fact, dict):
-                continue
+        for fact in item.transformed_row:
             row = {
                 "entry_number": entry_number,
                 "entity": str(fact.get("entity", "")),
@@ -552,7 +857,7 @@ def _build_transform_table(resp_details: list) -> dict:
 def _build_issue_log_table(resp_details: list) -> dict:
     rows = []
     for item in resp_details:
-        for issue in item.get("issue_logs") or []:
+        for issue in compact_row(item).issue_logs:
             cols = {}
             for col in _ISSUE_COLS:
                 val = str(issue.get(col, ""))
@@ -575,178 +880,390 @@ def _build_issue_log_table(resp_details: list) -> dict:
     }
 
 
-def _representative_point(shapely_geom, point_wkt=None) -> list:
+def _representative_point(parsed, point_wkt=None) -> list:
     """Return [lon, lat] for a marker. Prefers an explicit POINT wkt; otherwise
     uses representative_point() which is guaranteed to sit inside the shape."""
     if point_wkt:
         try:
-            p = wkt.loads(point_wkt)
+            p = parse_geometry(point_wkt).geometry
             return [p.x, p.y]
         except Exception:
             pass
-    p = shapely_geom.representative_point()
-    return [p.x, p.y]
+    return list(parsed.point)
 
 
-def _point_feature(shapely_geom, point_wkt, properties: dict) -> dict:
+def _point_feature(parsed, point_wkt, properties: dict) -> dict:
+    """parsed is a ParsedGeometry from parse_geometry."""
     props = dict(properties)
-    props["has_polygon"] = shapely_geom.geom_type in ("Polygon", "MultiPolygon")
+    props["has_polygon"] = parsed.geom_type in ("Polygon", "MultiPolygon")
     return {
         "type": "Feature",
         "geometry": {
             "type": "Point",
-            "coordinates": _representative_point(shapely_geom, point_wkt),
+            "coordinates": _representative_point(parsed, point_wkt),
         },
         "properties": props,
     }
 
 
-def _build_geometry_features(
-    platform_entities: list, all_resp_details: list, dataset_id: str
-) -> tuple:
-    """Return (polygon_features, point_features).
-
-    polygon_features keep the original geometry for the boundary layers;
-    point_features carry one representative point per entity for clustering.
+def _geometry_entries(
+    comparison: dict, resource: ResourceIndex, platform_entities: list
+) -> list:
     """
-    platform_by_id = {
-        _normalise_entity_id(str(e.get("entity", ""))): e
-        for e in platform_entities
-        if e.get("entity", "")
+    What the map shows, before any geometry is parsed: one dict per entity
+    with 'wkt' (its shape), 'point_wkt' (an explicit point, if given),
+    'properties' (entity, reference, name and status) and 'label' (for logs).
+    Platform-only entities come first, then every resource shape, whose
+    status is its entity's category in the comparison the map is built with.
+    """
+    resource_entity_ids = set(resource.entities)
+    categories = {
+        row["fields"]["entity"]: row["category"]
+        for row in comparison["rows"]
+        if row["category"] != "existing"
     }
-    platform_entity_ids = set(platform_by_id)
-    resource_entity_ids = set()
-    for item in all_resp_details:
-        facts = item.get("transformed_row") or []
-        if isinstance(facts, list) and facts:
-            entity_id = _normalise_entity_id(facts[0].get("entity", ""))
-            if entity_id:
-                resource_entity_ids.add(entity_id)
-
-    features = []
-    points = []
+
+    entries = []
 
     for entity in platform_entities:
-        entity_id = _normalise_entity_id(str(entity.get("entity", "")))
+        entity_id = normalise_entity_id(str(entity.get("entity", "")))
         if entity_id in resource_entity_ids:
             continue
         geom_wkt = entity.get("geometry") or entity.get("point")
         if not geom_wkt:
             continue
-        try:
-            shp = wkt.loads(geom_wkt)
-            properties = {
-                "entity": entity_id,
-                "reference": entity.get("reference", ""),
-                "name": entity.get("name", ""),
-                "status": "existing",
+        entries.append(
+            {
+                "wkt": geom_wkt,
+                "point_wkt": entity.get("point"),
+                "properties": {
+                    "entity": entity_id,
+                    "reference": entity.get("reference", ""),
+                    "name": entity.get("name", ""),
+                    "status": "existing",
+                },
+                "label": f"platform entity {entity_id}",
             }
-            features.append(
-                {"type": "Feature", "geometry": mapping(shp), "properties": properties}
-            )
-            points.append(_point_feature(shp, entity.get("point"), properties))
-        except Exception as e:
-            logger.warning(
-                "Error parsing geometry for platform entity %s: %s", entity_id, e
-            )
+        )
 
-    for item in all_resp_details:
-        converted_row = item.get("converted_row") or {}
-        transformed_row = item.get("transformed_row") or []
-        if not isinstance(transformed_row, list) or not transformed_row:
-            continue
-        entity_id = _normalise_entity_id(transformed_row[0].get("entity", ""))
-        geom_fact = next(
-            (
-                f
-                for f in transformed_row
-                if isinstance(f, dict) and f.get("field") == "geometry"
-            ),
-            None,
+    for shape in resource.shapes:
+        entries.append(
+            {
+                "wkt": shape.shape_wkt,
+                "point_wkt": shape.point,
+                "properties": {
+                    "entity": shape.entity,
+                    "reference": shape.reference,
+                    "name": shape.name,
+                    # Same categories as the entities table; a shape without
+                    # an entity is new.
+                    "status": categories.get(shape.entity, "new"),
+                },
+                "label": f"resource entry {shape.entry_number}",
+            }
         )
-        point_fact = next(
-            (
-                f
-                for f in transformed_row
-                if isinstance(f, dict) and f.get("field") == "point"
-            ),
-            None,
+
+    return entries
+
+
+def _map_entries(request_id: str, comparison: dict, resource, platform_entities):
+    """
+    _geometry_entries for a request, cached alongside its comparison. Also
+    records the comparison's platform snapshot as the one the request's map
+    is drawn from (see _request_map_entries).
+    """
+    snapshot = comparison["snapshot"]
+    key = f"transform.map_entries.{request_id}.{snapshot}"
+    entries = cache.get(key)
+    if entries is None:
+        entries = _geometry_entries(comparison, resource, platform_entities)
+        cache.set(key, entries, timeout=_ENTITY_COMPARISON_CACHE_TIMEOUT)
+    cache.set(
+        f"transform.map_snapshot.{request_id}",
+        snapshot,
+        timeout=_ENTITY_COMPARISON_CACHE_TIMEOUT,
+    )
+    return entries
+
+
+def _request_map_entries(request_id: str, req: dict) -> tuple:
+    """
+    (snapshot, entries) of a request's review map, for its layer requests.
+
+    The page that shows the map has just built its entries against a platform
+    snapshot, so its layers are served from those without fetching the
+    platform entities again. Only once they have expired is the comparison
+    redone, against the platform as it is now.
+    """
+    snapshot = cache.get(f"transform.map_snapshot.{request_id}")
+    if snapshot is not None:
+        entries = cache.get(f"transform.map_entries.{request_id}.{snapshot}")
+        if entries is not None:
+            return snapshot, entries
+    params = req.get("params") or {}
+    organisation_code = params.get("organisationName") or params.get("organisation", "")
+    dataset_id = params.get("dataset", "")
+    resource = get_resource_index(request_id)
+    comparison, platform_entities, _ = _request_comparison(
+        request_id,
+        resource,
+        organisation_code,
+        dataset_id,
+        _fetch_platform_entities(organisation_code, dataset_id),
+    )
+    entries = _map_entries(request_id, comparison, resource, platform_entities)
+    return comparison["snapshot"], entries
+
+
+def _map_layer_items(entries: list, layer: str, category: str) -> list:
+    """(wkt, properties) items for one layer of one category."""
+    entries = [e for e in entries if e["properties"]["status"] == category]
+    if layer == "shapes":
+        return [(e["wkt"], e["properties"]) for e in entries]
+    # Points prefer an explicit point, as _representative_point does.
+    shapes = geometry_cache.get_many([e["wkt"] for e in entries])
+    points = geometry_cache.get_many([e["point_wkt"] or e["wkt"] for e in entries])
+    return [
+        (
+            (entry["point_wkt"] or entry["wkt"]) if point else entry["wkt"],
+            {
+                **entry["properties"],
+                "has_polygon": shape.geom_type in ("Polygon", "MultiPolygon"),
+            },
         )
-        shape_wkt = (geom_fact or {}).get("value") or (point_fact or {}).get("value")
-        if not shape_wkt:
-            continue
-        if entity_id in platform_entity_ids:
-            resource_fields = {
-                f.get("field", ""): f.get("value", "")
-                for f in transformed_row
-                if isinstance(f, dict) and f.get("field")
-            }
-            # Same four categories as the entities table: a resource entity
-            # already on the platform is "changed" if a field differs, else
-            # "in_both" (present but unchanged).
-            changed = _diff_entity_fields(resource_fields, platform_by_id[entity_id])
-            status = "changed" if changed else "in_both"
-        else:
-            status = "new"
-        try:
-            shp = wkt.loads(shape_wkt)
-            properties = {
-                "entity": entity_id,
-                "reference": (
-                    converted_row.get("reference")
-                    or converted_row.get("Reference")
-                    or f"Entry {item.get('entry_number')}"
-                ),
-                "name": converted_row.get("name", ""),
-                "status": status,
-            }
-            features.append(
-                {"type": "Feature", "geometry": mapping(shp), "properties": properties}
-            )
-            points.append(
-                _point_feature(shp, (point_fact or {}).get("value"), properties)
-            )
-        except Exception as e:
-            logger.warning(
-                "Error parsing geometry for resource entry %s: %s",
-                item.get("entry_number"),
-                e,
-            )
+        for entry, shape, point in zip(entries, shapes, points)
+        if shape is not None
+    ]
 
-    return features, points
 
+def _layer_features(items: list, zoom, as_points: bool) -> tuple:
+    """geojson_features, split across the process pool for a large layer."""
+    chunks = process_pool.map_chunks(
+        geojson_features, items, zoom=zoom, as_points=as_points
+    )
+    if len(chunks) == 1:
+        return chunks[0]
+    return (
+        [feature for features, _ in chunks for feature in features],
+        np.concatenate([bounds for _, bounds in chunks]),
+    )
 
-def fetch_boundary_geojson(organisation_code: str) -> dict:
-    """Fetch the LPA boundary GeoJSON for an organisation.
 
-    Shared by the transform and check-results pages. Every upstream call is
-    given an explicit timeout so an unresponsive service can't block the request
-    thread; any failure falls back to an empty FeatureCollection with a warning.
+def _map_layer(
+    request_id: str, snapshot: str, entries: list, layer: str, category: str, zoom
+) -> tuple:
     """
-    empty = {"type": "FeatureCollection", "features": []}
-    try:
-        if ":" not in organisation_code:
-            return empty
-        lpa_prefix, lpa_id = organisation_code.split(":", 1)
-        resp = requests.get(
-            _entity_search_url(lpa_prefix, lpa_id), timeout=REQUESTS_TIMEOUT
+    The (features, bounds) of geojson_features for one map layer at a zoom,
+    cached per request, platform snapshot, layer, category and zoom.
+    """
+    key = f"transform.map_layer.{request_id}.{snapshot}.{layer}.{category}.{zoom}"
+    result = cache.get(key)
+    if result is None:
+        result = _layer_features(
+            _map_layer_items(entries, layer, category),
+            zoom=zoom,
+            as_points=layer == "points",
         )
-        resp.raise_for_status()
-        d = resp.json()
-        entity = d.get("entities", [])[0] if d and d.get("entities") else None
-        if not entity:
-            return empty
-        reference = (
-            entity.get("local-planning-authority") if entity.get("reference") else ""
+        cache.set(key, result, timeout=_ENTITY_COMPARISON_CACHE_TIMEOUT)
+    return result
+
+
+def _map_clusters(
+    request_id: str, snapshot: str, entries: list, category: str
+) -> tuple:
+    """
+    A ClusterIndex over one category's points layer, and whether any of its
+    entities has a polygon, cached like _map_layer.
+    """
+    key = f"transform.map_clusters.{request_id}.{snapshot}.{category}"
+    result = cache.get(key)
+    if result is None:
+        _, bounds = _map_layer(request_id, snapshot, entries, "points", category, None)
+        has_polygon = any(
+            properties["has_polygon"]
+            for _, properties in _map_layer_items(entries, "points", category)
         )
-        if not reference:
-            return empty
-        return requests.get(
-            _entity_geojson_url(reference), timeout=REQUESTS_TIMEOUT
-        ).json()
+        result = (ClusterIndex(bounds[:, :2]), has_polygon)
+        cache.set(key, result, timeout=_ENTITY_COMPARISON_CACHE_TIMEOUT)
+    return result
+
+
+def _cluster_feature(lon, lat, count, expansion_zoom) -> str:
+    return json.dumps(
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [round(lon, 7), round(lat, 7)],
+            },
+            "properties": {
+                "cluster": True,
+                "point_count": count,
+                "point_count_abbreviated": abbreviate_count(count),
+                "expansion_zoom": expansion_zoom,
+            },
+        }
+    )
+
+
+def _feature_collection_response(features: list, **members):
+    """A GeoJSON FeatureCollection of pre-rendered Feature strings."""
+    extra = "".join(f'"{name}":{json.dumps(value)},' for name, value in members.items())
+    response = current_app.response_class(
+        "{" + extra + '"type":"FeatureCollection","features":['
+        f"{','.join(features)}]}}",
+        mimetype="application/geo+json",
+    )
+    # A completed request's map only changes with the platform entities.
+    response.headers["Cache-Control"] = "private, max-age=300"
+    return response
+
+
+def _map_zoom(value):
+    try:
+        return min(MAX_MAP_ZOOM, max(0, int(float(value))))
+    except (TypeError, ValueError):
+        return None
+
+
+def _map_bbox(value):
+    try:
+        bbox = [float(v) for v in (value or "").split(",")]
+    except ValueError:
+        return None
+    return bbox if len(bbox) == 4 else None
+
+
+def fetch_boundary_geojson(organisation_code: str) -> dict:
+    """Fetch the LPA boundary GeoJSON for an organisation, simplified for the map.
+
+    Shared by the transform and check-results pages, and served from the
+    boundary store once fetched. Every upstream call is given an explicit
+    timeout so an unresponsive service can't block the request thread; any
+    failure falls back to an empty FeatureCollection with a warning.
+    """
+    try:
+        return boundary_store.get_boundary(organisation_code, boundary_store.MAP_ZOOM)
     except Exception as e:
         logger.warning("Failed to fetch boundary data for %s: %s", organisation_code, e)
-        return empty
+        return _EMPTY_BOUNDARY
+
+
+# Marks a _gather call whose failure should fail the page rather than fall back.
+_REQUIRED = object()
+
+
+def _resource_and_page(request_id: str, start_offset: int) -> tuple:
+    """
+    Return a request's ResourceIndex and one page of its full response details.
+
+    The page is read after the index rather than beside it: building the index
+    streams every row through the result store, so the page is then served
+    from the store instead of being fetched from the async API a second time.
+    """
+    resource = get_resource_index(request_id)
+    page = fetch_response_details(request_id, 100, start_offset, _ROWS_PER_PAGE)
+    return resource, page
+
+
+_EMPTY_BOUNDARY = {"type": "FeatureCollection", "features": []}
+
+
+def _gather(calls: dict, deadline: float) -> dict:
+    """
+    Run independent upstream calls concurrently and collect their results.
+
+    calls maps a name to (fn, args, fallback). Each call runs in its own thread
+    under the app. A call that raises, or is still running deadline seconds
+    after the start, gets its fallback instead (and is left to finish in the
+    background, filling any cache it writes). Calls whose fallback is _REQUIRED
+    are waited for without a deadline and their errors propagate.
+    """
+    app = current_app._get_current_object()
+
+    def run(fn, args):
+        with app.app_context():
+            return fn(*args)
+
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=len(calls))
+    try:
+        futures = {
+            name: pool.submit(run, fn, args) for name, (fn, args, _) in calls.items()
+        }
+        results = {}
+        for name, future in futures.items():
+            fallback = calls[name][2]
+            if fallback is _REQUIRED:
+                results[name] = future.result()
+                continue
+            remaining = max(0, deadline - (time.monotonic() - started))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FuturesTimeout:
+                logger.warning(f"{name} not ready within {deadline}s, using fallback")
+                results[name] = fallback
+            except Exception as e:
+                logger.warning(f"{name} failed, using fallback: {e}")
+                results[name] = fallback
+        return results
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _prewarm_boundary(organisation_code: str, dataset_id: str):
+    if get_dataset_typology(dataset_id) == "geography":
+        fetch_boundary_geojson(organisation_code)
+
+
+def _prewarm_completed_request(request_id: str, endpoint_url: str):
+    req = fetch_request(request_id)
+    if req.get("status") != "COMPLETE":
+        return
+    get_resource_index(request_id)
+    response_data = (req.get("response") or {}).get("data") or {}
+    _resolve_existing_endpoints(response_data.get("source-summary") or {}, endpoint_url)
+
+
+def _prewarm_check_transform(request_id: str, params: dict):
+    """
+    Start, in the background, the fetches the results page will make.
+
+    Those that only need the request's parameters start now; reading the
+    response details and the endpoints they name starts once a status poll
+    sees the job finish.
+    """
+    organisation_code = params.get("organisationName") or params.get("organisation", "")
+    dataset_id = params.get("dataset", "")
+    endpoint_url = params.get("url", "")
+    documentation_url = params.get("documentation_url", "")
+
+    if endpoint_url and documentation_url:
+        prewarm.submit(
+            ("endpoint-in-doc", documentation_url, endpoint_url),
+            check_endpoint_in_doc,
+            documentation_url,
+            endpoint_url,
+        )
+    prewarm.submit(
+        ("platform-entities", organisation_code, dataset_id),
+        _fetch_platform_entities,
+        organisation_code,
+        dataset_id,
+    )
+    prewarm.submit(
+        ("boundary", organisation_code, dataset_id),
+        _prewarm_boundary,
+        organisation_code,
+        dataset_id,
+    )
+    when_done(
+        request_id,
+        ("completed-request", request_id),
+        _prewarm_completed_request,
+        request_id,
+        endpoint_url,
+    )
 
 
 def handle_check_transform(
@@ -789,9 +1306,8 @@ def handle_check_transform(
         )
 
     if status in {"PENDING", "PROCESSING", "QUEUED"} or req.get("response") is None:
-        # Pre-warm the cache so the result is ready when the job completes.
-        if endpoint_url and documentation_url:
-            check_endpoint_in_doc(documentation_url, endpoint_url)
+        # Pre-warm the caches so the result is ready when the job completes.
+        _prewarm_check_transform(request_id, params)
         return render_template(
             "datamanager/check-transform-loading.html",
             request_id=request_id,
@@ -800,16 +1316,54 @@ def handle_check_transform(
             transform_endpoint=transform_endpoint,
         )
 
-    # Fetch the response details and platform entities for the organisation and dataset.
-    all_resp_details = fetch_response_details(request_id)
-    platform_entities, platform_too_large, existing_count = _fetch_platform_entities(
-        organisation_code, dataset_id
-    )
-
     response_payload = req.get("response") or {}
     response_data = response_payload.get("data") or {}
     source_summary = response_data.get("source-summary") or {}
-    existing_endpoints = _resolve_existing_endpoints(source_summary, endpoint_url)
+    page_number = max(1, int(flask_request.args.get("page_number", 1)))
+    start_offset = (page_number - 1) * _ROWS_PER_PAGE
+    is_geography = get_dataset_typology(dataset_id) == "geography"
+
+    # The upstream reads below are independent, so run them side by side: the
+    # page waits for the slowest, not the sum. The response details are needed
+    # to render at all; anything else falls back to its empty default if it
+    # fails or misses CHECK_TRANSFORM_FETCH_DEADLINE. The resource index is built
+    # in one streamed pass, so the full rows are never materialised.
+    calls = {
+        "response details": (
+            _resource_and_page,
+            (request_id, start_offset),
+            _REQUIRED,
+        ),
+        "platform entities": (
+            _fetch_platform_entities,
+            (organisation_code, dataset_id),
+            ([], False, 0),
+        ),
+        "existing endpoints": (
+            _resolve_existing_endpoints,
+            (source_summary, endpoint_url),
+            [],
+        ),
+        "endpoint in documentation": (
+            check_endpoint_in_doc,
+            (documentation_url, endpoint_url),
+            {"found": False, "matched_href": None, "error": "Request timed out"},
+        ),
+    }
+    if is_geography:
+        calls["boundary"] = (
+            fetch_boundary_geojson,
+            (organisation_code,),
+            _EMPTY_BOUNDARY,
+        )
+    results = _gather(
+        calls, current_app.config.get("CHECK_TRANSFORM_FETCH_DEADLINE", 25)
+    )
+    resource, resp_details = results["response details"]
+    existing_count = results["platform entities"][2]
+    existing_endpoints = results["existing endpoints"]
+    endpoint_in_doc = results["endpoint in documentation"]
+
     pipelines_append_required = source_summary.get("pipelines_append_required")
     pipeline_summary = response_data.get("pipeline-summary") or {}
     show_dedup_tab = is_assign_entities and dataset_id == "conservation-area"
@@ -822,17 +1376,26 @@ def handle_check_transform(
     )
 
     # Calculate pagination for transformed facts and issue logs, and for entities.
-    page_number = max(1, int(flask_request.args.get("page_number", 1)))
-    start_offset = (page_number - 1) * _ROWS_PER_PAGE
-    resp_details = all_resp_details[start_offset : start_offset + _ROWS_PER_PAGE]
     page_start = start_offset + 1
     page_end = start_offset + len(resp_details)
-    has_next_page = len(all_resp_details) > start_offset + _ROWS_PER_PAGE
+    has_next_page = resource.row_count > start_offset + _ROWS_PER_PAGE
     entity_page = max(1, int(flask_request.args.get("entity_page", 1)))
 
     entity_search = flask_request.args.get("entity_search", "").strip()
     entity_filter = flask_request.args.get("entity_filter", "").strip()
 
+    comparison, platform_entities, platform_too_large = _request_comparison(
+        request_id,
+        resource,
+        organisation_code,
+        dataset_id,
+        results["platform entities"],
+    )
+    # Streamed comparisons list only some of the platform-only entities.
+    existing_rows_shown = comparison.get("existing_rows_shown")
+    if existing_rows_shown == comparison["category_counts"]["existing"]:
+        existing_rows_shown = None
+
     # Build three paginated tables: transformed facts, issue logs, and entities.
     # The entities table is built from the transformed facts and the platform entities.
     (
@@ -842,8 +1405,7 @@ def handle_check_transform(
         entity_page_end,
         category_counts,
     ) = _paginate_entity_data(
-        all_resp_details,
-        platform_entities,
+        comparison,
         entity_page,
         entity_search,
         entity_filter,
@@ -853,22 +1415,16 @@ def handle_check_transform(
     transformed_table = _build_transform_table(resp_details)
     issue_log_table = _build_issue_log_table(resp_details)
 
-    # Build a GeoJSON feature collection for the map if needed, including any platform entities not in the resource,
-    # and any new or updated resource entities with geometry.
-    if get_dataset_typology(dataset_id) == "geography":
-        geometries, geometry_points = _build_geometry_features(
-            platform_entities, all_resp_details, dataset_id
-        )
-        boundary_geojson = (
-            fetch_boundary_geojson(organisation_code) if geometries else None
-        )
-    else:
-        geometries = []
-        geometry_points = []
-        boundary_geojson = None
+    # The map shows any platform entities not in the resource and every
+    # resource entity with geometry. The page only says whether there is
+    # anything to show: the map fetches its features per category from
+    # check_transform_geojson, simplified for the zoom it's at.
+    has_map = is_geography and bool(
+        _map_entries(request_id, comparison, resource, platform_entities)
+    )
+    boundary_geojson = results["boundary"] if has_map else None
 
     # Checks for whether endpoint is found in documentation url
-    endpoint_in_doc = check_endpoint_in_doc(documentation_url, endpoint_url)
     doc_is_gov_uk = is_gov_uk_url(documentation_url)
     endpoint_is_gov_uk = is_gov_uk_url(endpoint_url)
 
@@ -885,6 +1441,7 @@ def handle_check_transform(
         entities_data=entities_data,
         platform_too_large=platform_too_large,
         existing_count=existing_count,
+        existing_rows_shown=existing_rows_shown,
         page_number=page_number,
         has_next_page=has_next_page,
         page_start=page_start,
@@ -911,10 +1468,76 @@ def handle_check_transform(
             ).rstrip("/")
             + "/entity"
         ),
-        geometries=geometries,
-        geometry_points=geometry_points,
+        has_map=has_map,
         boundary_geojson=boundary_geojson,
         flagged_errors=flagged_errors or [],
         flagged_error_abbreviations=flagged_error_abbreviations or [],
         flagged_error_messages=flagged_error_messages or [],
     )
+
+
+_MAP_LAYERS = ("shapes", "points", "clusters")
+_MAP_CATEGORIES = ("new", "changed", "in_both", "existing")
+
+
+def handle_check_transform_geojson(request_id, req, layer, category):
+    """
+    GeoJSON for one layer of one category of a completed request's review map:
+
+    - 'shapes': each entity's geometry, simplified for the ``zoom`` query arg
+      (full detail without one);
+    - 'points': each entity's representative point;
+    - 'clusters': the points clustered for ``zoom`` (see utils.clusters), a
+      single-point cluster being the point itself. The collection also
+      carries the category's ``bbox`` and whether it ``has_polygon``.
+
+    Every layer can be limited to a ``bbox`` of ``west,south,east,north``.
+    Layers and cluster indexes are built once and cached; zoom and bbox are
+    applied per call.
+    """
+    if layer not in _MAP_LAYERS or category not in _MAP_CATEGORIES:
+        raise ControllerError(f"Unknown map layer {layer}/{category}")
+    if req.get("status") == "FAILED" or req.get("response") is None:
+        raise ControllerError("The request has no results to map")
+
+    snapshot, entries = _request_map_entries(request_id, req)
+    zoom = _map_zoom(flask_request.args.get("zoom"))
+    bbox = _map_bbox(flask_request.args.get("bbox"))
+
+    if layer == "clusters":
+        points, _ = _map_layer(request_id, snapshot, entries, "points", category, None)
+        index, has_polygon = _map_clusters(request_id, snapshot, entries, category)
+        features = [
+            (
+                points[point]
+                if point >= 0
+                else _cluster_feature(lon, lat, count, expansion_zoom)
+            )
+            for lon, lat, count, point, expansion_zoom in index.clusters(
+                zoom or 0, bbox
+            )
+        ]
+        members = {"has_polygon": has_polygon}
+        if index.bbox:
+            members["bbox"] = index.bbox
+        return _feature_collection_response(features, **members)
+
+    # Points aren't simplified, so one cached layer serves every zoom.
+    features, bounds = _map_layer(
+        request_id,
+        snapshot,
+        entries,
+        layer,
+        category,
+        zoom if layer == "shapes" else None,
+    )
+    if bbox and features:
+        west, south, east, north = bbox
+        in_view = (
+            (bounds[:, 0] <= east)
+            & (bounds[:, 2] >= west)
+            & (bounds[:, 1] <= north)
+            & (bounds[:, 3] >= south)
+        )
+        features = [f for f, shown in zip(features, in_view) if shown]
+    return _feature_collection_response(features)
@@ -4,6 +4,7 @@ import logging
 from flask import (
     Blueprint,
     current_app,
+    jsonify,
     redirect,
     render_template,
     request,
@@ -42,10 +43,15 @@ from .controllers.preview import (
     handle_entities_preview,
     handle_add_data_confirm,
 )
-from .controllers.transform import handle_check_transform
+from .controllers.status import handle_request_status
+from .controllers.transform import (
+    handle_check_transform,
+    handle_check_transform_geojson,
+)
 from .services.duplicates import parse_selected_redirects
 from .services.async_api import (
     AsyncAPIError,
+    clear_request_memo,
     fetch_request,
 )
 from .utils import (
@@ -71,6 +77,9 @@ datamanager_bp.errorhandler(Exception)(handle_error)
 datamanager_bp.context_processor(inject_now)
 assign_entities_bp.errorhandler(Exception)(handle_error)
 assign_entities_bp.context_processor(inject_now)
+# Drop fetch_request's per-request memo when each request ends, even where the
+# app context (and so ``g``) outlives the request.
+datamanager_bp.teardown_app_request(clear_request_memo)
 
 
 @assign_entities_bp.errorhandler(RequestEntityTooLarge)
@@ -154,6 +163,13 @@ def require_login():
     if login_response:
         return login_response
 
+    # Status polling and map data are read-only and used by pages in both flows.
+    if request.endpoint in {
+        "datamanager.request_status",
+        "datamanager.check_transform_geojson",
+    }:
+        return None
+
     # The entities preview is used by both add-data and assign-entities flows
     if (
         request.endpoint in _SHARED_FLOW_ENDPOINTS
@@ -274,6 +290,17 @@ def check_transform(request_id):
         return render_template("datamanager/error.html", message=e.message)
 
 
+def check_transform_geojson(request_id, layer, category):
+    """Map features for one category of a completed transform check."""
+    try:
+        req = fetch_request(request_id)
+        return handle_check_transform_geojson(request_id, req, layer, category)
+    except AsyncAPIError:
+        return jsonify({"error": "Transform request not found"}), 404
+    except ControllerError as e:
+        return jsonify({"error": e.message}), 404
+
+
 def check_transform_post(request_id):
     """Store selected endpoints to retire/unretire from the transform page."""
     checked = request.form.getlist("retire_endpoints")
@@ -314,6 +341,11 @@ def _current_endpoint_hash(request_id):
     return compute_hash(url) if url else None
 
 
+def request_status(request_id):
+    """Lightweight status endpoint polled by the loading pages."""
+    return handle_request_status(request_id)
+
+
 def add_data_confirm_async(request_id):
     logger.info(f"Triggering async GitHub workflow for request_id: {request_id}")
     github_branch = request.form.get("github_branch") or None
@@ -492,6 +524,14 @@ datamanager_bp.add_url_rule(
 datamanager_bp.add_url_rule(
     "/check-transform/<request_id>", view_func=check_transform_post, methods=["POST"]
 )
+datamanager_bp.add_url_rule(
+    "/check-transform/<request_id>/geojson/<layer>/<category>",
+    view_func=check_transform_geojson,
+    methods=["GET"],
+)
+datamanager_bp.add_url_rule(
+    "/request-status/<request_id>", view_func=request_status, methods=["GET"]
+)
 datamanager_bp.add_url_rule(
     "/add-data/<request_id>/confirm-async",
     view_func=add_data_confirm_async,
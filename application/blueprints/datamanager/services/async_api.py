@@ -1,16 +1,29 @@
+import copy
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+from flask import current_app, g, has_app_context, has_request_context
 
 from config.config import get_request_api_endpoint
 
 from application.extensions import cache
+from application.http_client import CircuitOpenError
 
-from ..utils import REQUESTS_TIMEOUT
+from . import result_store
+from .clients import async_api_http
+from .response_rows import ResponseRow
 
 logger = logging.getLogger(__name__)
 
+_DETAILS_BATCH_RETRIES = 1
+
+# A request in one of these states never changes again, so it can be cached
+# across app requests.
+_TERMINAL_STATUSES = {"COMPLETE", "FAILED"}
+_TERMINAL_REQUEST_CACHE_TIMEOUT = 3600  # seconds
+
 
 def _requests_url() -> str:
     return f"{get_request_api_endpoint()}/requests"
@@ -45,7 +58,7 @@ def submit_request(params: dict) -> str:
     logger.info("Submitting request to async API")
     logger.debug(json.dumps(payload, indent=2))
 
-    response = requests.post(_requests_url(), json=payload, timeout=REQUESTS_TIMEOUT)
+    response = async_api_http.post(_requests_url(), json=payload)
 
     logger.info(f"Async API responded with {response.status_code}")
     try:
@@ -70,14 +83,20 @@ def submit_request(params: dict) -> str:
     )
 
 
-def fetch_request(request_id: str) -> dict:
-    """
-    Fetch a request by ID from the async API.
+def _terminal_request_cache_key(request_id: str) -> str:
+    return f"async_api.request.{request_id}"
 
-    Returns the parsed JSON response on 200.
-    Raises AsyncAPIError on non-200 status.
-    """
-    response = requests.get(_request_url(request_id), timeout=REQUESTS_TIMEOUT)
+
+def _load_request(request_id: str) -> dict:
+    data = (
+        cache.get(_terminal_request_cache_key(request_id))
+        if has_app_context()
+        else None
+    )
+    if data is not None:
+        return data
+
+    response = async_api_http.get(_request_url(request_id))
 
     if response.status_code != 200:
         raise AsyncAPIError(
@@ -85,88 +104,407 @@ def fetch_request(request_id: str) -> dict:
             status_code=response.status_code,
         )
 
-    return response.json() or {}
+    data = response.json() or {}
+    if has_app_context() and data.get("status") in _TERMINAL_STATUSES:
+        cache.set(
+            _terminal_request_cache_key(request_id),
+            data,
+            timeout=_TERMINAL_REQUEST_CACHE_TIMEOUT,
+        )
+    return data
 
 
-@cache.memoize(timeout=3600)
-def fetch_response_details(
-    request_id: str,
-    limit: int = 100,
-    start_offset: int = 0,
-    max_rows: int = None,
-) -> list:
+def fetch_request(request_id: str) -> dict:
     """
-    Fetch response details for a request, handling pagination.
+    Fetch a request by ID from the async API.
+
+    Returns the parsed JSON response on 200.
+    Raises AsyncAPIError on non-200 status.
 
-    start_offset / max_rows allow fetching a bounded slice of rows so that
-    large datasets can be paged server-side without timing out.
+    Each request is fetched at most once per app request, and requests in a
+    terminal state (COMPLETE / FAILED) are also cached across app requests;
+    PENDING / PROCESSING requests are always refetched on the next page load.
+    Callers get their own copy, so they can modify it freely.
     """
-    all_details = []
-    offset = start_offset
+    memo = g.setdefault("_async_requests", {}) if has_request_context() else None
+    if memo is not None and request_id in memo:
+        return copy.deepcopy(memo[request_id])
+
+    data = _load_request(request_id)
+    if memo is not None:
+        memo[request_id] = data
+    return copy.deepcopy(data)
+
+
+def poll_request(request_id: str) -> dict:
+    """
+    Fetch a request's current state, bypassing the per-request memo.
+
+    For callers that check the same request repeatedly within one app
+    request; terminal requests are still served from the cache.
+    """
+    return copy.deepcopy(_load_request(request_id))
+
+
+def clear_request_memo(exc=None):
+    """Forget the requests fetched during this app request (teardown hook)."""
+    g.pop("_async_requests", None)
+
+
+def _log_first_batch_sample(batch: list):
     logger.info(
-        f"Fetching response details for request_id: {request_id}, "
-        f"start_offset={start_offset}, max_rows={max_rows}"
+        f"First batch sample - Item keys: {list(batch[0].keys()) if batch[0] else 'Empty item'}"
     )
+    if batch[0] and "converted_row" in batch[0]:
+        converted_sample = batch[0]["converted_row"]
+        if converted_sample:
+            logger.info(
+                f"First converted_row sample: {dict(list(converted_sample.items())[:3])}"
+            )
+        else:
+            logger.info("Empty converted_row")
 
-    while True:
-        if max_rows is not None and len(all_details) >= max_rows:
-            break
-        fetch_limit = (
-            min(limit, max_rows - len(all_details)) if max_rows is not None else limit
-        )
+
+def _fetch_details_batch(request_id: str, offset: int, limit: int) -> tuple:
+    """
+    Fetch one page of response details.
+
+    Returns (rows, response size in bytes, seconds taken). A failed page is
+    retried _DETAILS_BATCH_RETRIES times before the last error is raised to
+    the caller; CircuitOpenError is raised straight away.
+    """
+    url = _response_details_url(request_id)
+    params = {"offset": offset, "limit": limit}
+    for attempt in range(_DETAILS_BATCH_RETRIES + 1):
+        response = None
         try:
-            url = _response_details_url(request_id)
-            params = {"offset": offset, "limit": fetch_limit}
             logger.debug(f"Fetching batch - URL: {url}, Params: {params}")
 
-            response = requests.get(url, params=params, timeout=REQUESTS_TIMEOUT)
-            content_length = getattr(response, "content", None)
-            content_length = (
-                len(content_length) if content_length is not None else "N/A"
-            )
+            started = time.monotonic()
+            response = async_api_http.get(url, params=params)
+            elapsed = time.monotonic() - started
+            content = getattr(response, "content", None)
+            content_length = len(content) if content is not None else 0
             logger.info(
-                f"Batch response - Status: {response.status_code}, Content-Length: {content_length}"
+                f"Batch response - Status: {response.status_code}, "
+                f"Content-Length: {content_length}, Seconds: {elapsed:.2f}"
             )
 
             response.raise_for_status()
             batch = response.json() or []
             logger.info(f"Batch parsed - Items: {len(batch)}")
+            return batch, content_length, elapsed
 
-            if not batch:
-                logger.info("No more batches available")
-                break
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Failed to fetch batch at offset {offset} "
+                f"(attempt {attempt + 1} of {_DETAILS_BATCH_RETRIES + 1}): {e}"
+            )
+            logger.error(f"Response status: {getattr(response, 'status_code', 'N/A')}")
+            response_text = getattr(response, "text", "N/A")
+            if hasattr(response_text, "__getitem__"):
+                logger.error(f"Response text: {response_text[:500]}")
+            else:
+                logger.error(f"Response text: {response_text}")
+            if attempt == _DETAILS_BATCH_RETRIES:
+                raise
 
-            # Log sample of first batch for debugging
-            if offset == 0 and batch:
-                logger.info(
-                    f"First batch sample - Item keys: {list(batch[0].keys()) if batch[0] else 'Empty item'}"
+
+class _BatchSizer:
+    """
+    Choose response-details page sizes from the bytes and latency of recent pages.
+
+    After each page the size moves towards the number of rows that would fill
+    ASYNC_API_DETAILS_BATCH_TARGET_BYTES or take ASYNC_API_DETAILS_BATCH_TARGET_SECONDS,
+    whichever is smaller, at most doubling or halving per page and staying within
+    ASYNC_API_DETAILS_BATCH_MIN / _MAX. Attribute-only rows therefore get large
+    pages, and geometry-heavy rows small ones that stay well inside the timeout.
+    """
+
+    def __init__(self, initial: int):
+        config = current_app.config
+        self.minimum = max(1, int(config.get("ASYNC_API_DETAILS_BATCH_MIN", initial)))
+        self.maximum = max(
+            self.minimum, int(config.get("ASYNC_API_DETAILS_BATCH_MAX", initial))
+        )
+        self.target_bytes = config.get("ASYNC_API_DETAILS_BATCH_TARGET_BYTES")
+        self.target_seconds = config.get("ASYNC_API_DETAILS_BATCH_TARGET_SECONDS")
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.sizes_used = {self.size}
+
+    def observe(self, rows: int, nbytes: int, seconds: float):
+        if not rows:
+            return
+        candidates = []
+        if self.target_bytes and nbytes:
+            candidates.append(self.target_bytes * rows / nbytes)
+        if self.target_seconds and seconds > 0:
+            candidates.append(self.target_seconds * rows / seconds)
+        if not candidates:
+            return
+        ideal = min(candidates)
+        size = int(min(max(ideal, self.size / 2), self.size * 2))
+        self.size = min(max(size, self.minimum), self.maximum)
+        self.sizes_used.add(self.size)
+
+    def cap(self, size: int):
+        """Never ask for more than size rows a page again."""
+        self.maximum = size
+        self.minimum = min(self.minimum, size)
+        self.size = min(self.size, size)
+        self.sizes_used.add(self.size)
+
+
+def _stream_response_details(
+    request_id: str,
+    limit: int,
+    start_offset: int,
+    max_rows: int = None,
+    outcome: dict = None,
+):
+    """
+    Yield response details from the async API, page by page.
+
+    The first page is fetched on its own; if it is full, the following pages
+    are fetched in waves of ASYNC_API_FETCH_WORKERS concurrent offset windows
+    and yielded in offset order. Each page is retried once; if it still fails
+    the stream ends at that page, as with a serial fetch. When given, outcome
+    records whether the stream reached the end of the request ("complete").
+
+    A page shorter than asked for is either the last or the most the API
+    returns per page, so the stream carries on from just after it with pages
+    no larger; an empty page, or another short one, is then the end.
+
+    limit is the size of the first page; later pages are sized by _BatchSizer.
+    """
+    outcome = outcome if outcome is not None else {}
+    outcome["complete"] = False
+    workers = max(1, int(current_app.config.get("ASYNC_API_FETCH_WORKERS", 1)))
+    sizer = _BatchSizer(limit)
+    fetched = 0
+    offset = start_offset
+    page_cap = None
+    logger.info(
+        f"Fetching response details for request_id: {request_id}, "
+        f"start_offset={start_offset}, max_rows={max_rows}, workers={workers}"
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # Plan the next wave of offset windows. The first wave is a single
+            # page so small results never pay for speculative requests.
+            windows = []
+            planned = fetched
+            wave_size = 1 if offset == start_offset else workers
+            for _ in range(wave_size):
+                if max_rows is not None and planned >= max_rows:
+                    break
+                fetch_limit = (
+                    min(sizer.size, max_rows - planned)
+                    if max_rows is not None
+                    else sizer.size
                 )
-                if batch[0] and "converted_row" in batch[0]:
-                    converted_sample = batch[0]["converted_row"]
-                    if converted_sample:
+                windows.append((offset, fetch_limit))
+                offset += fetch_limit
+                planned += fetch_limit
+            if not windows:
+                break
+
+            futures = [
+                pool.submit(_fetch_details_batch, request_id, window_offset, size)
+                for window_offset, size in windows
+            ]
+            wave_complete = True
+            resume = False
+            try:
+                for (window_offset, size), future in zip(windows, futures):
+                    try:
+                        batch, nbytes, seconds = future.result()
+                    except CircuitOpenError:
+                        # A truncated table would look complete; fail the page
+                        # with the "service degraded" message instead.
+                        raise
+                    except Exception:
+                        logger.error(
+                            f"Truncating response details at offset {window_offset}"
+                        )
+                        wave_complete = False
+                        break
+
+                    if not batch:
+                        logger.info("No more batches available")
+                        outcome["complete"] = True
+                        wave_complete = False
+                        break
+
+                    # Log sample of first batch for debugging
+                    if window_offset == 0:
+                        _log_first_batch_sample(batch)
+
+                    fetched += len(batch)
+                    previous_size = sizer.size
+                    sizer.observe(len(batch), nbytes, seconds)
+                    if sizer.size != previous_size:
                         logger.info(
-                            f"First converted_row sample: {dict(list(converted_sample.items())[:3])}"
+                            f"Response details batch size for {request_id}: "
+                            f"{previous_size} -> {sizer.size} "
+                            f"({nbytes / len(batch):.0f} bytes/row, "
+                            f"{seconds * 1000 / len(batch):.1f} ms/row)"
                         )
-                    else:
-                        logger.info("Empty converted_row")
+                    yield from batch
+
+                    if len(batch) < size:
+                        if page_cap is not None and size <= page_cap:
+                            logger.info(f"Last batch received - Total items: {fetched}")
+                            outcome["complete"] = True
+                            wave_complete = False
+                            break
+                        # The later windows of this wave assumed a full page.
+                        page_cap = len(batch)
+                        sizer.cap(page_cap)
+                        offset = window_offset + len(batch)
+                        resume = True
+                        break
+            finally:
+                # Pages after the end, a failed page, or a consumer that stopped
+                # early are not needed; completed futures ignore the cancel.
+                for future in futures:
+                    future.cancel()
+
+            if not wave_complete:
+                break
+            if resume:
+                logger.info(
+                    f"Short batch of {page_cap} at offset {offset - page_cap}, "
+                    f"continuing with batches of at most {page_cap}"
+                )
 
-            all_details.extend(batch)
+    logger.info(
+        f"Total response details fetched: {fetched} "
+        f"(batch sizes {min(sizer.sizes_used)}-{max(sizer.sizes_used)}, "
+        f"final {sizer.size})"
+    )
 
-            if len(batch) < fetch_limit:
-                logger.info(f"Last batch received - Total items: {len(all_details)}")
-                break
 
-            offset += fetch_limit
+def iter_response_details(
+    request_id: str,
+    limit: int = 100,
+    start_offset: int = 0,
+    max_rows: int = None,
+):
+    """
+    Yield response details for a request row by row, as ResponseRows.
+
+    Only the pages currently in flight are held in memory, so callers that
+    reduce the rows as they go never materialise the whole response.
+
+    Rows come from the result store; only the ranges of the requested slice
+    that aren't stored yet are fetched from the async API, and are stored as
+    they pass through. If an upstream page fails the rows end there.
+    """
+    rows = _iter_raw_response_details(request_id, limit, start_offset, max_rows)
+    # Values repeated across the rows (entity numbers, dates, ...) are held once.
+    pool = {}
+    try:
+        for row in rows:
+            yield ResponseRow(row, pool)
+    finally:
+        rows.close()
+
+
+def _iter_raw_response_details(request_id, limit, start_offset, max_rows):
+    if not result_store.is_enabled():
+        yield from _stream_response_details(request_id, limit, start_offset, max_rows)
+        return
+
+    stop = start_offset + max_rows if max_rows is not None else None
+    position = start_offset
+    for gap_start, gap_stop in result_store.missing_ranges(
+        request_id, start_offset, max_rows
+    ):
+        yield from _iter_stored(request_id, limit, position, gap_start)
+        window = gap_stop - gap_start if gap_stop is not None else None
+        fetched, complete = yield from _fetch_into_store(
+            request_id, limit, gap_start, window
+        )
+        if complete:
+            return
+        if window is None or fetched < window:
+            # Truncated by an upstream failure.
+            return
+        position = gap_stop
+
+    # Every range from here is stored, so the request's end is known.
+    row_count = result_store.stored_row_count(request_id)
+    if row_count is not None:
+        stop = row_count if stop is None else min(stop, row_count)
+    yield from _iter_stored(request_id, limit, position, stop)
 
-        except Exception as e:
-            logger.error(f"Failed to fetch batch at offset {offset}: {e}")
-            logger.error(f"Response status: {getattr(response, 'status_code', 'N/A')}")
-            response_text = getattr(response, "text", "N/A")
-            if hasattr(response_text, "__getitem__"):
-                logger.error(f"Response text: {response_text[:500]}")
-            else:
-                logger.error(f"Response text: {response_text}")
-            break
 
-    logger.info(f"Total response details fetched: {len(all_details)}")
-    return all_details
+def _iter_stored(request_id, limit, start, stop):
+    """
+    Yield the rows [start, stop) that the store reported as held (to the end
+    of the request if stop is None). If the store comes up short, because it
+    can't be read or another worker evicted the request meanwhile, the rest
+    are fetched from the async API.
+    """
+    if stop is not None and stop <= start:
+        return
+    position = start
+    for row in result_store.iter_stored_rows(
+        request_id, start, stop - start if stop is not None else None
+    ):
+        position += 1
+        yield row
+    if stop is None or position < stop:
+        if stop is not None:
+            logger.warning(
+                f"Result store held {position - start} of rows {start}-{stop} "
+                f"for {request_id}, fetching the rest"
+            )
+        yield from _fetch_into_store(
+            request_id, limit, position, stop - position if stop is not None else None
+        )
+
+
+def _fetch_into_store(request_id, limit, start, window):
+    """
+    Yield up to window rows (all the rest if None) from the async API, from
+    start, storing them as they pass through. Returns (rows fetched, whether
+    the request's end was reached), recording its row count if it was.
+    """
+    outcome = {}
+    fetched = 0
+    for row in result_store.store_while_iterating(
+        request_id,
+        start,
+        _stream_response_details(request_id, limit, start, window, outcome),
+    ):
+        fetched += 1
+        yield row
+    if outcome["complete"]:
+        result_store.record_row_count(request_id, start + fetched)
+    return fetched, outcome["complete"]
+
+
+def fetch_response_details(
+    request_id: str,
+    limit: int = 100,
+    start_offset: int = 0,
+    max_rows: int = None,
+) -> list:
+    """
+    Fetch response details for a request as a list of ResponseRows, handling
+    pagination.
+
+    start_offset / max_rows select a bounded slice of rows so that large
+    datasets can be paged. Prefer iter_response_details when the rows are only
+    walked once.
+    """
+    return list(
+        iter_response_details(
+            request_id, limit=limit, start_offset=start_offset, max_rows=max_rows
+        )
+    )
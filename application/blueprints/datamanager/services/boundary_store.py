@@ -0,0 +1,209 @@
+"""
+Local store of LPA boundaries.
+
+An organisation's local planning authority boundary rarely changes, but
+fetching it takes two chained planning.data calls and can be megabytes of
+GeoJSON. Each organisation's boundary is kept in a SQLite file shared by every
+worker on the host, keyed by organisation code, together with variants
+simplified for a map zoom (``simplify_feature_collection``), so a map page is
+given a boundary without any upstream call.
+
+The file lives in ``BOUNDARY_STORE_DIR`` (an empty value disables the store
+and boundaries are only cached in-process for an hour) and survives restarts.
+A stored boundary older than ``BOUNDARY_STORE_REFRESH_AFTER`` seconds is still
+served, and re-fetched in the background through the pre-warm pool. One older
+than ``BOUNDARY_STORE_TTL`` is re-fetched before it is served; if that fails
+the stored copy is served anyway.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from flask import current_app
+
+from application.extensions import cache
+from ..utils.geometry import simplify_feature_collection
+from . import prewarm
+from .planning_data import fetch_lpa_boundary_geojson
+
+logger = logging.getLogger(__name__)
+
+_DB_FILENAME = "boundaries.sqlite3"
+
+# The zoom map pages' boundaries are simplified for: half a pixel is about 2m.
+MAP_ZOOM = 14
+# Variants simplified when a boundary is stored; others are made on first use.
+_STORED_ZOOMS = (MAP_ZOOM,)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS boundary (
+        organisation_code TEXT PRIMARY KEY,
+        fetched_at REAL NOT NULL,
+        geojson TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS boundary_variant (
+        organisation_code TEXT NOT NULL,
+        zoom INTEGER NOT NULL,
+        geojson TEXT NOT NULL,
+        PRIMARY KEY (organisation_code, zoom)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def _store_path():
+    # Raises OSError if the directory can't be made; callers treat that like
+    # any other store error.
+    directory = current_app.config.get("BOUNDARY_STORE_DIR")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, _DB_FILENAME)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    return conn
+
+
+def _dumps(collection: dict) -> str:
+    return json.dumps(collection, separators=(",", ":"))
+
+
+def _simplified(collection: dict, zoom: int) -> dict:
+    try:
+        return simplify_feature_collection(collection, zoom)
+    except Exception as e:
+        # Geometry shapely can't read is served as fetched.
+        logger.warning(f"Could not simplify boundary for zoom {zoom}: {e}")
+        return collection
+
+
+def is_enabled() -> bool:
+    return bool(current_app.config.get("BOUNDARY_STORE_DIR"))
+
+
+def _refresh(organisation_code: str) -> tuple:
+    collection = fetch_lpa_boundary_geojson(organisation_code)
+    variants = {zoom: _simplified(collection, zoom) for zoom in _STORED_ZOOMS}
+    try:
+        path = _store_path()
+        if path is None:
+            return collection, variants
+        with closing(_connect(path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO boundary (organisation_code, fetched_at, geojson)"
+                " VALUES (?, ?, ?)",
+                (organisation_code, time.time(), _dumps(collection)),
+            )
+            conn.execute(
+                "DELETE FROM boundary_variant WHERE organisation_code = ?",
+                (organisation_code,),
+            )
+            conn.executemany(
+                "INSERT INTO boundary_variant (organisation_code, zoom, geojson)"
+                " VALUES (?, ?, ?)",
+                [
+                    (organisation_code, zoom, _dumps(variant))
+                    for zoom, variant in variants.items()
+                ],
+            )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Boundary store write failed for {organisation_code}: {e}")
+    return collection, variants
+
+
+def refresh(organisation_code: str):
+    """
+    Fetch an organisation's boundary and store it with its pre-simplified
+    variants. Upstream failures raise; store errors are logged.
+    """
+    _refresh(organisation_code)
+
+
+def _fetched(organisation_code: str, zoom: int = None) -> dict:
+    collection, variants = _refresh(organisation_code)
+    if zoom is None:
+        return collection
+    return variants[zoom] if zoom in variants else _simplified(collection, zoom)
+
+
+def _read(organisation_code: str, zoom: int = None):
+    """Return (fetched_at, collection) as stored, or None."""
+    with closing(_connect(_store_path())) as conn:
+        row = conn.execute(
+            "SELECT fetched_at, geojson FROM boundary WHERE organisation_code = ?",
+            (organisation_code,),
+        ).fetchone()
+        if row is None:
+            return None
+        fetched_at, geojson = row
+        if zoom is None:
+            return fetched_at, json.loads(geojson)
+        variant = conn.execute(
+            "SELECT geojson FROM boundary_variant"
+            " WHERE organisation_code = ? AND zoom = ?",
+            (organisation_code, zoom),
+        ).fetchone()
+        if variant is not None:
+            return fetched_at, json.loads(variant[0])
+        collection = _simplified(json.loads(geojson), zoom)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO boundary_variant"
+                " (organisation_code, zoom, geojson) VALUES (?, ?, ?)",
+                (organisation_code, zoom, _dumps(collection)),
+            )
+        return fetched_at, collection
+
+
+@cache.memoize(timeout=3600)
+def _unstored_boundary(organisation_code: str, zoom: int = None) -> dict:
+    # Raises on failure, so only boundaries actually fetched are cached.
+    return _fetched(organisation_code, zoom)
+
+
+def get_boundary(organisation_code: str, zoom: int = None) -> dict:
+    """
+    Return an organisation's LPA boundary as a GeoJSON FeatureCollection,
+    simplified for zoom (None for the boundary as fetched).
+
+    Served from the store whenever it holds one; raises only if the boundary
+    has to be fetched and the fetch fails.
+    """
+    if not is_enabled():
+        return _unstored_boundary(organisation_code, zoom)
+
+    try:
+        stored = _read(organisation_code, zoom)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Boundary store lookup failed for {organisation_code}: {e}")
+        stored = None
+    if stored is None:
+        return _fetched(organisation_code, zoom)
+
+    fetched_at, collection = stored
+    age = time.time() - fetched_at
+    if age > current_app.config.get("BOUNDARY_STORE_TTL", 0):
+        try:
+            return _fetched(organisation_code, zoom)
+        except Exception as e:
+            logger.warning(
+                f"Boundary refresh failed for {organisation_code},"
+                f" serving the stored copy: {e}"
+            )
+    elif age > current_app.config.get("BOUNDARY_STORE_REFRESH_AFTER", 0):
+        prewarm.submit(
+            ("boundary-refresh", organisation_code), refresh, organisation_code
+        )
+    return collection
@@ -0,0 +1,63 @@
+"""
+Pooled HTTP clients for each upstream service the datamanager talks to.
+
+Each client shares the process-wide keep-alive pools in
+``application.extensions.http_client`` and carries that service's default
+timeout and headers. Call ``<client>.get(...)`` / ``<client>.post(...)`` exactly
+as you would ``requests.get`` / ``requests.post``.
+"""
+
+from application.extensions import http_client
+from application.http_client import CircuitBreaker
+
+REQUESTS_TIMEOUT = 20  # seconds
+DOC_CRAWLER_TIMEOUT = 10  # seconds
+GITHUB_TIMEOUT = 10  # seconds
+
+_USER_AGENT = "Planning Data - Manage"
+
+# Async request API (check / add-data / assign-entities jobs). Guarded by a
+# circuit breaker (ASYNC_API_BREAKER_* settings) so a struggling API fails fast
+# instead of tying up every worker for REQUESTS_TIMEOUT.
+async_api_http = http_client.service(
+    "async_api",
+    timeout=REQUESTS_TIMEOUT,
+    breaker=CircuitBreaker("async API", config_prefix="ASYNC_API_BREAKER"),
+)
+
+# planning.data.gov.uk entity and organisation APIs
+planning_http = http_client.service("planning_data", timeout=REQUESTS_TIMEOUT)
+
+# datasette.planning.data.gov.uk
+datasette_http = http_client.service(
+    "datasette",
+    timeout=REQUESTS_TIMEOUT,
+    headers={"User-Agent": _USER_AGENT},
+)
+
+# Specification and provision CSVs on raw.githubusercontent.com
+specification_http = http_client.service(
+    "specification",
+    timeout=REQUESTS_TIMEOUT,
+    headers={"User-Agent": _USER_AGENT},
+)
+
+# GitHub REST API (App auth, workflow dispatch, branch reads)
+github_http = http_client.service(
+    "github",
+    timeout=GITHUB_TIMEOUT,
+    headers={
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    },
+)
+
+# Publisher documentation pages checked for endpoint links
+doc_http = http_client.service(
+    "documentation",
+    timeout=DOC_CRAWLER_TIMEOUT,
+    headers={"User-Agent": "digital-land-config-manager/1.0"},
+)
+
+# Publisher endpoint URLs read for raw CSV previews
+source_http = http_client.service("source", timeout=REQUESTS_TIMEOUT)
@@ -3,10 +3,9 @@ import logging
 import time
 from io import StringIO
 
-import requests
 from flask import current_app
 
-from ..utils import REQUESTS_TIMEOUT
+from .clients import specification_http
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +29,7 @@ def _get_datasets():
     try:
         # Step 1: get unique dataset IDs from the provision CSV
         provision_url = current_app.config.get("PROVISION_CSV_URL")
-        prov_response = requests.get(
-            provision_url,
-            timeout=REQUESTS_TIMEOUT,
-            headers={"User-Agent": "Planning Data - Manage"},
-        )
+        prov_response = specification_http.get(provision_url)
         prov_response.raise_for_status()
         reader = csv.DictReader(StringIO(prov_response.text))
         provision_dataset_ids = {
@@ -45,11 +40,7 @@ def _get_datasets():
         # truth - reflects new datasets immediately without waiting for the
         # overnight pipeline run)
         dataset_csv_url = current_app.config.get("DATASET_CSV_URL")
-        spec_response = requests.get(
-            dataset_csv_url,
-            timeout=REQUESTS_TIMEOUT,
-            headers={"User-Agent": "Planning Data - Manage"},
-        )
+        spec_response = specification_http.get(dataset_csv_url)
         spec_response.raise_for_status()
         spec_reader = csv.DictReader(StringIO(spec_response.text))
         spec_lookup = {
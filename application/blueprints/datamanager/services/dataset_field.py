@@ -4,10 +4,9 @@ import time
 from collections import defaultdict
 from io import StringIO
 
-import requests
 from flask import current_app
 
-from ..utils import REQUESTS_TIMEOUT
+from .clients import specification_http
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +29,7 @@ def _get_dataset_fields() -> dict[str, list[dict]]:
     url = current_app.config.get("DATASET_FIELD_CSV_URL")
 
     try:
-        response = requests.get(
-            url,
-            timeout=REQUESTS_TIMEOUT,
-            headers={"User-Agent": "Planning Data - Manage"},
-        )
+        response = specification_http.get(url)
         response.raise_for_status()
 
         reader = csv.DictReader(StringIO(response.text))
@@ -6,9 +6,9 @@ import requests
 
 from application.extensions import cache
 
-logger = logging.getLogger(__name__)
+from .clients import doc_http
 
-_DOC_CRAWLER_TIMEOUT = 10
+logger = logging.getLogger(__name__)
 
 
 def is_gov_uk_url(url):
@@ -80,12 +80,7 @@ def check_endpoint_in_doc(documentation_url, endpoint_url):
         return {"found": False, "matched_href": None, "error": "Missing URL"}
 
     try:
-        resp = requests.get(
-            documentation_url,
-            timeout=_DOC_CRAWLER_TIMEOUT,
-            allow_redirects=True,
-            headers={"User-Agent": "digital-land-config-manager/1.0"},
-        )
+        resp = doc_http.get(documentation_url, allow_redirects=True)
         resp.raise_for_status()
     except requests.exceptions.Timeout:
         logger.warning("Timeout fetching doc URL: %s", documentation_url)
@@ -1,13 +1,22 @@
 import logging
 
-import requests
 from flask import current_app
 
-from ..utils import REQUESTS_TIMEOUT
+from application.extensions import cache
+
+from .clients import datasette_http
 
 logger = logging.getLogger(__name__)
 
 
+@cache.memoize(timeout=300)
+def _fetch_rows(url: str) -> list:
+    # Raises on failure, so only successful responses are cached.
+    response = datasette_http.get(url)
+    response.raise_for_status()
+    return response.json().get("rows", [])
+
+
 def get_endpoint_info_for_hashes(hashes: list) -> dict:
     """
     Given a list of endpoint hashes, returns a dict mapping
@@ -27,10 +36,7 @@ def get_endpoint_info_for_hashes(hashes: list) -> dict:
 
     result = {}
     try:
-        response = requests.get(url, timeout=REQUESTS_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        for row in data.get("rows", []):
+        for row in _fetch_rows(url):
             h = row.get("endpoint")
             if h:
                 result[h] = {
@@ -63,10 +69,7 @@ def get_endpoint_log_summary_for_hashes(hashes: list) -> dict:
 
     result = {}
     try:
-        response = requests.get(url, timeout=REQUESTS_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        for row in data.get("rows", []):
+        for row in _fetch_rows(url):
             h = row.get("endpoint")
             if not h:
                 continue
@@ -0,0 +1,279 @@
+"""
+Local snapshots of platform entities per organisation and dataset.
+
+An organisation's platform entities for a dataset change rarely between
+reviews, so once read they are kept in a SQLite file shared by every worker on
+the host, one snapshot per (organisation entity, dataset, field projection).
+A snapshot records its high-water mark, the latest entry date among its
+entities. Refreshing it only asks /entity.json for the entities entered on or
+after that date and upserts them, so a repeat review of the same publisher
+transfers next to nothing.
+
+Entities that leave the platform aren't in an incremental read; when the
+snapshot then holds a different number of entities than the platform's count,
+it is reloaded in full. The file lives in ``ENTITY_STORE_DIR`` (an empty value
+disables the store) and survives restarts; once snapshots exceed
+``ENTITY_STORE_MAX_BYTES`` the least recently read are evicted. On top of the
+file, results are memoized in-process for five minutes as before.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from flask import current_app
+
+from application.extensions import cache
+from .planning_data import (
+    get_entities_for_organisation_and_dataset,
+    iter_entities_for_organisation_and_dataset,
+)
+
+logger = logging.getLogger(__name__)
+
+_DB_FILENAME = "platform-entities.sqlite3"
+_WRITE_BATCH_SIZE = 500
+
+_SCHEMA = (
+    # high_water is the latest entry-date in the snapshot (NULL if none has one).
+    """
+    CREATE TABLE IF NOT EXISTS snapshot (
+        snapshot_key TEXT PRIMARY KEY,
+        high_water TEXT,
+        size_bytes INTEGER NOT NULL,
+        last_read REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS platform_entity (
+        snapshot_key TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (snapshot_key, entity)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def _store_path():
+    # Raises OSError if the directory can't be made; callers treat that like
+    # any other store error.
+    directory = current_app.config.get("ENTITY_STORE_DIR")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, _DB_FILENAME)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    return conn
+
+
+def is_enabled() -> bool:
+    return bool(current_app.config.get("ENTITY_STORE_DIR"))
+
+
+def _snapshot_key(organisation_entity, dataset: str, fields) -> str:
+    return f"{organisation_entity}|{dataset}|{','.join(fields) if fields else '*'}"
+
+
+def _entry_date(entity: dict) -> str:
+    return str(entity.get("entry-date") or "")[:10]
+
+
+def high_water_mark(entities) -> str:
+    """The latest entry date among entities, "" if none has one."""
+    return max((_entry_date(entity) for entity in entities), default="")
+
+
+def _read_snapshot(conn: sqlite3.Connection, key: str):
+    """Return (high_water, entity count) of a stored snapshot, or None."""
+    row = conn.execute(
+        "SELECT high_water FROM snapshot WHERE snapshot_key = ?", (key,)
+    ).fetchone()
+    if row is None:
+        return None
+    (count,) = conn.execute(
+        "SELECT COUNT(*) FROM platform_entity WHERE snapshot_key = ?", (key,)
+    ).fetchone()
+    return row[0], count
+
+
+def _read_entities(conn: sqlite3.Connection, key: str) -> list:
+    with conn:
+        conn.execute(
+            "UPDATE snapshot SET last_read = ? WHERE snapshot_key = ?",
+            (time.time(), key),
+        )
+    # Entity number order, as /entity.json returns them.
+    return [
+        json.loads(data)
+        for (data,) in conn.execute(
+            "SELECT data FROM platform_entity WHERE snapshot_key = ?"
+            " ORDER BY CAST(entity AS INTEGER), entity",
+            (key,),
+        )
+    ]
+
+
+def _write_entities(
+    conn: sqlite3.Connection, key: str, entities, replace: bool = False
+):
+    """Upsert entities into a snapshot (replacing its contents if replace)."""
+    high_water = None
+    with conn:
+        if replace:
+            conn.execute("DELETE FROM platform_entity WHERE snapshot_key = ?", (key,))
+        else:
+            row = conn.execute(
+                "SELECT high_water FROM snapshot WHERE snapshot_key = ?", (key,)
+            ).fetchone()
+            high_water = row[0] if row else None
+        batch = []
+        for entity in entities:
+            high_water = max(high_water or "", _entry_date(entity)) or None
+            batch.append(
+                (
+                    key,
+                    str(entity.get("entity", "")),
+                    json.dumps(entity, separators=(",", ":")),
+                )
+            )
+            if len(batch) >= _WRITE_BATCH_SIZE:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO platform_entity (snapshot_key, entity, data)"
+                    " VALUES (?, ?, ?)",
+                    batch,
+                )
+                batch = []
+        conn.executemany(
+            "INSERT OR REPLACE INTO platform_entity (snapshot_key, entity, data)"
+            " VALUES (?, ?, ?)",
+            batch,
+        )
+        (size_bytes,) = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM platform_entity"
+            " WHERE snapshot_key = ?",
+            (key,),
+        ).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshot"
+            " (snapshot_key, high_water, size_bytes, last_read) VALUES (?, ?, ?, ?)",
+            (key, high_water, size_bytes, time.time()),
+        )
+    _evict(conn, keep=key)
+
+
+def _load_in_full(
+    conn: sqlite3.Connection, key: str, organisation_entity, dataset, count, fields
+) -> list:
+    entities = get_entities_for_organisation_and_dataset(
+        organisation_entity, dataset, count=count, fields=fields
+    )
+    # A read cut short by a failed page would look like a complete snapshot.
+    if count is None or len(entities) == count:
+        _write_entities(conn, key, entities, replace=True)
+    return entities
+
+
+@cache.memoize(timeout=300)
+def get_platform_entities(
+    organisation_entity: int | str, dataset: str, count: int = None, fields=None
+) -> list:
+    """
+    The authoritative platform entities of an organisation entity and dataset,
+    as get_entities_for_organisation_and_dataset returns them, read through
+    the local snapshot. count (the platform's current entity count) tells a
+    snapshot that lost entities to reload; fields is the field projection, a
+    tuple (entry-date is always included, for the high-water mark).
+    """
+    if fields:
+        fields = tuple(sorted(set(fields) | {"entry-date"}))
+    if not is_enabled():
+        return get_entities_for_organisation_and_dataset(
+            organisation_entity, dataset, count=count, fields=fields
+        )
+
+    key = _snapshot_key(organisation_entity, dataset, fields)
+    try:
+        conn = _connect(_store_path())
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Entity store unavailable, fetching {key}: {e}")
+        return get_entities_for_organisation_and_dataset(
+            organisation_entity, dataset, count=count, fields=fields
+        )
+    with closing(conn):
+        try:
+            stored = _read_snapshot(conn, key)
+            if stored is None:
+                return _load_in_full(
+                    conn, key, organisation_entity, dataset, count, fields
+                )
+            high_water, stored_count = stored
+            if high_water is None:
+                # No entry dates to read changes since; only a full read will do.
+                return _load_in_full(
+                    conn, key, organisation_entity, dataset, count, fields
+                )
+            try:
+                changed = list(
+                    iter_entities_for_organisation_and_dataset(
+                        organisation_entity, dataset, fields, since=high_water
+                    )
+                )
+            except Exception as e:
+                # Serve the snapshot as it stands rather than nothing.
+                logger.warning(f"Incremental read of {key} failed: {e}")
+                return _read_entities(conn, key)
+            if changed:
+                _write_entities(conn, key, changed)
+                stored_count = _read_snapshot(conn, key)[1]
+            logger.info(
+                f"Refreshed platform entity snapshot {key}: {len(changed)} "
+                f"entered since {high_water}"
+            )
+            if count is not None and stored_count != count:
+                logger.info(
+                    f"Snapshot {key} holds {stored_count} entities, platform has "
+                    f"{count}; reloading"
+                )
+                return _load_in_full(
+                    conn, key, organisation_entity, dataset, count, fields
+                )
+            return _read_entities(conn, key)
+        except sqlite3.Error as e:
+            logger.warning(f"Entity store failed for {key}: {e}")
+            return get_entities_for_organisation_and_dataset(
+                organisation_entity, dataset, count=count, fields=fields
+            )
+
+
+def _evict(conn: sqlite3.Connection, keep: str = None):
+    max_bytes = current_app.config.get("ENTITY_STORE_MAX_BYTES")
+    if not max_bytes:
+        return
+    total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM snapshot")
+    total = total.fetchone()[0]
+    if total <= max_bytes:
+        return
+    candidates = conn.execute(
+        "SELECT snapshot_key, size_bytes FROM snapshot"
+        " WHERE snapshot_key != ? ORDER BY last_read",
+        (keep or "",),
+    ).fetchall()
+    for key, size_bytes in candidates:
+        if total <= max_bytes:
+            break
+        with conn:
+            conn.execute("DELETE FROM snapshot WHERE snapshot_key = ?", (key,))
+            conn.execute("DELETE FROM platform_entity WHERE snapshot_key = ?", (key,))
+        total -= size_bytes
+        logger.info(f"Evicted platform entity snapshot {key}")
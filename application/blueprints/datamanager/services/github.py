@@ -8,6 +8,8 @@ import requests
 import jwt
 from flask import current_app
 
+from .clients import github_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,11 +32,8 @@ class GitHubWorkflowError(GitHubAppError):
 
 
 def _github_headers(access_token: str) -> dict:
-    return {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {access_token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+    # Accept and API-version headers are defaults on github_http.
+    return {"Authorization": f"Bearer {access_token}"}
 
 
 def _get_access_token() -> str:
@@ -95,14 +94,8 @@ def get_installation_token(jwt_token: str, installation_id: str) -> str:
     """
     github_api_base_url = current_app.config["GITHUB_API_BASE_URL"]
     url = f"{github_api_base_url}/app/installations/{installation_id}/access_tokens"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {jwt_token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
     try:
-        response = requests.post(url, headers=headers, timeout=10)
+        response = github_http.post(url, headers=_github_headers(jwt_token))
         response.raise_for_status()
         token = response.json()["token"]
         logger.info(
@@ -130,7 +123,7 @@ def _add_data_workflow_active(access_token: str) -> bool:
         f"{_ADD_DATA_WORKFLOW_FILE}/runs?per_page=30"
     )
     try:
-        response = requests.get(url, headers=_github_headers(access_token), timeout=10)
+        response = github_http.get(url, headers=_github_headers(access_token))
         response.raise_for_status()
         runs = response.json().get("workflow_runs") or []
     except requests.exceptions.RequestException as e:
@@ -188,7 +181,7 @@ def get_branch_head_sha(branch: str) -> str | None:
     url = f"{github_api_base_url}/repos/digital-land/config/branches/{branch}"
 
     try:
-        response = requests.get(url, headers=_github_headers(access_token), timeout=10)
+        response = github_http.get(url, headers=_github_headers(access_token))
         if response.status_code == 404:
             logger.warning(f"Branch '{branch}' not found when reading HEAD SHA")
             return None
@@ -241,7 +234,7 @@ def config_branch_changed_for_collection(
     )
 
     try:
-        response = requests.get(url, headers=_github_headers(access_token), timeout=10)
+        response = github_http.get(url, headers=_github_headers(access_token))
         response.raise_for_status()
         data = response.json()
     except requests.exceptions.RequestException as e:
@@ -312,8 +305,8 @@ def trigger_add_data_async_workflow(
 
         github_api_base_url = current_app.config["GITHUB_API_BASE_URL"]
         url = f"{github_api_base_url}/repos/digital-land/config/dispatches"
-        response = requests.post(
-            url, headers=_github_headers(access_token), json=payload, timeout=10
+        response = github_http.post(
+            url, headers=_github_headers(access_token), json=payload
         )
 
         if response.status_code == 204:
@@ -3,10 +3,9 @@ import logging
 import time
 from io import StringIO
 
-import requests
 from flask import current_app
 
-from ..utils import REQUESTS_TIMEOUT
+from .clients import datasette_http, planning_http, specification_http
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +38,7 @@ def get_provision_orgs_for_dataset(dataset_id: str) -> list:
 
     try:
         provision_url = current_app.config.get("PROVISION_CSV_URL")
-        response = requests.get(provision_url, timeout=REQUESTS_TIMEOUT)
+        response = specification_http.get(provision_url)
         response.raise_for_status()
         reader = csv.DictReader(StringIO(response.text))
         orgs = []
@@ -85,7 +84,7 @@ def _get_org_mapping() -> dict:
         while url:
             page_count += 1
 
-            response = requests.get(url, timeout=REQUESTS_TIMEOUT)
+            response = datasette_http.get(url)
             response.raise_for_status()
             data = response.json()
 
@@ -131,9 +130,7 @@ def get_org_entity_lookup() -> dict:
     entity_mapping = {}
     try:
         planning_url = current_app.config.get("PLANNING_BASE_URL")
-        response = requests.get(
-            f"{planning_url}/organisation.json", timeout=REQUESTS_TIMEOUT
-        )
+        response = planning_http.get(f"{planning_url}/organisation.json")
         response.raise_for_status()
         data = response.json()
 
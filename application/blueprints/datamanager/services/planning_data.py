@@ -1,19 +1,18 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
 from flask import current_app
 
 from application.extensions import cache
 
-from ..utils import REQUESTS_TIMEOUT
+from .clients import planning_http
 
 logger = logging.getLogger(__name__)
 
 
-def get_entity_count_for_organisation_and_dataset(
-    organisation_entity: int | str, dataset: str
-) -> int:
-    """Return the total count of authoritative entities using a single API request."""
+@cache.memoize(timeout=300)
+def _fetch_entity_count(organisation_entity: int | str, dataset: str) -> int:
+    # Raises on failure, so only successful counts are cached.
     planning_url = current_app.config.get("PLANNING_BASE_URL")
     url = (
         f"{planning_url}/entity.json"
@@ -22,45 +21,171 @@ def get_entity_count_for_organisation_and_dataset(
         f"&quality=authoritative"
         f"&limit=1"
     )
+    response = planning_http.get(url)
+    response.raise_for_status()
+    return response.json().get("count", 0)
+
+
+def get_entity_count_for_organisation_and_dataset(
+    organisation_entity: int | str, dataset: str, default=0
+):
+    """
+    Return the total count of authoritative entities using a single API
+    request, or default if the request fails (pass None to tell a failure
+    from an organisation with no entities).
+    """
     try:
-        response = requests.get(url, timeout=REQUESTS_TIMEOUT)
-        response.raise_for_status()
-        return response.json().get("count", 0)
+        return _fetch_entity_count(organisation_entity, dataset)
     except Exception as e:
         logger.error(
             f"Failed to fetch entity count for organisation_entity="
             f"{organisation_entity} dataset={dataset}: {e}",
             exc_info=True,
         )
-        return 0
+        return default
 
 
-@cache.memoize(timeout=300)
-def get_entities_for_organisation_and_dataset(
-    organisation_entity: int | str, dataset: str
-) -> list:
-    """
-    Fetch all authoritative entities for a given organisation entity number and dataset
-    from the planning data /entity.json endpoint. Handles pagination.
-    Returns a list of entity dicts.
-    """
+# Entities per /entity.json page.
+_ENTITY_PAGE_SIZE = 500
+
+
+def _entities_url(
+    organisation_entity: int | str,
+    dataset: str,
+    fields=None,
+    offset: int = None,
+    since: str = None,
+) -> str:
     planning_url = current_app.config.get("PLANNING_BASE_URL")
     url = (
         f"{planning_url}/entity.json"
         f"?organisation_entity={organisation_entity}"
         f"&dataset={dataset}"
         f"&quality=authoritative"
-        f"&limit=500"
+        f"&limit={_ENTITY_PAGE_SIZE}"
+    )
+    if offset:
+        url += f"&offset={offset}"
+    if since:
+        # Entities whose entry date is on or after since (YYYY-MM-DD).
+        year, month, day = since[:10].split("-")
+        url += (
+            f"&entry_date_year={int(year)}&entry_date_month={int(month)}"
+            f"&entry_date_day={int(day)}&entry_date_match=since"
+        )
+    # The API returns only the fields asked for; links.next keeps them.
+    for field in fields or ():
+        url += f"&field={field}"
+    return url
+
+
+def _next_page_url(data: dict) -> str | None:
+    next_url = (data.get("links") or {}).get("next")
+    if next_url and next_url.startswith("/"):
+        planning_url = current_app.config.get("PLANNING_BASE_URL")
+        return f"{planning_url.rstrip('/')}{next_url}"
+    return next_url or None
+
+
+def iter_entities_for_organisation_and_dataset(
+    organisation_entity: int | str, dataset: str, fields=None, since: str = None
+):
+    """
+    Yield the authoritative entities for an organisation entity number and
+    dataset one page at a time, in the entity number order /entity.json
+    returns them, so only one page is held in memory. fields, when given,
+    limits each entity to those fields; since (an ISO date) to the entities
+    entered on or after it.
+
+    Unlike get_entities_for_organisation_and_dataset, a failed page raises:
+    a silently truncated stream would misreport entities as missing.
+    """
+    url = _entities_url(organisation_entity, dataset, fields, since=since)
+    page = 0
+    while url:
+        page += 1
+        response = planning_http.get(url)
+        response.raise_for_status()
+        data = response.json()
+        yield from data.get("entities", [])
+        url = _next_page_url(data)
+    logger.info(
+        f"Streamed entities for organisation_entity={organisation_entity} "
+        f"dataset={dataset} in {page} page(s)"
     )
 
+
+def _fetch_entity_page(url: str) -> dict:
+    response = planning_http.get(url)
+    response.raise_for_status()
+    return response.json()
+
+
+def _fetch_entity_windows(organisation_entity, dataset, fields, count: int) -> tuple:
+    """
+    Fetch the count entities in offset windows, PLANNING_DATA_FETCH_WORKERS
+    at a time. Returns (entities in offset order, the next page's URL if the
+    last window was full, pages fetched); a failed window truncates the list
+    there, as a failed page does when following links.next.
+    """
+    workers = max(1, int(current_app.config.get("PLANNING_DATA_FETCH_WORKERS", 1)))
+    urls = [
+        _entities_url(organisation_entity, dataset, fields, offset)
+        for offset in range(0, count, _ENTITY_PAGE_SIZE)
+    ]
+    entities = []
+    next_url = None
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+        futures = [pool.submit(_fetch_entity_page, url) for url in urls]
+        try:
+            for page, future in enumerate(futures, start=1):
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Failed to fetch entities (page {page}) for organisation_entity="
+                        f"{organisation_entity} dataset={dataset}: {e}",
+                        exc_info=True,
+                    )
+                    return entities, None, page
+                page_entities = data.get("entities", [])
+                entities.extend(page_entities)
+                if len(page_entities) < _ENTITY_PAGE_SIZE:
+                    return entities, None, page
+                next_url = _next_page_url(data)
+        finally:
+            for future in futures:
+                future.cancel()
+    return entities, next_url, len(urls)
+
+
+@cache.memoize(timeout=300)
+def get_entities_for_organisation_and_dataset(
+    organisation_entity: int | str, dataset: str, count: int = None, fields=None
+) -> list:
+    """
+    Fetch all authoritative entities for a given organisation entity number and dataset
+    from the planning data /entity.json endpoint. Handles pagination.
+    Returns a list of entity dicts.
+
+    Given the entity count (get_entity_count_for_organisation_and_dataset),
+    the pages are fetched in parallel offset windows; any entities added since
+    the count are then read by following links.next. fields, when given,
+    limits each entity to those fields (pass a tuple, it is part of the cache
+    key).
+    """
     entities = []
     page = 0
+    url = _entities_url(organisation_entity, dataset, fields)
+    if count and count > _ENTITY_PAGE_SIZE:
+        entities, url, page = _fetch_entity_windows(
+            organisation_entity, dataset, fields, count
+        )
+
     while url:
         page += 1
         try:
-            response = requests.get(url, timeout=REQUESTS_TIMEOUT)
-            response.raise_for_status()
-            data = response.json()
+            data = _fetch_entity_page(url)
         except Exception as e:
             logger.error(
                 f"Failed to fetch entities (page {page}) for organisation_entity="
@@ -70,18 +195,49 @@ def get_entities_for_organisation_and_dataset(
             break
 
         entities.extend(data.get("entities", []))
-
-        next_url = (data.get("links") or {}).get("next")
-        if next_url:
-            if next_url.startswith("/"):
-                url = f"{planning_url.rstrip('/')}{next_url}"
-            else:
-                url = next_url
-        else:
-            url = None
+        url = _next_page_url(data)
 
     logger.info(
         f"Fetched {len(entities)} entities for organisation_entity={organisation_entity} "
         f"dataset={dataset} in {page} page(s)"
     )
     return entities
+
+
+def _entity_search_url(dataset_id, reference):
+    base = current_app.config["PLANNING_BASE_URL"]
+    return f"{base}/entity.json?dataset={dataset_id}&reference={reference}"
+
+
+def _entity_geojson_url(reference):
+    base = current_app.config["PLANNING_BASE_URL"]
+    return f"{base}/entity.geojson?reference={reference}"
+
+
+def fetch_lpa_boundary_geojson(organisation_code: str) -> dict:
+    """
+    Fetch the local planning authority boundary of an organisation
+    ("prefix:reference") as a GeoJSON FeatureCollection.
+
+    Looks the organisation up, then fetches the boundary of its
+    local-planning-authority. An organisation without one gets an empty
+    collection; a failed call raises.
+    """
+    empty = {"type": "FeatureCollection", "features": []}
+    if ":" not in organisation_code:
+        return empty
+    lpa_prefix, lpa_id = organisation_code.split(":", 1)
+    resp = planning_http.get(_entity_search_url(lpa_prefix, lpa_id))
+    resp.raise_for_status()
+    d = resp.json()
+    entity = d.get("entities", [])[0] if d and d.get("entities") else None
+    if not entity:
+        return empty
+    reference = (
+        entity.get("local-planning-authority") if entity.get("reference") else ""
+    )
+    if not reference:
+        return empty
+    resp = planning_http.get(_entity_geojson_url(reference))
+    resp.raise_for_status()
+    return resp.json()
@@ -0,0 +1,76 @@
+"""
+Background pre-warming of the caches behind results pages.
+
+While a loading page is shown, and again as soon as its job finishes, the
+upstream reads the results page will make (response details, platform
+entities, endpoint info, boundaries, ...) are started here in a small
+per-process thread pool, so that the first render finds them in the cache.
+
+A task is identified by a key; a key already queued or running is not
+submitted again, so repeated loading-page renders don't pile up work.
+``PREWARM_WORKERS`` sets the pool size (0 disables pre-warming).
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_in_flight = set()
+_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    # A pool inherited over fork has no threads, so build one per process.
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="prewarm"
+        )
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def is_enabled() -> bool:
+    return current_app.config.get("PREWARM_WORKERS", 0) > 0
+
+
+def submit(key, fn, *args, **kwargs) -> bool:
+    """
+    Run fn(*args, **kwargs) in the background under the current app.
+
+    Returns False without submitting if pre-warming is disabled or a task
+    with the same key is still queued or running. Errors are logged, never
+    raised: a failed pre-warm only means the page fetches it itself.
+    """
+    if not is_enabled():
+        return False
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                fn(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Pre-warm {key} failed: {e}")
+        finally:
+            with _lock:
+                _in_flight.discard(key)
+
+    with _lock:
+        if key in _in_flight:
+            return False
+        _in_flight.add(key)
+        try:
+            _get_executor(app.config["PREWARM_WORKERS"]).submit(run)
+        except RuntimeError:
+            _in_flight.discard(key)
+            raise
+    logger.debug(f"Pre-warm {key} submitted")
+    return True
@@ -0,0 +1,129 @@
+"""
+Coalesced status polling for async requests.
+
+Loading pages poll a request's status until its job finishes. Every poller of
+the same request in a worker shares one status fetch per
+``ASYNC_STATUS_POLL_INTERVAL``: whichever caller finds the status stale fetches
+it while the others wait and reuse the result, so the number of open tabs does
+not change the load on the async API.
+
+Pages can also ask for background work to start the moment a request is seen
+to finish (``when_done``), so results are being fetched before the loading
+page reloads.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from flask import current_app
+
+from . import prewarm
+from .async_api import AsyncAPIError, poll_request
+
+logger = logging.getLogger(__name__)
+
+_PENDING_STATUSES = {"PENDING", "PROCESSING", "QUEUED"}
+
+# Pollers not asked about for this long are dropped.
+_POLLER_IDLE_TIMEOUT = 300  # seconds
+
+_pollers = {}
+_pollers_lock = threading.Lock()
+
+
+def _fetch_status(request_id: str) -> dict:
+    try:
+        req = poll_request(request_id)
+    except (AsyncAPIError, requests.exceptions.RequestException, ValueError) as e:
+        # Let the page itself report a missing request; transient failures
+        # (timeouts, an open circuit breaker, a body that isn't JSON) just
+        # mean "try again later".
+        logger.warning(f"Status poll failed for {request_id}: {e}")
+        return {"status": "UNKNOWN", "done": False}
+    status = req.get("status")
+    # Same rule the views use to decide between the loading page and the result.
+    done = status not in _PENDING_STATUSES and req.get("response") is not None
+    return {"status": status, "done": done or status == "FAILED"}
+
+
+class _StatusPoller:
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.state = None
+        self.checked_at = 0.0
+        self.last_used = time.monotonic()
+        self.on_done = {}
+        self._lock = threading.Lock()
+
+    def current(self, max_age: float) -> dict:
+        # Holding the lock while fetching is what coalesces concurrent pollers.
+        with self._lock:
+            self.last_used = time.monotonic()
+            if self.state is None or self.last_used - self.checked_at >= max_age:
+                self.state = _fetch_status(self.request_id)
+                self.checked_at = time.monotonic()
+                if self.state["done"]:
+                    self._run_on_done()
+            return dict(self.state)
+
+    def add_on_done(self, key, fn, args):
+        with self._lock:
+            self.on_done[key] = (fn, args)
+            if self.state is not None and self.state["done"]:
+                self._run_on_done()
+
+    def _run_on_done(self):
+        on_done, self.on_done = self.on_done, {}
+        for key, (fn, args) in on_done.items():
+            prewarm.submit(key, fn, *args)
+
+
+def _poller_for(request_id: str) -> _StatusPoller:
+    now = time.monotonic()
+    with _pollers_lock:
+        for key in [
+            key
+            for key, poller in _pollers.items()
+            if now - poller.last_used > _POLLER_IDLE_TIMEOUT
+        ]:
+            del _pollers[key]
+        poller = _pollers.get(request_id)
+        if poller is None:
+            poller = _pollers[request_id] = _StatusPoller(request_id)
+        return poller
+
+
+def when_done(request_id: str, key, fn, *args):
+    """
+    Run fn(*args) in the background (see prewarm.submit) once request_id is
+    seen to have finished by a status poll. Registering the same key again
+    replaces the earlier registration.
+    """
+    if prewarm.is_enabled():
+        _poller_for(request_id).add_on_done(key, fn, args)
+
+
+def get_request_status(request_id: str, wait: float = 0) -> dict:
+    """
+    Return {"status", "done"} for a request.
+
+    With wait > 0 this long-polls: it returns as soon as the request is done
+    or its status changes, or after wait seconds (capped at
+    ASYNC_STATUS_MAX_WAIT) with the latest status.
+    """
+    interval = current_app.config.get("ASYNC_STATUS_POLL_INTERVAL", 2)
+    wait = max(0, min(wait, current_app.config.get("ASYNC_STATUS_MAX_WAIT", 0)))
+    deadline = time.monotonic() + wait
+
+    poller = _poller_for(request_id)
+    state = poller.current(interval)
+    initial_status = state["status"]
+    while not state["done"] and state["status"] == initial_status:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        state = poller.current(interval)
+    return state
@@ -0,0 +1,199 @@
+"""
+A request's response details indexed once for every page that reads them.
+
+The entities table, the entity comparison, the review map and the check
+results map all look at the same things in each response-detail row: the
+entity it transforms to, its fields, its geometry and point facts, and the
+reference and name it was given. ``ResourceIndex.build`` walks the rows once,
+and each row's facts once, and keeps only those, so the full rows are never
+held. ``get_resource_index`` builds a request's index from the
+``iter_response_details`` stream and keeps it for an hour in
+``resource_indexes``, a bounded per-process LRU of live indexes: the app cache
+would pickle an index on every read, which for a large resource costs longer
+than the page that reads it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from .async_api import iter_response_details
+from .response_rows import compact_row
+
+# Indexes kept by resource_indexes; enough for the requests a worker's
+# reviewers have open at once.
+RESOURCE_INDEX_CACHE_SIZE = 16
+
+
+def normalise_entity_id(raw) -> str:
+    if raw is None or raw == "":
+        return ""
+    try:
+        return str(int(float(str(raw))))
+    except (ValueError, TypeError):
+        return str(raw)
+
+
+class IndexedEntry:
+    """What the pages use of one response-detail row."""
+
+    __slots__ = (
+        "entry_number",
+        "entity",
+        "fields",
+        "geometry",
+        "point",
+        "first_shape_wkt",
+        "reference",
+        "name",
+    )
+
+    def __init__(
+        self,
+        entry_number,
+        entity,
+        fields,
+        geometry,
+        point,
+        reference,
+        name,
+        first_shape_wkt=None,
+    ):
+        self.entry_number = entry_number
+        self.entity = entity
+        self.fields = fields
+        self.geometry = geometry
+        self.point = point
+        # The value of the first geometry or point fact, whichever comes
+        # first: the shape the check results map draws.
+        self.first_shape_wkt = first_shape_wkt
+        self.reference = reference
+        self.name = name
+
+    @property
+    def shape_wkt(self):
+        """The entry's shape: its geometry, else its point (None if neither)."""
+        return self.geometry or self.point or None
+
+
+def _index_entry(row) -> IndexedEntry:
+    row = compact_row(row)
+    facts = row.transformed_row
+    fields = {}
+    geometry = point = first_shape_wkt = None
+    for fact in facts:
+        field = fact.get("field")
+        if not field:
+            continue
+        value = fact.get("value", "")
+        fields[field] = value
+        # The first geometry / point fact is the entry's shape.
+        if field == "geometry" and geometry is None:
+            geometry = value
+        elif field == "point" and point is None:
+            point = value
+        else:
+            continue
+        if first_shape_wkt is None:
+            first_shape_wkt = value
+    converted_row = row.converted_row
+    entry_number = row.get("entry_number")
+    return IndexedEntry(
+        entry_number=entry_number,
+        entity=normalise_entity_id(facts[0].get("entity", "")) if facts else "",
+        fields=fields,
+        geometry=geometry,
+        point=point,
+        first_shape_wkt=first_shape_wkt,
+        reference=(
+            converted_row.get("reference")
+            or converted_row.get("Reference")
+            or f"Entry {entry_number}"
+        ),
+        name=converted_row.get("name", ""),
+    )
+
+
+class ResourceIndex:
+    """
+    Response-detail rows indexed in a single pass:
+
+    - entries: one IndexedEntry per row, in row order (so a page of rows is a
+      slice of them);
+    - entities: each entity's transformed fields ({field: value}), by
+      normalised entity id;
+    - shapes: the entries carrying a geometry or point.
+    """
+
+    __slots__ = ("entries", "entities", "shapes")
+
+    def __init__(self, entries: list):
+        self.entries = entries
+        self.entities = {}
+        self.shapes = []
+        for entry in entries:
+            if entry.entity:
+                self.entities[entry.entity] = entry.fields
+            if entry.shape_wkt:
+                self.shapes.append(entry)
+
+    @classmethod
+    def build(cls, rows) -> "ResourceIndex":
+        """
+        Index any iterable of response-detail rows, raw or ResponseRows
+        (typically iter_response_details), walking it once.
+        """
+        return cls([_index_entry(row) for row in rows])
+
+    @property
+    def row_count(self) -> int:
+        return len(self.entries)
+
+
+class ResourceIndexCache:
+    """Bounded, thread-safe LRU of live ResourceIndexes keyed by request id."""
+
+    def __init__(self, maxsize: int = RESOURCE_INDEX_CACHE_SIZE, timeout: int = 3600):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, request_id: str):
+        """Return the request's index, or None if not held or expired."""
+        with self._lock:
+            entry = self._entries.get(request_id)
+            if entry is None:
+                return None
+            expires, index = entry
+            if expires <= time.monotonic():
+                del self._entries[request_id]
+                return None
+            self._entries.move_to_end(request_id)
+            return index
+
+    def set(self, request_id: str, index: ResourceIndex):
+        with self._lock:
+            self._entries[request_id] = (time.monotonic() + self.timeout, index)
+            self._entries.move_to_end(request_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+resource_indexes = ResourceIndexCache()
+
+
+def get_resource_index(request_id: str) -> ResourceIndex:
+    """Stream a request's response details once and keep only their index."""
+    index = resource_indexes.get(request_id)
+    if index is None:
+        index = ResourceIndex.build(iter_response_details(request_id))
+        resource_indexes.set(request_id, index)
+    return index
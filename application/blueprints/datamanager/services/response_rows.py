@@ -0,0 +1,190 @@
+"""
+Compact in-memory form of async API response-detail rows.
+
+A response-detail row arrives as a dict holding a ``converted_row`` dict, a
+``transformed_row`` list of per-fact dicts and an ``issue_logs`` list. Across a
+large request the same keys ("entity", "field", "value", "start-date", ...)
+are repeated in every fact, and every fact dict carries its own hash table.
+
+``ResponseRow`` and ``Fact`` keep the same data in ``__slots__`` objects with
+interned keys and field names, built once as rows arrive from
+``iter_response_details``. Short values (entity numbers, dates, organisations,
+empty strings) are shared through a pool kept for the rows of one read, so
+each distinct value is held once rather than once per fact. Both keep the read-only ``get`` / ``[]`` access of
+the raw dicts. ``transformed_row`` is always a tuple of Facts and
+``issue_logs`` a tuple of dicts, so readers need no type checks; the table
+builders call ``compact_row``, which passes compact rows straight through and
+builds one from a raw dict.
+"""
+
+import sys
+
+_MISSING = object()
+
+# Longer values (geometries, free text) are rarely repeated and not pooled.
+_POOLED_VALUE_MAX_LENGTH = 64
+
+# Fact keys stored in slots, and the slot each is stored in.
+_FACT_SLOTS = {
+    "entity": "entity",
+    "field": "field",
+    "value": "value",
+    "start-date": "start_date",
+    "end-date": "end_date",
+    "entry-date": "entry_date",
+    "reference-entity": "reference_entity",
+    "entry-number": "entry_number",
+    "resource": "resource",
+}
+
+
+def _pooled(value, pool):
+    if pool is None or type(value) is not str:
+        return value
+    if len(value) > _POOLED_VALUE_MAX_LENGTH:
+        return value
+    return pool.setdefault(value, value)
+
+
+def _compact_dict(data: dict, pool) -> dict:
+    return {
+        (sys.intern(key) if type(key) is str else key): _pooled(value, pool)
+        for key, value in data.items()
+    }
+
+
+class Fact:
+    """One transformed fact; reads like the dict it was built from."""
+
+    __slots__ = tuple(_FACT_SLOTS.values()) + ("extra",)
+
+    def __init__(self, data: dict, pool: dict = None):
+        extra = None
+        for key, value in data.items():
+            slot = _FACT_SLOTS.get(key)
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[sys.intern(key) if type(key) is str else key] = _pooled(
+                    value, pool
+                )
+            elif slot == "field" and type(value) is str:
+                # A bounded set of names, repeated in every row.
+                setattr(self, slot, sys.intern(value))
+            else:
+                setattr(self, slot, _pooled(value, pool))
+        self.extra = extra
+
+    def get(self, key, default=None):
+        slot = _FACT_SLOTS.get(key)
+        if slot is None:
+            return self.extra.get(key, default) if self.extra else default
+        return getattr(self, slot, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self) -> dict:
+        data = {
+            key: getattr(self, slot)
+            for key, slot in _FACT_SLOTS.items()
+            if hasattr(self, slot)
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, (Fact, dict)):
+            return self.to_dict() == (
+                other.to_dict() if isinstance(other, Fact) else other
+            )
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Fact({self.to_dict()!r})"
+
+
+class ResponseRow:
+    """One response-detail row; reads like the dict it was built from."""
+
+    __slots__ = (
+        "entry_number",
+        "converted_row",
+        "transformed_row",
+        "issue_logs",
+        "extra",
+    )
+
+    _KEYS = ("entry_number", "converted_row", "transformed_row", "issue_logs")
+
+    def __init__(self, data: dict, pool: dict = None):
+        self.entry_number = data.get("entry_number")
+        converted = data.get("converted_row")
+        self.converted_row = (
+            _compact_dict(converted, pool) if isinstance(converted, dict) else {}
+        )
+        # Entries that aren't objects carry nothing the table builders read, so
+        # transformed_row and issue_logs always hold just dicts / Facts.
+        facts = data.get("transformed_row")
+        self.transformed_row = (
+            tuple(Fact(fact, pool) for fact in facts if isinstance(fact, dict))
+            if isinstance(facts, list)
+            else ()
+        )
+        issues = data.get("issue_logs")
+        self.issue_logs = (
+            tuple(
+                _compact_dict(issue, pool)
+                for issue in issues
+                if isinstance(issue, dict)
+            )
+            if isinstance(issues, list)
+            else ()
+        )
+        extra = {key: value for key, value in data.items() if key not in self._KEYS}
+        self.extra = _compact_dict(extra, pool) if extra else None
+
+    def get(self, key, default=None):
+        if key in self._KEYS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self) -> dict:
+        data = {
+            "entry_number": self.entry_number,
+            "converted_row": self.converted_row,
+            "transformed_row": [fact.to_dict() for fact in self.transformed_row],
+            "issue_logs": list(self.issue_logs),
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, ResponseRow):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ResponseRow({self.to_dict()!r})"
+
+
+def compact_row(row) -> ResponseRow:
+    """Return row as a ResponseRow, building one only if it's still a dict."""
+    return row if isinstance(row, ResponseRow) else ResponseRow(row)
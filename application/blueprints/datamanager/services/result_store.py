@@ -0,0 +1,296 @@
+"""
+Durable store for the response details of finished async requests.
+
+Response details never change once a request has completed, so rows read from
+the async API are written to a SQLite file shared by every worker on the host,
+keyed by request and row position. Each request's rows are stored once: any
+``(offset, limit)`` slice is served from whatever is already stored, and only
+the missing ranges are fetched. The file lives in ``RESULT_STORE_DIR`` (an empty
+value disables the store) and survives restarts; once the stored rows exceed
+``RESULT_STORE_MAX_BYTES`` the least recently read requests are evicted.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_DB_FILENAME = "response-details.sqlite3"
+_WRITE_BATCH_SIZE = 500
+
+_SCHEMA = (
+    # row_count stays NULL until a read has reached the end of the request.
+    """
+    CREATE TABLE IF NOT EXISTS stored_request (
+        request_id TEXT PRIMARY KEY,
+        row_count INTEGER,
+        size_bytes INTEGER NOT NULL,
+        last_read REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS response_detail (
+        request_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (request_id, position)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def _store_path():
+    # Raises OSError if the directory can't be made; callers treat that like
+    # any other store error.
+    directory = current_app.config.get("RESULT_STORE_DIR")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, _DB_FILENAME)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # Writes are committed in short batches so a slow writer never holds the
+    # lock for long, and WAL lets readers carry on while rows are written.
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    return conn
+
+
+def is_enabled() -> bool:
+    return bool(current_app.config.get("RESULT_STORE_DIR"))
+
+
+def stored_row_count(request_id: str):
+    """Return a request's total row count, or None if its end hasn't been read."""
+    try:
+        path = _store_path()
+        if path is None:
+            return None
+        with closing(_connect(path)) as conn:
+            row = conn.execute(
+                "SELECT row_count FROM stored_request WHERE request_id = ?",
+                (request_id,),
+            ).fetchone()
+            return row[0] if row else None
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Result store lookup failed for {request_id}: {e}")
+        return None
+
+
+def missing_ranges(request_id: str, start_offset: int = 0, max_rows: int = None):
+    """
+    Return the (start, stop) position ranges of a slice that aren't stored.
+
+    stop is None for an open-ended range running to the end of the request.
+    Once the request's row count is known the slice is clipped to it, so a
+    fully stored slice has no missing ranges. Marks the request as read for
+    eviction purposes.
+    """
+    stop = start_offset + max_rows if max_rows is not None else None
+    try:
+        with closing(_connect(_store_path())) as conn:
+            row = conn.execute(
+                "SELECT row_count FROM stored_request WHERE request_id = ?",
+                (request_id,),
+            ).fetchone()
+            if row is None:
+                return [(start_offset, stop)]
+            with conn:
+                conn.execute(
+                    "UPDATE stored_request SET last_read = ? WHERE request_id = ?",
+                    (time.time(), request_id),
+                )
+            row_count = row[0]
+            if row_count is not None:
+                stop = row_count if stop is None else min(stop, row_count)
+
+            query = (
+                "SELECT position FROM response_detail"
+                " WHERE request_id = ? AND position >= ?"
+            )
+            params = [request_id, start_offset]
+            if stop is not None:
+                query += " AND position < ?"
+                params.append(stop)
+
+            ranges = []
+            expected = start_offset
+            for (position,) in conn.execute(query + " ORDER BY position", params):
+                if position > expected:
+                    ranges.append((expected, position))
+                expected = position + 1
+            if stop is None or expected < stop:
+                ranges.append((expected, stop))
+            return ranges
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Result store lookup failed for {request_id}: {e}")
+        return [(start_offset, stop)]
+
+
+def iter_stored_rows(request_id: str, start_offset: int = 0, max_rows: int = None):
+    """
+    Yield the stored rows of a request in order, from start_offset.
+
+    Stops early at the first row that isn't stored (the request was evicted
+    since missing_ranges was asked, say) or if the store can't be read, so
+    callers compare what they got with what they asked for.
+    """
+    if max_rows is not None and max_rows <= 0:
+        return
+    query = (
+        "SELECT position, data FROM response_detail"
+        " WHERE request_id = ? AND position >= ?"
+    )
+    params = [request_id, start_offset]
+    if max_rows is not None:
+        query += " AND position < ?"
+        params.append(start_offset + max_rows)
+    expected = start_offset
+    try:
+        with closing(_connect(_store_path())) as conn:
+            for position, data in conn.execute(query + " ORDER BY position", params):
+                if position != expected:
+                    return
+                expected += 1
+                yield json.loads(data)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Result store read failed for {request_id}: {e}")
+
+
+def record_row_count(request_id: str, row_count: int):
+    """Record that a request ends after row_count rows."""
+    try:
+        with closing(_connect(_store_path())) as conn, conn:
+            conn.execute(
+                "INSERT INTO stored_request (request_id, row_count, size_bytes, last_read)"
+                " VALUES (?, ?, 0, ?)"
+                " ON CONFLICT (request_id) DO UPDATE SET row_count = excluded.row_count",
+                (request_id, row_count, time.time()),
+            )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Result store write failed for {request_id}: {e}")
+
+
+class _RowWriter:
+    """Write a run of a request's rows in batches, from a given position."""
+
+    def __init__(self, request_id: str, start_offset: int):
+        self.request_id = request_id
+        self.position = start_offset
+        self._batch = []
+        self._conn = _connect(_store_path())
+
+    def add(self, row: dict):
+        data = json.dumps(row, separators=(",", ":"))
+        self._batch.append((self.request_id, self.position, data))
+        self.position += 1
+        if len(self._batch) >= _WRITE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        # Rows are immutable, so a row another worker already wrote is kept,
+        # and only the rows this batch inserted count towards the size.
+        size_bytes = 0
+        with self._conn:
+            for row in self._batch:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO response_detail (request_id, position, data)"
+                    " VALUES (?, ?, ?)",
+                    row,
+                )
+                if cursor.rowcount > 0:
+                    size_bytes += len(row[2])
+            self._conn.execute(
+                "INSERT INTO stored_request (request_id, row_count, size_bytes, last_read)"
+                " VALUES (?, NULL, ?, ?)"
+                " ON CONFLICT (request_id) DO UPDATE"
+                " SET size_bytes = size_bytes + excluded.size_bytes",
+                (self.request_id, size_bytes, time.time()),
+            )
+        self._batch = []
+
+    def close(self):
+        try:
+            self.flush()
+            _evict(self._conn, keep=self.request_id)
+        finally:
+            self._conn.close()
+
+    def abort(self):
+        """Drop the unwritten rows and close, after a failed write."""
+        self._batch = []
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+        finally:
+            self._conn.close()
+
+
+def store_while_iterating(request_id: str, start_offset: int, rows):
+    """
+    Yield rows unchanged while writing them to the store from start_offset.
+
+    Any store error just stops the writing; the rows are still yielded.
+    """
+    writer = None
+    try:
+        writer = _RowWriter(request_id, start_offset)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Result store unavailable, not storing {request_id}: {e}")
+    try:
+        for row in rows:
+            if writer is not None:
+                try:
+                    writer.add(row)
+                except sqlite3.Error as e:
+                    logger.warning(f"Result store write failed for {request_id}: {e}")
+                    # Release the connection, and any write lock it holds.
+                    writer.abort()
+                    writer = None
+            yield row
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Result store write failed for {request_id}: {e}")
+
+
+def _evict(conn: sqlite3.Connection, keep: str = None):
+    max_bytes = current_app.config.get("RESULT_STORE_MAX_BYTES")
+    if not max_bytes:
+        return
+    total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM stored_request")
+    total = total.fetchone()[0]
+    if total <= max_bytes:
+        return
+    candidates = conn.execute(
+        "SELECT request_id, size_bytes FROM stored_request"
+        " WHERE request_id != ? ORDER BY last_read",
+        (keep or "",),
+    ).fetchall()
+    for request_id, size_bytes in candidates:
+        if total <= max_bytes:
+            break
+        with conn:
+            conn.execute(
+                "DELETE FROM stored_request WHERE request_id = ?", (request_id,)
+            )
+            conn.execute(
+                "DELETE FROM response_detail WHERE request_id = ?", (request_id,)
+            )
+        total -= size_bytes
+        logger.info(f"Evicted stored response details for {request_id}")
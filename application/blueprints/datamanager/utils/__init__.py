@@ -3,19 +3,38 @@ import logging
 from datetime import datetime
 from io import StringIO
 
-import requests
 from dotenv import load_dotenv
 from flask import current_app, render_template
 
+from application.http_client import CircuitOpenError
+
+from ..services.clients import (  # noqa: F401 - REQUESTS_TIMEOUT re-exported
+    REQUESTS_TIMEOUT,
+    datasette_http,
+    source_http,
+)
+from ..services.response_rows import compact_row
+
 # Load .env file for this module
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-REQUESTS_TIMEOUT = 20  # seconds
-
 
 def handle_error(e):
+    if isinstance(e, CircuitOpenError):
+        # Expected while the breaker is open, so no stack trace.
+        logger.warning(f"Service degraded: {e}")
+        message = (
+            "The checking service is temporarily unavailable. "
+            "Please try again in a few minutes."
+        )
+        retry_after = current_app.config.get("ASYNC_API_BREAKER_OPEN_SECONDS", 30)
+        return (
+            render_template("datamanager/error.html", message=message),
+            503,
+            {"Retry-After": str(int(retry_after))},
+        )
     logger.exception(f"Error: {e}")
     return render_template("datamanager/error.html", message=str(e)), 500
 
@@ -30,11 +49,11 @@ def get_spec_fields_union(dataset_id):
     """
     datasette_url = current_app.config.get("DATASETTE_BASE_URL")
     base = (f"{datasette_url}/dataset_field.json",)
-    headers = {"Accept": "application/json", "User-Agent": "Planning Data - Manage"}
+    headers = {"Accept": "application/json"}
 
     def _fetch(url):
         try:
-            r = requests.get(url, timeout=REQUESTS_TIMEOUT, headers=headers)
+            r = datasette_http.get(url, headers=headers)
             r.raise_for_status()
             rows = r.json() or []
             return [
@@ -93,7 +112,7 @@ def read_raw_csv_preview(source_url: str, max_rows: int = 50):
     if not source_url:
         return headers_, rows
     try:
-        resp = requests.get(source_url, timeout=REQUESTS_TIMEOUT)
+        resp = source_http.get(source_url)
         text = resp.content.decode("utf-8", errors="ignore")
         reader = csv.reader(StringIO(text))
         first = next(reader, None)
@@ -115,6 +134,10 @@ def build_check_tables(column_field_log, resp_details):
 
     Returns (converted_table, transformed_table, issue_log_table) where each
     is a dict compatible with the table() macro in components/table.html.
+
+    resp_details can be any iterable of response-detail rows, raw or
+    ResponseRows (including the iter_response_details stream); it is walked
+    exactly once.
     """
     # Converted table: entry_number + columns from column_field_log "column" key
     # plus any extra fields found in converted_row data (e.g. geom)
@@ -124,38 +147,7 @@ def build_check_tables(column_field_log, resp_details):
     known_columns = set(converted_headers)
     # Also extract spec fields for use in column mapping UI
     spec_fields = {entry["field"] for entry in column_field_log if entry.get("field")}
-
-    # First pass: discover any extra fields present in the data but not in column_field_log
     unmapped_columns = set()
-    for row in resp_details:
-        converted = row.get("converted_row") or {}
-        for key in converted:
-            if key not in known_columns:
-                converted_headers.append(key)
-                known_columns.add(key)
-                unmapped_columns.add(key)
-
-    converted_rows = []
-    for row in resp_details:
-        converted = row.get("converted_row") or {}
-        if any(str(v).strip() for v in converted.values()):
-            columns = {"entry_number": {"value": str(row.get("entry_number", ""))}}
-            columns.update(
-                {
-                    col: {"value": str(converted.get(col, ""))}
-                    for col in converted_headers
-                    if col != "entry_number"
-                }
-            )
-            converted_rows.append({"columns": columns})
-
-    converted_table = {
-        "columns": converted_headers,
-        "fields": converted_headers,
-        "rows": converted_rows,
-        "columnNameProcessing": "none",
-        "unmapped_columns": unmapped_columns,
-    }
 
     # Transformed table: entry_number + columns from column_field_log "field" key,
     # plus any extra fields present in the data but not in column_mapping
@@ -163,39 +155,6 @@ def build_check_tables(column_field_log, resp_details):
         entry["field"] for entry in column_field_log if entry.get("field")
     ]
     known_transformed = set(transformed_headers)
-    for row in resp_details:
-        for item in row.get("transformed_row") or []:
-            if isinstance(item, dict):
-                field = item.get("field")
-                if field and field not in known_transformed:
-                    transformed_headers.append(field)
-                    known_transformed.add(field)
-
-    transformed_rows = []
-    for row in resp_details:
-        transformed = row.get("transformed_row") or []
-        field_values = {
-            item["field"]: item.get("value", "")
-            for item in transformed
-            if isinstance(item, dict) and item.get("field")
-        }
-        if any(str(v).strip() for v in field_values.values()):
-            columns = {"entry_number": {"value": str(row.get("entry_number", ""))}}
-            columns.update(
-                {
-                    col: {"value": str(field_values.get(col, ""))}
-                    for col in transformed_headers
-                    if col != "entry_number"
-                }
-            )
-            transformed_rows.append({"columns": columns})
-
-    transformed_table = {
-        "columns": transformed_headers,
-        "fields": transformed_headers,
-        "rows": transformed_rows,
-        "columnNameProcessing": "none",
-    }
 
     # Issue log table: flattened from all rows' issue_logs
     issue_log_headers = [
@@ -208,9 +167,37 @@ def build_check_tables(column_field_log, resp_details):
         "value",
         "responsibility",
     ]
+
+    # Single pass: discover extra headers while keeping only the per-row values
+    # the tables need. Cells are filled in once every header is known.
+    converted_values = []
+    transformed_values = []
     issue_log_rows = []
     for row in resp_details:
-        for issue in row.get("issue_logs") or []:
+        row = compact_row(row)
+        entry_number = str(row.get("entry_number", ""))
+
+        converted = row.converted_row
+        for key in converted:
+            if key not in known_columns:
+                converted_headers.append(key)
+                known_columns.add(key)
+                unmapped_columns.add(key)
+        if any(str(v).strip() for v in converted.values()):
+            converted_values.append((entry_number, converted))
+
+        field_values = {}
+        for item in row.transformed_row:
+            field = item.get("field")
+            if field:
+                if field not in known_transformed:
+                    transformed_headers.append(field)
+                    known_transformed.add(field)
+                field_values[field] = item.get("value", "")
+        if any(str(v).strip() for v in field_values.values()):
+            transformed_values.append((entry_number, field_values))
+
+        for issue in row.issue_logs:
             issue_log_rows.append(
                 {
                     "columns": {
@@ -220,6 +207,45 @@ def build_check_tables(column_field_log, resp_details):
                 }
             )
 
+    converted_rows = []
+    for entry_number, converted in converted_values:
+        columns = {"entry_number": {"value": entry_number}}
+        columns.update(
+            {
+                col: {"value": str(converted.get(col, ""))}
+                for col in converted_headers
+                if col != "entry_number"
+            }
+        )
+        converted_rows.append({"columns": columns})
+
+    converted_table = {
+        "columns": converted_headers,
+        "fields": converted_headers,
+        "rows": converted_rows,
+        "columnNameProcessing": "none",
+        "unmapped_columns": unmapped_columns,
+    }
+
+    transformed_rows = []
+    for entry_number, field_values in transformed_values:
+        columns = {"entry_number": {"value": entry_number}}
+        columns.update(
+            {
+                col: {"value": str(field_values.get(col, ""))}
+                for col in transformed_headers
+                if col != "entry_number"
+            }
+        )
+        transformed_rows.append({"columns": columns})
+
+    transformed_table = {
+        "columns": transformed_headers,
+        "fields": transformed_headers,
+        "rows": transformed_rows,
+        "columnNameProcessing": "none",
+    }
+
     issue_log_table = {
         "columns": issue_log_headers,
         "fields": issue_log_headers,
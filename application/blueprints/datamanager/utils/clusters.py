@@ -0,0 +1,130 @@
+"""
+Server-side clustering of map points.
+
+``ClusterIndex`` is built once from a set of (lon, lat) points. For every zoom
+from ``max_zoom`` down to 0 it merges the clusters of the zoom above that fall
+in the same grid cell of ``radius`` screen pixels, so each zoom's clusters are
+unions of the next zoom's and a cluster clicked open splits into the ones
+drawn at its ``expansion_zoom``. The same hierarchy MapLibre's client-side
+clustering builds per page load, built once per request and category with
+NumPy and then answered per zoom and bounding box.
+"""
+
+import math
+
+import numpy as np
+
+# The review map's cluster settings: MapLibre's 512px tiles, clusterRadius 50
+# and clusterMaxZoom 13 (see CLUSTER_MAX_ZOOM in src/javascripts/map.js).
+CLUSTER_RADIUS = 50
+CLUSTER_MAX_ZOOM = 13
+_TILE_SIZE = 512
+# Web mercator's latitude limit.
+_MAX_LATITUDE = 85.05112878
+
+
+def _project(lonlat: np.ndarray) -> tuple:
+    """(lon, lat) degrees to web mercator x, y in [0, 1]."""
+    lon = lonlat[:, 0]
+    lat = np.clip(lonlat[:, 1], -_MAX_LATITUDE, _MAX_LATITUDE)
+    x = lon / 360 + 0.5
+    sin = np.sin(np.radians(lat))
+    y = 0.5 - 0.25 * np.log((1 + sin) / (1 - sin)) / math.pi
+    return x, y
+
+
+def _unproject(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    lon = (x - 0.5) * 360
+    lat = np.degrees(2 * np.arctan(np.exp((0.5 - y) * 2 * math.pi)) - math.pi / 2)
+    return np.column_stack([lon, lat])
+
+
+def abbreviate_count(count: int) -> str:
+    """The cluster label MapLibre uses: 1234 -> "1.2k", 12345 -> "12k"."""
+    if count >= 10000:
+        return f"{round(count / 1000)}k"
+    if count >= 1000:
+        return f"{round(count / 100) / 10:g}k"
+    return str(count)
+
+
+class ClusterIndex:
+    """
+    Hierarchical grid clustering of points for zooms 0 to max_zoom.
+
+    Each level holds the clusters' centres (count-weighted mean in web
+    mercator), point counts, the index of the point a single-point cluster
+    stands for (-1 for real clusters) and the zoom at which each cluster
+    splits. Above max_zoom every point is its own cluster.
+    """
+
+    def __init__(
+        self,
+        lonlat,
+        radius: int = CLUSTER_RADIUS,
+        max_zoom: int = CLUSTER_MAX_ZOOM,
+    ):
+        lonlat = np.asarray(lonlat, dtype=float).reshape(-1, 2)
+        self.max_zoom = max_zoom
+        n = len(lonlat)
+        self.bbox = (
+            tuple(np.concatenate([lonlat.min(axis=0), lonlat.max(axis=0)]).tolist())
+            if n
+            else None
+        )
+
+        x, y = _project(lonlat)
+        counts = np.ones(n, dtype=np.int64)
+        points = np.arange(n)
+        expansion = np.full(n, max_zoom + 1)
+        self._levels = {max_zoom + 1: (lonlat, counts, points, expansion)}
+        for zoom in range(max_zoom, -1, -1):
+            cell = radius / (_TILE_SIZE * 2**zoom)
+            cells = np.floor(x / cell).astype(np.int64) * (1 << 32) + np.floor(
+                y / cell
+            ).astype(np.int64)
+            _, parent = np.unique(cells, return_inverse=True)
+            parent = parent.reshape(-1)
+            size = parent.max() + 1 if n else 0
+            merged_counts = np.bincount(parent, weights=counts, minlength=size)
+            x = np.bincount(parent, weights=x * counts, minlength=size) / merged_counts
+            y = np.bincount(parent, weights=y * counts, minlength=size) / merged_counts
+            children = np.bincount(parent, minlength=size)
+            # A cluster with one child splits where that child does.
+            only_child = np.zeros(size, dtype=np.int64)
+            only_child[parent] = np.arange(len(parent))
+            expansion = np.where(children > 1, zoom + 1, expansion[only_child])
+            merged_counts = merged_counts.astype(np.int64)
+            points = np.where(merged_counts == 1, points[only_child], -1)
+            counts = merged_counts
+            self._levels[zoom] = (_unproject(x, y), counts, points, expansion)
+
+    def __len__(self):
+        return len(self._levels[self.max_zoom + 1][0])
+
+    def clusters(self, zoom: int, bbox=None) -> list:
+        """
+        The clusters drawn at zoom, as (lon, lat, count, point, expansion_zoom)
+        tuples; point is the index of the point a single-point cluster stands
+        for, else -1. bbox (west, south, east, north) limits them to a view.
+        """
+        zoom = min(max(int(zoom), 0), self.max_zoom + 1)
+        lonlat, counts, points, expansion = self._levels[zoom]
+        keep = np.ones(len(counts), dtype=bool)
+        if bbox is not None:
+            west, south, east, north = bbox
+            keep = (
+                (lonlat[:, 0] >= west)
+                & (lonlat[:, 0] <= east)
+                & (lonlat[:, 1] >= south)
+                & (lonlat[:, 1] <= north)
+            )
+        return list(
+            zip(
+                lonlat[keep, 0].tolist(),
+                lonlat[keep, 1].tolist(),
+                counts[keep].tolist(),
+                points[keep].tolist(),
+                expansion[keep].tolist(),
+            )
+        )
@@ -0,0 +1,312 @@
+"""
+Batch comparison of resource and platform geometries.
+
+Comparing an entity's geometry with the platform's means parsing two WKT
+strings and measuring the Hausdorff distance between them. Done one pair at a
+time this dominates the entities table for polygon-heavy datasets, so
+``geometries_differ`` takes every pair at once, parses them with shapely's
+array API (through ``geometry_cache``) and settles as many pairs as it can with cheap checks before any
+Hausdorff distance is computed:
+
+1. identical WKT text never differs;
+2. unparseable WKT falls back to the text comparison, so it differs;
+3. an empty geometry differs only from a non-empty one;
+4. bounding boxes further apart than the tolerance on any side always differ
+   (the Hausdorff distance is at least the largest difference of bounds);
+5. geometries with the same structure and every vertex within the tolerance
+   (``equals_exact``) never differ;
+6. the rest are compared by vectorised Hausdorff distance.
+
+Parsed geometries are shared through ``geometry_cache``, a bounded LRU keyed
+by a digest of the WKT text. Each entry holds the shapely geometry and, worked
+out on first use, its GeoJSON mapping, representative point and bounds, so a
+geometry compared for the entities table, drawn on the map and shown again on
+the next page view (or for the next request against the same organisation) is
+parsed once per process.
+
+``geojson_features`` renders geometries for the review map at a given zoom:
+simplified to half a screen pixel and with coordinates rounded to the
+precision that zoom can show. ``simplify_feature_collection`` does the same
+for GeoJSON fetched from elsewhere, such as LPA boundaries.
+"""
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+from shapely.errors import GEOSException
+from shapely.geometry import mapping
+
+# Hausdorff-distance tolerance in EPSG:4326 degrees. 1e-4 deg is roughly 10m
+# of perpendicular deviation at UK latitudes: large enough to absorb
+# reprocessing noise (coordinate precision, vertex ordering/sliding,
+# geometry-type wrapping) but still small enough to detect a genuinely moved
+# boundary.
+GEO_TOLERANCE = 1e-4
+
+# Entries kept by geometry_cache; enough for the shapes of a few large
+# requests and their organisations' platform entities.
+GEOMETRY_CACHE_SIZE = 4096
+
+_UNSET = object()
+
+
+class ParsedGeometry:
+    """A parsed WKT geometry and the values derived from it."""
+
+    __slots__ = ("geometry", "_geojson", "_point", "_bounds")
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+        self._geojson = _UNSET
+        self._point = _UNSET
+        self._bounds = _UNSET
+
+    @property
+    def geom_type(self) -> str:
+        return self.geometry.geom_type
+
+    @property
+    def geojson(self) -> dict:
+        """The GeoJSON geometry mapping; shared, so treat it as read-only."""
+        if self._geojson is _UNSET:
+            self._geojson = mapping(self.geometry)
+        return self._geojson
+
+    @property
+    def point(self) -> tuple:
+        """(lon, lat) of a point guaranteed to sit inside the shape."""
+        if self._point is _UNSET:
+            p = self.geometry.representative_point()
+            self._point = (p.x, p.y)
+        return self._point
+
+    @property
+    def bounds(self) -> tuple:
+        if self._bounds is _UNSET:
+            self._bounds = tuple(self.geometry.bounds)
+        return self._bounds
+
+
+class GeometryCache:
+    """
+    Bounded, thread-safe LRU of ParsedGeometry keyed by a digest of the WKT
+    text, so the key doesn't hold a second copy of a large polygon. WKT that
+    doesn't parse is never cached.
+    """
+
+    def __init__(self, maxsize: int = GEOMETRY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _lookup(self, key):
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+            return parsed
+
+    def _store(self, key, parsed: ParsedGeometry) -> ParsedGeometry:
+        with self._lock:
+            # Another thread may have parsed the same text meanwhile; keep one.
+            parsed = self._entries.setdefault(key, parsed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return parsed
+
+    def get(self, text: str) -> ParsedGeometry:
+        """Return the parsed geometry for text; raises like wkt.loads if it
+        isn't valid WKT."""
+        text = str(text).strip()
+        key = self._key(text)
+        parsed = self._lookup(key)
+        if parsed is None:
+            parsed = self._store(key, ParsedGeometry(shapely.from_wkt(text)))
+        return parsed
+
+    def get_many(self, texts) -> list:
+        """
+        Return a ParsedGeometry (None where the WKT doesn't parse) for each of
+        texts, parsing every cache miss in one shapely call.
+        """
+        texts = [str(text).strip() for text in texts]
+        keys = [self._key(text) for text in texts]
+        found = [self._lookup(key) for key in keys]
+        misses = {}
+        for i, parsed in enumerate(found):
+            if parsed is None:
+                misses.setdefault(keys[i], []).append(i)
+        if misses:
+            geometries = shapely.from_wkt(
+                [texts[positions[0]] for positions in misses.values()],
+                on_invalid="ignore",
+            )
+            for (key, positions), geometry in zip(misses.items(), geometries):
+                if geometry is None:
+                    continue
+                parsed = self._store(key, ParsedGeometry(geometry))
+                for i in positions:
+                    found[i] = parsed
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+geometry_cache = GeometryCache()
+
+
+def parse_geometry(text: str) -> ParsedGeometry:
+    """Parse WKT through the shared geometry_cache."""
+    return geometry_cache.get(text)
+
+
+def _pair_differs(g1, g2, tolerance: float) -> bool:
+    try:
+        return shapely.hausdorff_distance(g1, g2) > tolerance
+    except GEOSException:
+        return not shapely.equals(g1, g2)
+
+
+def _geometry_array(texts) -> np.ndarray:
+    parsed = geometry_cache.get_many(texts)
+    return np.array([p.geometry if p else None for p in parsed], dtype=object)
+
+
+def geometries_differ(
+    resource_wkts, platform_wkts, tolerance: float = GEO_TOLERANCE
+) -> list:
+    """
+    For each (resource, platform) pair of WKT strings, whether they represent
+    meaningfully different shapes: Hausdorff distance above tolerance, so
+    reprocessing artefacts (coordinate precision, vertex ordering, POINT vs
+    MULTIPOINT wrapping) are ignored while a genuine move is detected.
+
+    Returns a list of bools in the order of the pairs.
+    """
+    res = np.array([str(v).strip() for v in resource_wkts], dtype=object)
+    plat = np.array([str(v).strip() for v in platform_wkts], dtype=object)
+    differ = np.zeros(len(res), dtype=bool)
+
+    idx = np.flatnonzero(res != plat)
+    if not idx.size:
+        return differ.tolist()
+
+    g1 = _geometry_array(res[idx])
+    g2 = _geometry_array(plat[idx])
+    unparsed = shapely.is_missing(g1) | shapely.is_missing(g2)
+    differ[idx[unparsed]] = True
+    idx, g1, g2 = idx[~unparsed], g1[~unparsed], g2[~unparsed]
+
+    empty1, empty2 = shapely.is_empty(g1), shapely.is_empty(g2)
+    either_empty = empty1 | empty2
+    differ[idx[either_empty]] = empty1[either_empty] != empty2[either_empty]
+    idx, g1, g2 = idx[~either_empty], g1[~either_empty], g2[~either_empty]
+
+    far = np.abs(shapely.bounds(g1) - shapely.bounds(g2)).max(axis=1) > tolerance
+    differ[idx[far]] = True
+    idx, g1, g2 = idx[~far], g1[~far], g2[~far]
+
+    close = shapely.equals_exact(g1, g2, tolerance=tolerance)
+    idx, g1, g2 = idx[~close], g1[~close], g2[~close]
+
+    if idx.size:
+        try:
+            differ[idx] = shapely.hausdorff_distance(g1, g2) > tolerance
+        except GEOSException:
+            # One bad pair fails the whole array; settle them one at a time.
+            differ[idx] = [_pair_differs(a, b, tolerance) for a, b in zip(g1, g2)]
+    return differ.tolist()
+
+
+# Map zooms the review map asks for; 22 is MapLibre's deepest.
+MAX_MAP_ZOOM = 22
+
+
+def zoom_tolerance(zoom: int) -> float:
+    """Half a screen pixel at a MapLibre zoom (512px tiles), in degrees."""
+    return 360 / (512 * 2**zoom) / 2
+
+
+def zoom_precision(zoom: int) -> int:
+    """Decimal places that resolve a tenth of a screen pixel at zoom."""
+    return min(7, max(1, math.ceil(-math.log10(zoom_tolerance(zoom) / 5))))
+
+
+def _for_zoom(geometries: np.ndarray, zoom: int = None) -> np.ndarray:
+    """Simplify geometries for zoom (unless None) and round their coordinates."""
+    if zoom is not None:
+        simplified = shapely.simplify(
+            geometries, zoom_tolerance(zoom), preserve_topology=True
+        )
+        # Shapes smaller than the tolerance would vanish; keep them whole.
+        geometries = np.where(shapely.is_empty(simplified), geometries, simplified)
+    precision = 7 if zoom is None else zoom_precision(zoom)
+    return shapely.transform(geometries, lambda coords: coords.round(precision))
+
+
+def geojson_features(items, zoom: int = None, as_points: bool = False) -> tuple:
+    """
+    Render (wkt, properties) items as GeoJSON Feature strings for the map.
+
+    At a zoom, each geometry is simplified by zoom_tolerance and its
+    coordinates rounded to zoom_precision; without one, geometries keep full
+    detail and 7 decimal places. as_points gives each item's representative
+    point instead of its shape. Items whose WKT doesn't parse are left out.
+
+    Returns (features, bounds): the Feature JSON strings and an (n, 4) array
+    of the bounds of each unsimplified shape (or point), for bbox filtering.
+    """
+    kept = [
+        (parsed, properties)
+        for parsed, (_, properties) in zip(
+            geometry_cache.get_many([wkt for wkt, _ in items]), items
+        )
+        if parsed is not None and not parsed.geometry.is_empty
+    ]
+    if not kept:
+        return [], np.empty((0, 4))
+    if as_points:
+        geometries = shapely.points([parsed.point for parsed, _ in kept])
+        bounds = shapely.bounds(geometries)
+    else:
+        bounds = np.array([parsed.bounds for parsed, _ in kept])
+        geometries = np.array([parsed.geometry for parsed, _ in kept], dtype=object)
+    geometries = _for_zoom(geometries, zoom)
+    features = [
+        f'{{"type":"Feature","geometry":{geometry},'
+        f'"properties":{json.dumps(properties)}}}'
+        for geometry, (_, properties) in zip(shapely.to_geojson(geometries), kept)
+    ]
+    return features, bounds
+
+
+def simplify_feature_collection(collection: dict, zoom: int) -> dict:
+    """
+    A copy of a GeoJSON FeatureCollection with each feature's geometry
+    simplified and rounded for zoom, as geojson_features does for WKT.
+    Features without a geometry are copied unchanged.
+    """
+    features = list(collection.get("features") or [])
+    shaped = [i for i, feature in enumerate(features) if feature.get("geometry")]
+    if shaped:
+        geometries = shapely.from_geojson(
+            [json.dumps(features[i]["geometry"]) for i in shaped]
+        )
+        for i, geometry in zip(shaped, shapely.to_geojson(_for_zoom(geometries, zoom))):
+            features[i] = {**features[i], "geometry": json.loads(geometry)}
+    return {**collection, "features": features}
@@ -2,25 +2,23 @@ import datetime
 import logging
 
 import pandas as pd
-import requests
-from requests import adapters
 from urllib3 import Retry
 
+from application.extensions import http_client
+
+_datasette_http = http_client.service(
+    "datasette_query",
+    retries=Retry(total=3, status_forcelist=[400], backoff_factor=0),
+)
+
 
 def get_datasette_http():
     """
     Function to return  http for the use of querying  datasette,
-    specifically to add retries for larger queries
+    specifically to add retries for larger queries. The client is shared, so
+    connections are pooled across queries rather than opened per call.
     """
-    retry_strategy = Retry(total=3, status_forcelist=[400], backoff_factor=0)
-
-    adapter = adapters.HTTPAdapter(max_retries=retry_strategy)
-
-    http = requests.Session()
-    http.mount("https://", adapter)
-    http.mount("http://", adapter)
-
-    return http
+    return _datasette_http
 
 
 def get_datasette_query(
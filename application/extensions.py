@@ -4,8 +4,13 @@ from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_talisman import Talisman
 
+from application.http_client import HTTPClient
+from application.process_pool import ProcessPool
+
 cache = Cache()
 db = SQLAlchemy()
+http_client = HTTPClient()
 migrate = Migrate(db=db)
 oauth = OAuth()
+process_pool = ProcessPool()
 talisman = Talisman()
@@ -133,9 +133,19 @@ def register_extensions(app):
     """
     Import and register flask extensions and initialize with app object
     """
-    from application.extensions import cache, db, migrate, oauth, talisman
+    from application.extensions import (
+        cache,
+        db,
+        http_client,
+        migrate,
+        oauth,
+        process_pool,
+        talisman,
+    )
 
     cache.init_app(app)
+    http_client.init_app(app)
+    process_pool.init_app(app)
 
     db.init_app(app)
     migrate.init_app(app)
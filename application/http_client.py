@@ -0,0 +1,301 @@
+"""
+Shared, pooled HTTP client for upstream services.
+
+Service modules get a ``ServiceClient`` from ``http_client.service(...)``
+instead of calling ``requests.get``/``requests.post`` directly, so connections
+to each upstream host are kept alive and reused across calls in a worker.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+from requests import adapters
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 20
+DEFAULT_POOL_MAXSIZE = 10
+
+_SHARED_SESSION = "shared"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a service whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker for one upstream service.
+
+    Closed: calls go through, and the outcome of each is recorded. Once at
+    least MIN_CALLS calls in the last WINDOW seconds have been made and the
+    share that failed (connection error, timeout, 5xx) or took longer than
+    SLOW_CALL_SECONDS reaches FAILURE_RATE, the breaker opens.
+
+    Open: calls fail immediately with CircuitOpenError for OPEN_SECONDS.
+
+    Half-open: a single probe call is let through; success closes the breaker,
+    failure opens it again. ``before_call`` returns True for the probe, and
+    only the outcome recorded with ``probe=True`` leaves half-open, so calls
+    that started before the breaker opened can't close or reopen it.
+
+    Settings are read from the app config as ``<config_prefix>_<SETTING>``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        name,
+        config_prefix=None,
+        failure_rate=0.5,
+        min_calls=5,
+        window=30,
+        slow_call_seconds=None,
+        open_seconds=30,
+    ):
+        self.name = name
+        self.config_prefix = config_prefix
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self._calls = deque()
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        if not self.config_prefix:
+            return
+        for setting in (
+            "failure_rate",
+            "min_calls",
+            "window",
+            "slow_call_seconds",
+            "open_seconds",
+        ):
+            key = f"{self.config_prefix}_{setting.upper()}"
+            if key in config:
+                setattr(self, setting, config[key])
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._calls.clear()
+            self._probe_in_flight = False
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError if the call mustn't go ahead; True for a probe."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record(self, failed, seconds, probe=False):
+        if self.slow_call_seconds and seconds >= self.slow_call_seconds:
+            failed = True
+        now = time.monotonic()
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                if not probe:
+                    return
+                self._probe_in_flight = False
+                self._calls.clear()
+                if failed:
+                    self._open(now)
+                else:
+                    self._set_state(self.CLOSED)
+                return
+            if self.state == self.OPEN:
+                return
+
+            self._calls.append((now, failed))
+            while self._calls and now - self._calls[0][0] > self.window:
+                self._calls.popleft()
+            failures = sum(1 for _, call_failed in self._calls if call_failed)
+            if len(
+                self._calls
+            ) >= self.min_calls and failures >= self.failure_rate * len(self._calls):
+                logger.warning(
+                    f"Circuit breaker for {self.name}: {failures} of the last "
+                    f"{len(self._calls)} calls failed or were slow"
+                )
+                self._calls.clear()
+                self._open(now)
+
+    def _open(self, now):
+        self._opened_at = now
+        self._set_state(self.OPEN)
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        log = logger.warning if state == self.OPEN else logger.info
+        log(f"Circuit breaker for {self.name}: {self.state} -> {state}")
+        self.state = state
+
+
+class ServiceClient:
+    """
+    A named view onto the pooled sessions for one upstream service.
+
+    Applies the service's default timeout and headers to every call; callers
+    can still override either per request. Services registered with a retry
+    strategy get their own session (and adapter), everything else shares one.
+    A service with a circuit breaker fails fast with CircuitOpenError while
+    the breaker is open.
+    """
+
+    def __init__(
+        self, client, name, timeout=None, headers=None, retries=None, breaker=None
+    ):
+        self._client = client
+        self.name = name
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.retries = retries
+        self.breaker = breaker
+
+    @property
+    def session(self) -> requests.Session:
+        key = self.name if self.retries is not None else _SHARED_SESSION
+        return self._client.session(key, retries=self.retries)
+
+    def request(self, method, url, **kwargs):
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        if self.headers:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+        if self.breaker is None:
+            return self.session.request(method, url, **kwargs)
+
+        probe = self.breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self.breaker.record(
+                failed=True, seconds=time.monotonic() - started, probe=probe
+            )
+            raise
+        self.breaker.record(
+            failed=response.status_code >= 500,
+            seconds=time.monotonic() - started,
+            probe=probe,
+        )
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+class HTTPClient:
+    """
+    Flask extension holding the keep-alive connection pools for a process.
+
+    Sessions are created lazily and recreated after a fork, so gunicorn
+    workers never share sockets with the master process. Pool sizes come from
+    ``HTTP_POOL_CONNECTIONS`` (number of hosts kept) and ``HTTP_POOL_MAXSIZE``
+    (connections kept per host) in the app config.
+    """
+
+    def __init__(self, app=None):
+        self.pool_connections = DEFAULT_POOL_CONNECTIONS
+        self.pool_maxsize = DEFAULT_POOL_MAXSIZE
+        self._services = {}
+        self._sessions = {}
+        self._config = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.pool_connections = app.config.get(
+            "HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS
+        )
+        self.pool_maxsize = app.config.get("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+        self._config = app.config
+        for client in list(self._services.values()):
+            if client.breaker is not None:
+                client.breaker.configure(app.config)
+        # Drop any sessions built with the default sizes before configuration.
+        self.close()
+        app.extensions["http_client"] = self
+
+    def service(
+        self, name, timeout=None, headers=None, retries=None, breaker=None
+    ) -> ServiceClient:
+        """Register (or return the already registered) client for a service."""
+        with self._lock:
+            client = self._services.get(name)
+            if client is None:
+                client = ServiceClient(
+                    self,
+                    name,
+                    timeout=timeout,
+                    headers=headers,
+                    retries=retries,
+                    breaker=breaker,
+                )
+                if breaker is not None and self._config is not None:
+                    breaker.configure(self._config)
+                self._services[name] = client
+        return client
+
+    def session(self, key=_SHARED_SESSION, retries=None) -> requests.Session:
+        pid = os.getpid()
+        with self._lock:
+            if pid != self._pid:
+                self._sessions = {}
+                self._pid = pid
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._new_session(retries)
+                self._sessions[key] = session
+        return session
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values()) if self._pid == os.getpid() else []
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+    def _new_session(self, retries=None) -> requests.Session:
+        adapter_kwargs = {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+        }
+        if retries is not None:
+            adapter_kwargs["max_retries"] = retries
+        adapter = adapters.HTTPAdapter(**adapter_kwargs)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        logger.debug(
+            "Created pooled HTTP session (pool_connections=%s, pool_maxsize=%s)",
+            self.pool_connections,
+            self.pool_maxsize,
+        )
+        return session
@@ -0,0 +1,106 @@
+"""
+Per-process pool of worker processes for CPU-bound batch work.
+
+Comparing, parsing and simplifying the geometries of a large resource is
+GEOS work that keeps the request thread busy for seconds, and with it the
+gunicorn worker. ``process_pool.map_chunks`` splits such a batch into chunks,
+runs them across ``COMPUTE_PROCESS_WORKERS`` processes and returns the
+chunks' results in batch order, so callers combine them into exactly what
+one call over the whole batch gives. Batches smaller than
+``COMPUTE_PROCESS_MIN_ITEMS`` (and every batch, with 0 workers) run in the
+calling thread.
+"""
+
+import atexit
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_ITEMS = 2000
+
+# Chunks per worker process, so one slow chunk doesn't leave the others idle.
+_CHUNKS_PER_WORKER = 2
+
+
+class ProcessPool:
+    """
+    Flask extension holding a worker's pool of compute processes.
+
+    The processes are started on first use rather than with the app, so
+    gunicorn's master never starts any, and a process forked from one that
+    had a pool starts its own. They are started through a forkserver, since
+    forking a threaded worker can copy locks other threads hold. The pool is
+    shut down when the app is re-initialised and at exit.
+    """
+
+    def __init__(self, app=None):
+        self.workers = 0
+        self.min_items = DEFAULT_MIN_ITEMS
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.workers = app.config.get("COMPUTE_PROCESS_WORKERS", 0)
+        self.min_items = app.config.get("COMPUTE_PROCESS_MIN_ITEMS", DEFAULT_MIN_ITEMS)
+        self.shutdown()
+        app.extensions["process_pool"] = self
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        pid = os.getpid()
+        with self._lock:
+            if self._executor is None or self._pid != pid:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+                self._pid = pid
+            return self._executor
+
+    def map_chunks(self, fn, *columns, **kwargs) -> list:
+        """
+        Return [fn(*chunk, **kwargs)] for consecutive chunks of the equally
+        long sequences columns, in order; a single chunk of everything if
+        the batch is run in this thread.
+
+        fn must be a module-level function and its arguments and result
+        picklable. If the pool breaks (a process killed, say) the batch is
+        run in this thread instead and a new pool started next time.
+        """
+        size = len(columns[0]) if columns else 0
+        if self.workers <= 0 or size < max(self.min_items, 2):
+            return [fn(*columns, **kwargs)]
+        chunk_size = math.ceil(size / (self.workers * _CHUNKS_PER_WORKER))
+        try:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(
+                    fn,
+                    *(column[start : start + chunk_size] for column in columns),
+                    **kwargs,
+                )
+                for start in range(0, size, chunk_size)
+            ]
+            return [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            logger.warning(f"Process pool broke, running {fn.__name__} here: {e}")
+            self.shutdown()
+            return [fn(*columns, **kwargs)]
+
+    def shutdown(self):
+        with self._lock:
+            # A pool inherited over fork belongs to the parent; just drop it.
+            executor = self._executor if self._pid == os.getpid() else None
+            self._executor = None
+            self._pid = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
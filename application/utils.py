@@ -4,10 +4,13 @@ import hashlib
 import io
 from functools import wraps
 
-import requests
 from dateutil.relativedelta import relativedelta
 from requests import HTTPError
 
+from application.extensions import http_client
+
+_url_check_http = http_client.service("url_check", timeout=20)
+
 
 def compute_hash(value):
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
@@ -19,7 +22,7 @@ def compute_md5_hash(value):
 
 def check_url_reachable(url):
     try:
-        resp = requests.get(url)
+        resp = _url_check_http.get(url)
         resp.raise_for_status()
         return resp.ok
     except HTTPError as e:
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import base64
 import os
+import tempfile
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
@@ -51,6 +52,106 @@ class Config:
     CACHE_TYPE = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT = 300
 
+    # Keep-alive pools for the shared upstream HTTP client, per worker process.
+    # HTTP_POOL_CONNECTIONS is how many hosts keep a pool; HTTP_POOL_MAXSIZE is
+    # how many connections each host's pool holds, so keep it at least as large
+    # as the widest parallel fan-out a single page makes.
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "20"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+
+    # Concurrent response-details page fetches per request (1 = serial). Keep
+    # this at or below HTTP_POOL_MAXSIZE.
+    ASYNC_API_FETCH_WORKERS = int(os.getenv("ASYNC_API_FETCH_WORKERS", "4"))
+
+    # Concurrent /entity.json page fetches when reading an organisation's
+    # platform entities (1 = serial). Keep this at or below HTTP_POOL_MAXSIZE.
+    PLANNING_DATA_FETCH_WORKERS = int(os.getenv("PLANNING_DATA_FETCH_WORKERS", "4"))
+
+    # Circuit breaker around the async request API, per worker process. It opens
+    # once FAILURE_RATE of at least MIN_CALLS calls in the last WINDOW seconds
+    # failed (error, 5xx, or slower than SLOW_CALL_SECONDS); pages then fail fast
+    # with a "service degraded" message for OPEN_SECONDS before a probe call.
+    ASYNC_API_BREAKER_FAILURE_RATE = float(
+        os.getenv("ASYNC_API_BREAKER_FAILURE_RATE", "0.5")
+    )
+    ASYNC_API_BREAKER_MIN_CALLS = int(os.getenv("ASYNC_API_BREAKER_MIN_CALLS", "5"))
+    ASYNC_API_BREAKER_WINDOW = float(os.getenv("ASYNC_API_BREAKER_WINDOW", "30"))
+    ASYNC_API_BREAKER_SLOW_CALL_SECONDS = float(
+        os.getenv("ASYNC_API_BREAKER_SLOW_CALL_SECONDS", "10")
+    )
+    ASYNC_API_BREAKER_OPEN_SECONDS = float(
+        os.getenv("ASYNC_API_BREAKER_OPEN_SECONDS", "30")
+    )
+
+    # Response-details page size adapts to the rows being fetched: each page
+    # aims for about TARGET_BYTES and TARGET_SECONDS (well inside the 20s
+    # request timeout), bounded by MIN and MAX rows. Set MIN = MAX to fix it.
+    ASYNC_API_DETAILS_BATCH_MIN = int(os.getenv("ASYNC_API_DETAILS_BATCH_MIN", "25"))
+    ASYNC_API_DETAILS_BATCH_MAX = int(os.getenv("ASYNC_API_DETAILS_BATCH_MAX", "1000"))
+    ASYNC_API_DETAILS_BATCH_TARGET_BYTES = int(
+        os.getenv("ASYNC_API_DETAILS_BATCH_TARGET_BYTES", str(2 * 1024**2))
+    )
+    ASYNC_API_DETAILS_BATCH_TARGET_SECONDS = float(
+        os.getenv("ASYNC_API_DETAILS_BATCH_TARGET_SECONDS", "4")
+    )
+
+    # Loading pages poll /datamanager/request-status; all polls of one request in
+    # a worker share one async API call per ASYNC_STATUS_POLL_INTERVAL seconds.
+    # ASYNC_STATUS_MAX_WAIT caps how long a poll may long-poll for a change; it
+    # holds a worker for that long, so leave it at 0 with sync gunicorn workers.
+    ASYNC_STATUS_POLL_INTERVAL = float(os.getenv("ASYNC_STATUS_POLL_INTERVAL", "2"))
+    ASYNC_STATUS_MAX_WAIT = float(os.getenv("ASYNC_STATUS_MAX_WAIT", "0"))
+
+    # The check-transform page fetches its upstream data side by side; anything
+    # other than the response details not back within this many seconds is
+    # shown empty rather than holding up the page.
+    CHECK_TRANSFORM_FETCH_DEADLINE = float(
+        os.getenv("CHECK_TRANSFORM_FETCH_DEADLINE", "25")
+    )
+
+    # Background threads per worker that pre-warm the caches behind a results
+    # page while its loading page is shown (0 disables pre-warming).
+    PREWARM_WORKERS = int(os.getenv("PREWARM_WORKERS", "4"))
+
+    # Processes per worker that geometry comparison and map features for a
+    # large resource are split across (0 keeps all work on the request
+    # thread); batches of fewer than COMPUTE_PROCESS_MIN_ITEMS items aren't
+    # split.
+    COMPUTE_PROCESS_WORKERS = int(os.getenv("COMPUTE_PROCESS_WORKERS", "4"))
+    COMPUTE_PROCESS_MIN_ITEMS = int(os.getenv("COMPUTE_PROCESS_MIN_ITEMS", "2000"))
+
+    # Response details of completed requests are kept in a SQLite file in this
+    # directory, shared by all workers on the host (empty disables the store).
+    # Least recently read requests are evicted once it holds more than
+    # RESULT_STORE_MAX_BYTES of rows.
+    RESULT_STORE_DIR = os.getenv(
+        "RESULT_STORE_DIR",
+        os.path.join(tempfile.gettempdir(), "config-manager-results"),
+    )
+    RESULT_STORE_MAX_BYTES = int(os.getenv("RESULT_STORE_MAX_BYTES", str(2 * 1024**3)))
+
+    # Snapshots of organisations' platform entities are kept in a SQLite file in
+    # this directory (empty disables the store) and refreshed incrementally.
+    # Least recently read snapshots are evicted past ENTITY_STORE_MAX_BYTES.
+    ENTITY_STORE_DIR = os.getenv(
+        "ENTITY_STORE_DIR",
+        os.path.join(tempfile.gettempdir(), "config-manager-entities"),
+    )
+    ENTITY_STORE_MAX_BYTES = int(os.getenv("ENTITY_STORE_MAX_BYTES", str(1024**3)))
+
+    # LPA boundaries are kept, with copies simplified for the map, in a SQLite
+    # file in this directory (empty disables the store). A boundary older than
+    # BOUNDARY_STORE_REFRESH_AFTER seconds is re-fetched in the background, one
+    # older than BOUNDARY_STORE_TTL before it is served.
+    BOUNDARY_STORE_DIR = os.getenv(
+        "BOUNDARY_STORE_DIR",
+        os.path.join(tempfile.gettempdir(), "config-manager-boundaries"),
+    )
+    BOUNDARY_STORE_REFRESH_AFTER = int(
+        os.getenv("BOUNDARY_STORE_REFRESH_AFTER", str(24 * 3600))
+    )
+    BOUNDARY_STORE_TTL = int(os.getenv("BOUNDARY_STORE_TTL", str(30 * 24 * 3600)))
+
     # Planning Data base URL
     PLANNING_BASE_URL = os.getenv("PLANNING_URL", "https://www.planning.data.gov.uk")
 
@@ -104,6 +205,9 @@ class TestConfig(Config):
     AUTHENTICATION_ON = False
     SECRET_KEY = "testing"
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # Keep upstream calls on the test's own thread, where its mocks apply.
+    PREWARM_WORKERS = 0
+    COMPUTE_PROCESS_WORKERS = 0
 
 
 def get_request_api_endpoint():
@@ -227,14 +227,14 @@ class EntitySearchControl {
     this._message.style.fontSize = "12px";
     this._message.style.maxWidth = "176px";
 
-    const submit = () => {
+    const submit = async () => {
       const entityId = this._input.value.trim();
       if (!entityId) {
         this.setMessage("Enter an entity ID.", false);
         return;
       }
 
-      const feature = this.findEntity(entityId);
+      const feature = await this.findEntity(entityId);
       if (!feature) {
         this.setMessage(`No entity found for ${entityId}.`, false);
         return;
@@ -320,14 +320,18 @@ function addBoundaryGeoJsonToMap(map, geoJsonUrl) {
   console.log("Boundary layer added successfully");
 }
 
-function addCategoryCluster(map, category, points, showPopup, hasPolygons) {
+// serverClustered sources hold the clusters the review map fetched for the
+// view (see loadClustersInView) rather than raw points for MapLibre to cluster.
+function addCategoryCluster(map, category, points, showPopup, hasPolygons, serverClustered = false) {
   const sourceId = `points-${category.id}`;
   map.addSource(sourceId, {
     type: "geojson",
     data: { type: "FeatureCollection", features: points },
-    cluster: true,
-    clusterMaxZoom: CLUSTER_MAX_ZOOM,
-    clusterRadius: 50,
+    ...(!serverClustered && {
+      cluster: true,
+      clusterMaxZoom: CLUSTER_MAX_ZOOM,
+      clusterRadius: 50,
+    }),
   });
 
   // Cluster bubble — one colour per category, size grows with the count.
@@ -410,6 +414,13 @@ function addCategoryCluster(map, category, points, showPopup, hasPolygons) {
       layers: [`clusters-${category.id}`],
     })[0];
     if (!feature) return;
+    if (serverClustered) {
+      map.easeTo({
+        center: feature.geometry.coordinates,
+        zoom: feature.properties.expansion_zoom,
+      });
+      return;
+    }
     map
       .getSource(sourceId)
       .getClusterExpansionZoom(feature.properties.cluster_id, (err, zoom) => {
@@ -429,24 +440,131 @@ function addCategoryCluster(map, category, points, showPopup, hasPolygons) {
   });
 }
 
-function initMap() {
-  const { containerId, geometries, geometryPoints, boundaryGeoJsonUrl, entityFilter } =
+const fetchCollection = (url, options = {}) =>
+  fetch(url, { credentials: "same-origin", ...options }).then((response) =>
+    response.ok ? response.json() : { features: [] }
+  );
+
+const fetchFeatures = (url, options = {}) =>
+  fetchCollection(url, options).then((data) => data.features || []);
+
+// The zoom and bounding box query for the current view; pad widens the box
+// by that fraction of its size on each side.
+function viewQuery(map, pad = 0) {
+  const view = map.getBounds();
+  const padX = (view.getEast() - view.getWest()) * pad;
+  const padY = (view.getNorth() - view.getSouth()) * pad;
+  const bbox = [
+    view.getWest() - padX,
+    view.getSouth() - padY,
+    view.getEast() + padX,
+    view.getNorth() + padY,
+  ]
+    .map((value) => value.toFixed(5))
+    .join(",");
+  return `zoom=${Math.floor(map.getZoom())}&bbox=${bbox}`;
+}
+
+const logUnlessAborted = (message) => (err) => {
+  if (err.name !== "AbortError") console.error(message, err);
+};
+
+// The review map's clusters are built on the server; fetch the ones for the
+// current zoom and view (padded, so clusters centred just off screen still
+// show) and again whenever the view moves.
+function loadClustersInView(map, mapDataUrl, categoryIds) {
+  let controller;
+  map.on("moveend", () => {
+    if (controller) controller.abort();
+    controller = new AbortController();
+    const query = viewQuery(map, 0.5);
+    categoryIds.forEach((id) => {
+      fetchFeatures(`${mapDataUrl}/clusters/${id}?${query}`, {
+        signal: controller.signal,
+      })
+        .then((features) => {
+          map.getSource(`points-${id}`).setData({ type: "FeatureCollection", features });
+        })
+        .catch(logUnlessAborted("Failed to load map clusters"));
+    });
+  });
+}
+
+// Shapes only show from POLYGON_MIN_ZOOM, so the review map fetches them for
+// the current view once zoomed in that far, simplified for the zoom, and
+// again whenever the view moves.
+function loadShapesInView(map, mapDataUrl) {
+  let controller;
+  const load = () => {
+    if (map.getZoom() < POLYGON_MIN_ZOOM) return;
+    if (controller) controller.abort();
+    controller = new AbortController();
+    const query = viewQuery(map);
+    Promise.all(
+      LAYER_KEY.map((category) =>
+        fetchFeatures(`${mapDataUrl}/shapes/${category.id}?${query}`, {
+          signal: controller.signal,
+        })
+      )
+    )
+      .then((perCategory) => {
+        map.getSource("dataset").setData({
+          type: "FeatureCollection",
+          features: perCategory.flat(),
+        });
+      })
+      .catch(logUnlessAborted("Failed to load map shapes"));
+  };
+  map.on("moveend", load);
+  load();
+}
+
+async function initMap() {
+  const { containerId, mapDataUrl, boundaryGeoJsonUrl, entityFilter } =
     window.serverContext;
 
-  if (!geometries || geometries.length === 0) {
-    return null;
+  // The review map fetches its features from mapDataUrl: each category's
+  // clusters for the view, shapes as they come into view and the points only
+  // if an entity is searched for. Other pages inline them.
+  let geometries = window.serverContext.geometries || [];
+  let points = window.serverContext.geometryPoints || [];
+  let clustered = null;
+  if (mapDataUrl) {
+    clustered = await Promise.all(
+      LAYER_KEY.map((category) =>
+        fetchCollection(`${mapDataUrl}/clusters/${category.id}?zoom=0`).catch(() => ({
+          features: [],
+        }))
+      )
+    );
+    points = clustered.flatMap((collection) => collection.features || []);
+    geometries = [];
   }
 
-  const points = geometryPoints || [];
-    const searchableFeatures = [...geometries, ...points];
-    const featuresByEntity = new Map();
+  if (geometries.length === 0 && points.length === 0) {
+    return null;
+  }
 
-    searchableFeatures.forEach((feature) => {
-      const entityId = feature?.properties?.entity;
-      if (entityId && !featuresByEntity.has(entityId)) {
-        featuresByEntity.set(entityId, feature);
-      }
-    });
+  let featuresByEntity = null;
+  const findEntity = async (entityId) => {
+    if (!featuresByEntity) {
+      const searchableFeatures = mapDataUrl
+        ? (
+            await Promise.all(
+              LAYER_KEY.map((category) => fetchFeatures(`${mapDataUrl}/points/${category.id}`))
+            )
+          ).flat()
+        : [...geometries, ...points];
+      featuresByEntity = new Map();
+      searchableFeatures.forEach((feature) => {
+        const id = feature?.properties?.entity;
+        if (id && !featuresByEntity.has(id)) {
+          featuresByEntity.set(id, feature);
+        }
+      });
+    }
+    return featuresByEntity.get(entityId);
+  };
 
   const map = new maplibregl.Map({
     container: containerId,
@@ -465,12 +583,13 @@ function initMap() {
   map.addControl(new maplibregl.FullscreenControl());
 
   map.on("load", async () => {
-    console.log("Adding geometries to map:", geometries.length);
+    console.log("Adding geometries to map:", geometries.length || points.length);
 
     // The transform page tags each feature with a status (new/in_both/changed/
     // existing) to drive per-category colours, clusters and the toggle. The
     // check-results page has no status — one neutral group, no toggle.
-    const hasStatus = points.some((f) => f.properties && f.properties.status);
+    const hasStatus =
+      Boolean(mapDataUrl) || points.some((f) => f.properties && f.properties.status);
     const categories = hasStatus ? LAYER_KEY : [NEUTRAL_CATEGORY];
 
     const statusColour = hasStatus
@@ -519,17 +638,29 @@ function initMap() {
         .addTo(map);
     };
 
-    const hasPolygonFeatures = geometries.some(
-      (f) => f.geometry && (f.geometry.type === "Polygon" || f.geometry.type === "MultiPolygon")
-    );
+    const hasPolygonFeatures =
+      geometries.some(
+        (f) => f.geometry && (f.geometry.type === "Polygon" || f.geometry.type === "MultiPolygon")
+      ) || (clustered || []).some((collection) => collection.has_polygon);
 
     // One clustered source per category so clusters never mix categories.
-    categories.forEach((category) => {
-      const categoryPoints = hasStatus
-        ? points.filter((f) => f.properties.status === category.id)
-        : points;
+    const clusteredIds = [];
+    categories.forEach((category, i) => {
+      const categoryPoints = clustered
+        ? clustered[i].features || []
+        : hasStatus
+          ? points.filter((f) => f.properties.status === category.id)
+          : points;
       if (categoryPoints.length > 0) {
-        addCategoryCluster(map, category, categoryPoints, showPopup, hasPolygonFeatures);
+        addCategoryCluster(
+          map,
+          category,
+          categoryPoints,
+          showPopup,
+          hasPolygonFeatures,
+          Boolean(clustered)
+        );
+        clusteredIds.push(category.id);
       }
     });
 
@@ -554,16 +685,30 @@ function initMap() {
         });
       }
     });
+    if (clustered) {
+      // Each collection carries the bbox of all its points.
+      clustered.forEach(({ bbox }) => {
+        if (bbox) {
+          bounds.extend([bbox[0], bbox[1]]);
+          bounds.extend([bbox[2], bbox[3]]);
+        }
+      });
+    } else {
+      points.forEach((feature) => bounds.extend(feature.geometry.coordinates));
+    }
+
+    if (mapDataUrl) {
+      loadClustersInView(map, mapDataUrl, clusteredIds);
+      loadShapesInView(map, mapDataUrl);
+    }
+
     if (!bounds.isEmpty()) {
       map.fitBounds(bounds, { padding: 20, maxZoom: 9, duration: 0 });
     }
 
     if (hasStatus) {
       map.addControl(new LayerToggleControl(entityFilter), "top-left");
-        map.addControl(
-          new EntitySearchControl((entityId) => featuresByEntity.get(entityId)),
-          "top-left"
-        );
+      map.addControl(new EntitySearchControl(findEntity), "top-left");
     }
 
     if (boundaryGeoJsonUrl) {
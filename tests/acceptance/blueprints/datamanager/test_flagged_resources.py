@@ -564,7 +564,7 @@ def test_assign_entities_check_results_does_not_show_retire_endpoints(client):
                         return_value=1,
                     ):
                         with patch(
-                            f"{transform_controller}.get_entities_for_organisation_and_dataset",
+                            f"{transform_controller}.get_platform_entities",
                             return_value=[],
                         ):
                             response = client.get(
@@ -675,7 +675,7 @@ def test_assign_entities_check_results_uses_excluded_references_param(client):
                     return_value=1,
                 ):
                     with patch(
-                        f"{transform_controller}.get_entities_for_organisation_and_dataset",
+                        f"{transform_controller}.get_platform_entities",
                         return_value=[
                             {
                                 "entity": "3",
@@ -736,7 +736,7 @@ def test_assign_entities_check_results_hides_entity_pagination_when_empty(client
                     return_value=0,
                 ):
                     with patch(
-                        f"{transform_controller}.get_entities_for_organisation_and_dataset",
+                        f"{transform_controller}.get_platform_entities",
                         return_value=[],
                     ):
                         response = client.get(
@@ -852,7 +852,7 @@ def test_assign_entities_check_results_shows_duplicate_candidates(client):
                         return_value=1,
                     ):
                         with patch(
-                            f"{transform_controller}.get_entities_for_organisation_and_dataset",
+                            f"{transform_controller}.get_platform_entities",
                             return_value=[],
                         ):
                             response = client.get(
@@ -956,7 +956,7 @@ def test_assign_entities_check_results_hides_dedup_for_other_datasets(client):
                         return_value=1,
                     ):
                         with patch(
-                            f"{transform_controller}.get_entities_for_organisation_and_dataset",
+                            f"{transform_controller}.get_platform_entities",
                             return_value=[],
                         ):
                             response = client.get(
@@ -1,8 +1,9 @@
 from unittest.mock import patch
 
 import pytest
+from flask import g, has_app_context
 
-from application.extensions import db as _db
+from application.extensions import cache, db as _db
 from application.factory import create_app
 
 
@@ -33,3 +34,67 @@ def mock_dataset_typology():
         return_value="",
     ):
         yield
+
+
+@pytest.fixture(autouse=True)
+def mock_platform_entity_fields():
+    """Prevent the platform entity field projection from fetching the
+    specification in tests; with no fields every field is fetched."""
+    with patch(
+        "application.blueprints.datamanager.controllers.transform.get_field_names_for_dataset",
+        return_value=[],
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(app):
+    """Start each test with an empty cache so memoized results don't leak between tests."""
+    with app.app_context():
+        cache.clear()
+    # The session-wide test client keeps its last request context, and so ``g``
+    # and fetch_request's per-request memo, alive between tests.
+    if has_app_context():
+        g.pop("_async_requests", None)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def result_store_dir(app, tmp_path, monkeypatch):
+    """Give each test its own, empty response-details store."""
+    monkeypatch.setitem(app.config, "RESULT_STORE_DIR", str(tmp_path / "results"))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def entity_store_dir(app, tmp_path, monkeypatch):
+    """Give each test its own, empty platform entity store."""
+    monkeypatch.setitem(app.config, "ENTITY_STORE_DIR", str(tmp_path / "entities"))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def boundary_store_dir(app, tmp_path, monkeypatch):
+    """Give each test its own, empty LPA boundary store."""
+    monkeypatch.setitem(app.config, "BOUNDARY_STORE_DIR", str(tmp_path / "boundaries"))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breaker():
+    """Start each test with the async API circuit breaker closed."""
+    from application.blueprints.datamanager.services.clients import async_api_http
+
+    async_api_http.breaker.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_resource_indexes():
+    """Start each test without the resource indexes of earlier tests."""
+    from application.blueprints.datamanager.services.resource_index import (
+        resource_indexes,
+    )
+
+    resource_indexes.clear()
+    yield
@@ -4,10 +4,15 @@ from unittest.mock import patch
 import responses as rsps
 
 from application.blueprints.datamanager.controllers.transform import (
-    _build_geometry_features,
+    _MAP_CATEGORIES,
     _build_entities_data,
+    _compare_entities,
+    _geometry_entries,
+    _map_layer_items,
     _paginate_entity_data,
 )
+from application.blueprints.datamanager.services.resource_index import ResourceIndex
+from application.blueprints.datamanager.utils.geometry import geojson_features
 
 ASYNC_BASE = "http://localhost:8000/requests"
 
@@ -41,6 +46,18 @@ RESPONSE_DETAILS = [
     },
 ]
 
+
+def _add_response_details(url, details):
+    """Serve details from url, paged by the offset/limit query params."""
+
+    def callback(request):
+        offset = int(request.params.get("offset", 0))
+        limit = int(request.params.get("limit", 100))
+        return 200, {}, json.dumps(details[offset : offset + limit])
+
+    rsps.add_callback(rsps.GET, url, callback=callback)
+
+
 PENDING_CHECK_RESULT = {
     "id": "test-id",
     "status": "PENDING",
@@ -146,6 +163,29 @@ class TestCheckResultsRoute:
         assert response.status_code == 404
 
 
+class TestRequestStatusRoute:
+    @rsps.activate
+    def test_returns_status_json(self, client):
+        rsps.add(
+            rsps.GET,
+            f"{ASYNC_BASE}/status-id",
+            json={**PENDING_CHECK_RESULT, "id": "status-id"},
+            status=200,
+        )
+        response = client.get("/datamanager/request-status/status-id")
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "PENDING", "done": False}
+        assert response.headers["Cache-Control"] == "no-store"
+
+    @rsps.activate
+    def test_loading_page_polls_status_endpoint(self, client):
+        rsps.add(
+            rsps.GET, f"{ASYNC_BASE}/test-id", json=PENDING_ADD_DATA_RESULT, status=200
+        )
+        response = client.get("/datamanager/add-data/test-id/entities")
+        assert b"/datamanager/request-status/test-id" in response.data
+
+
 class TestEntitiesPreviewRoute:
     @rsps.activate
     def test_pending_renders_loading(self, client):
@@ -276,8 +316,7 @@ class TestCheckTransformRoute:
             json=COMPLETED_TRANSFORM_REQUEST,
             status=200,
         )
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
             return_value="Test Org",
@@ -302,8 +341,7 @@ class TestCheckTransformRoute:
             json=COMPLETED_TRANSFORM_REQUEST,
             status=200,
         )
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
             return_value="Test Org",
@@ -327,8 +365,7 @@ class TestCheckTransformRoute:
             json=COMPLETED_TRANSFORM_REQUEST,
             status=200,
         )
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         # Different name on the platform → a genuine change → orange "changed" row.
         platform_entities = [{"entity": 100, "name": "Old Area A"}]
         with patch(
@@ -345,7 +382,7 @@ class TestCheckTransformRoute:
                 ):
                     with patch(
                         "application.blueprints.datamanager.controllers"
-                        ".transform.get_entities_for_organisation_and_dataset",
+                        ".transform.get_platform_entities",
                         return_value=platform_entities,
                     ):
                         response = client.get("/datamanager/check-transform/test-id")
@@ -359,8 +396,7 @@ class TestCheckTransformRoute:
             json=COMPLETED_TRANSFORM_REQUEST,
             status=200,
         )
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
             return_value="Test Org",
@@ -387,8 +423,7 @@ class TestCheckTransformRoute:
             json=COMPLETED_TRANSFORM_REQUEST,
             status=200,
         )
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         platform_entities = [{"entity": 100, "name": "Old Name"}]
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
@@ -404,7 +439,7 @@ class TestCheckTransformRoute:
                 ):
                     with patch(
                         "application.blueprints.datamanager.controllers"
-                        ".transform.get_entities_for_organisation_and_dataset",
+                        ".transform.get_platform_entities",
                         return_value=platform_entities,
                     ):
                         response = client.get("/datamanager/check-transform/test-id")
@@ -436,8 +471,7 @@ class TestCheckTransformRoute:
             status=200,
         )
         geo_details_url = f"{ASYNC_BASE}/geo-test-id/response-details"
-        rsps.add(rsps.GET, geo_details_url, json=details, status=200)
-        rsps.add(rsps.GET, geo_details_url, json=[], status=200)
+        _add_response_details(geo_details_url, details)
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
             return_value="Test Org",
@@ -457,10 +491,40 @@ class TestCheckTransformRoute:
                         response = client.get(
                             "/datamanager/check-transform/geo-test-id"
                         )
+                        geojson_url = "/datamanager/check-transform/geo-test-id/geojson"
+                        points = client.get(f"{geojson_url}/points/new")
+                        shapes = client.get(f"{geojson_url}/shapes/new?zoom=15")
+                        outside = client.get(
+                            f"{geojson_url}/shapes/new?zoom=15&bbox=0,50,1,51"
+                        )
+                        existing = client.get(f"{geojson_url}/points/existing")
+                        clusters = client.get(f"{geojson_url}/clusters/new?zoom=3")
+                        unknown = client.get(f"{geojson_url}/lines/new")
         assert response.status_code == 200
         assert b"map-container" in response.data
-        # Representative points are passed to the clustered map source.
-        assert b"geometryPoints" in response.data
+        # The page carries only the map data URL, not the features.
+        assert b"/datamanager/check-transform/geo-test-id/geojson" in response.data
+        assert b'"coordinates"' not in response.data
+
+        assert points.mimetype == "application/geo+json"
+        [point] = points.get_json()["features"]
+        assert point["geometry"] == {"type": "Point", "coordinates": [-2.5, 54.5]}
+        assert point["properties"] == {
+            "entity": "100",
+            "reference": "R1",
+            "name": "Area A",
+            "status": "new",
+            "has_polygon": False,
+        }
+        assert len(shapes.get_json()["features"]) == 1
+        assert outside.get_json()["features"] == []
+        assert existing.get_json()["features"] == []
+        # A lone point is served as itself, with the category's extent.
+        clustered = clusters.get_json()
+        assert clustered["features"] == [point]
+        assert clustered["bbox"] == [-2.5, 54.5, -2.5, 54.5]
+        assert clustered["has_polygon"] is False
+        assert unknown.status_code == 404
 
     @rsps.activate
     def test_endpoint_url_shown_at_top(self, client):
@@ -473,8 +537,7 @@ class TestCheckTransformRoute:
             },
         }
         rsps.add(rsps.GET, f"{ASYNC_BASE}/test-id", json=request_json, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
             return_value="Test Org",
@@ -511,8 +574,7 @@ class TestCheckTransformRoute:
             json=COMPLETED_TRANSFORM_REQUEST,
             status=200,
         )
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=RESPONSE_DETAILS, status=200)
-        rsps.add(rsps.GET, RESPONSE_DETAILS_URL, json=[], status=200)
+        _add_response_details(RESPONSE_DETAILS_URL, RESPONSE_DETAILS)
         with patch(
             "application.blueprints.datamanager.controllers.transform.get_organisation_name",
             return_value="Test Org",
@@ -554,6 +616,30 @@ class TestCheckTransformRoute:
         )
 
 
+class TestResourceIndex:
+    def test_reduces_rows_in_one_pass(self):
+        details = (
+            {
+                "entry_number": n,
+                "converted_row": {"reference": f"R{n}"},
+                "transformed_row": [
+                    {"entity": 100 + n, "field": "name", "value": f"Area {n}"},
+                    {"entity": 100 + n, "field": "point", "value": "POINT (1 2)"},
+                ],
+                "issue_logs": [],
+            }
+            for n in range(1, 4)
+        )
+        index = ResourceIndex.build(details)
+        assert index.row_count == 3
+        assert index.entities["101"] == {"name": "Area 1", "point": "POINT (1 2)"}
+        assert [s.reference for s in index.shapes] == ["R1", "R2", "R3"]
+
+    def test_rows_without_facts_are_counted_but_not_pivoted(self):
+        index = ResourceIndex.build([{"entry_number": 1, "transformed_row": []}])
+        assert (index.entities, index.shapes, index.row_count) == ({}, [], 1)
+
+
 class TestBuildEntitiesData:
     def _make_detail(self, entity, field, value):
         return {
@@ -564,74 +650,91 @@ class TestBuildEntitiesData:
 
     def test_entity_only_in_resource_is_new(self):
         details = [self._make_detail(101, "name", "Area B")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "101")
         assert row["category"] == "new"
 
     def test_entity_in_both_is_flagged(self):
         details = [self._make_detail(100, "name", "Area A Updated")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["category"] == "changed"
 
     def test_entity_only_on_platform_not_new(self):
-        result = _build_entities_data([], [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build([]), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["category"] == "existing"
 
     def test_float_entity_id_matches_platform_integer(self):
         details = [self._make_detail(44015862.0, "name", "Lydford Updated")]
         result = _build_entities_data(
-            details, [{"entity": 44015862, "name": "Lydford"}]
+            ResourceIndex.build(details), [{"entity": 44015862, "name": "Lydford"}]
         )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "44015862")
         assert row["category"] == "changed"
 
     def test_platform_only_entity_appended_to_rows(self):
-        result = _build_entities_data([], [{"entity": 999, "name": "Only Platform"}])
+        result = _build_entities_data(
+            ResourceIndex.build([]), [{"entity": 999, "name": "Only Platform"}]
+        )
         assert any(r["fields"]["entity"] == "999" for r in result["rows"])
 
     def test_platform_only_rows_appended_after_resource_rows(self):
         details = [self._make_detail(200, "name", "Resource Entity")]
         platform = [{"entity": 999, "name": "Platform Only"}]
-        result = _build_entities_data(details, platform)
+        result = _build_entities_data(ResourceIndex.build(details), platform)
         entities = [r["fields"]["entity"] for r in result["rows"]]
         assert entities.index("200") < entities.index("999")
 
     def test_total_row_count_includes_resource_and_platform_only(self):
         details = [self._make_detail(i, "name", f"Area {i}") for i in range(10)]
         platform = [{"entity": 100 + i, "name": f"Platform {i}"} for i in range(5)]
-        result = _build_entities_data(details, platform)
+        result = _build_entities_data(ResourceIndex.build(details), platform)
         assert len(result["rows"]) == 15
 
     def test_in_both_row_flags_changed_fields(self):
         details = [self._make_detail(100, "name", "Area A Updated")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["changed_fields"] == {"name": "Area A"}
 
     def test_in_both_row_with_equal_values_has_no_changed_fields(self):
         details = [self._make_detail(100, "name", "Area A")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["changed_fields"] == {}
 
     def test_new_and_platform_only_rows_have_empty_changed_fields(self):
         details = [self._make_detail(101, "name", "Area B")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         for row in result["rows"]:
             assert row["changed_fields"] == {}
 
     def test_numeric_values_normalised_before_comparison(self):
         details = [self._make_detail(100, "reference", "12.0")]
-        result = _build_entities_data(details, [{"entity": 100, "reference": 12}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "reference": 12}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["changed_fields"] == {}
 
     def test_datetime_values_compared_on_date_part(self):
         details = [self._make_detail(100, "start-date", "2024-01-01")]
         result = _build_entities_data(
-            details, [{"entity": 100, "start-date": "2024-01-01T00:00:00Z"}]
+            ResourceIndex.build(details),
+            [{"entity": 100, "start-date": "2024-01-01T00:00:00Z"}],
         )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["changed_fields"] == {}
@@ -639,7 +742,7 @@ class TestBuildEntitiesData:
     def test_platform_only_column_not_flagged(self):
         details = [self._make_detail(100, "name", "Area A")]
         result = _build_entities_data(
-            details,
+            ResourceIndex.build(details),
             [{"entity": 100, "name": "Area A", "entry-date": "2024-01-01"}],
         )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
@@ -648,7 +751,7 @@ class TestBuildEntitiesData:
     def test_differing_geometry_text_not_flagged(self):
         details = [self._make_detail(100, "geometry", "POINT (1 2)")]
         result = _build_entities_data(
-            details,
+            ResourceIndex.build(details),
             [{"entity": 100, "geometry": "MULTIPOINT ((1.000000 2.000000))"}],
         )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
@@ -656,14 +759,16 @@ class TestBuildEntitiesData:
 
     def test_geometry_presence_mismatch_flagged(self):
         details = [self._make_detail(100, "geometry", "POINT (1 2)")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert "geometry" in row["changed_fields"]
 
     def test_moved_geometry_flagged(self):
         details = [self._make_detail(100, "geometry", "POINT (1 2)")]
         result = _build_entities_data(
-            details, [{"entity": 100, "geometry": "POINT (5 6)"}]
+            ResourceIndex.build(details), [{"entity": 100, "geometry": "POINT (5 6)"}]
         )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert "geometry" in row["changed_fields"]
@@ -671,20 +776,26 @@ class TestBuildEntitiesData:
 
     def test_dropped_value_flagged_with_platform_value(self):
         details = [self._make_detail(100, "name", "")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["changed_fields"] == {"name": "Area A"}
 
     def test_float_platform_id_not_duplicated_as_platform_only_row(self):
         details = [self._make_detail(100, "name", "Area A Updated")]
-        result = _build_entities_data(details, [{"entity": 100.0, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100.0, "name": "Area A"}]
+        )
         matching = [r for r in result["rows"] if r["fields"]["entity"] == "100"]
         assert len(matching) == 1
         assert matching[0]["category"] == "changed"
 
     def test_in_both_unchanged_is_in_both_category(self):
         details = [self._make_detail(100, "name", "Area A")]
-        result = _build_entities_data(details, [{"entity": 100, "name": "Area A"}])
+        result = _build_entities_data(
+            ResourceIndex.build(details), [{"entity": 100, "name": "Area A"}]
+        )
         row = next(r for r in result["rows"] if r["fields"]["entity"] == "100")
         assert row["category"] == "in_both"
         assert row["changed_fields"] == {}
@@ -700,13 +811,56 @@ class TestBuildEntitiesData:
             {"entity": 300, "name": "Same"},
             {"entity": 400, "name": "Platform Only"},  # existing
         ]
-        result = _build_entities_data(details, platform)
+        result = _build_entities_data(ResourceIndex.build(details), platform)
         by_id = {r["fields"]["entity"]: r["category"] for r in result["rows"]}
         assert by_id["100"] == "new"
         assert by_id["200"] == "changed"
         assert by_id["300"] == "in_both"
         assert by_id["400"] == "existing"
 
+    def test_platform_values_shown_as_text_and_missing_fields_blank(self):
+        platform = [
+            {"entity": 100, "name": None, "reference": 12},
+            {"entity": 200, "name": True},
+        ]
+        result = _build_entities_data(ResourceIndex.build([]), platform)
+        fields = {r["fields"]["entity"]: r["fields"] for r in result["rows"]}
+        assert fields["100"] == {"entity": "100", "reference": "12", "name": "None"}
+        assert fields["200"] == {"entity": "200", "reference": "", "name": "True"}
+
+    def test_missing_and_null_platform_values_both_have_no_value(self):
+        details = [
+            self._make_detail(100, "name", "Area A"),
+            self._make_detail(200, "name", "Area B"),
+        ]
+        platform = [{"entity": 100}, {"entity": 200, "name": None}]
+        result = _build_entities_data(ResourceIndex.build(details), platform)
+        for row in result["rows"]:
+            assert row["changed_fields"] == {"name": "(no value on platform)"}
+
+    def test_nan_platform_value_shown_and_compared_not_blank(self):
+        details = [
+            self._make_detail(100, "name", "Area A"),
+            self._make_detail(200, "name", "nan"),
+        ]
+        platform = [
+            {"entity": 100, "name": float("nan")},
+            {"entity": 200, "name": float("nan")},
+        ]
+        result = _build_entities_data(ResourceIndex.build(details), platform)
+        rows = {r["fields"]["entity"]: r for r in result["rows"]}
+        assert rows["100"]["changed_fields"] == {"name": "nan"}
+        assert rows["200"]["category"] == "in_both"
+
+    def test_duplicate_platform_entity_columns_kept(self):
+        platform = [
+            {"entity": 100, "name": "Area A", "notes": "first"},
+            {"entity": "100.0", "name": "Area A"},
+        ]
+        result = _build_entities_data(ResourceIndex.build([]), platform)
+        assert "notes" in result["columns"]
+        assert [r["fields"]["notes"] for r in result["rows"]] == [""]
+
 
 class TestEntityFilter:
     def _make_detail(self, entity, field, value):
@@ -728,7 +882,10 @@ class TestEntityFilter:
             {"entity": 400, "name": "Platform Only"},  # existing
         ]
         entities_data, _, _, _, _ = _paginate_entity_data(
-            details, platform, entity_page=1, entity_search="", entity_filter="changed"
+            _compare_entities(ResourceIndex.build(details), platform),
+            entity_page=1,
+            entity_search="",
+            entity_filter="changed",
         )
         ids = [r["fields"]["entity"] for r in entities_data["rows"]]
         assert ids == ["200"]
@@ -737,7 +894,10 @@ class TestEntityFilter:
         details = [self._make_detail(100, "name", "New Area")]
         platform = [{"entity": 400, "name": "Platform Only"}]
         entities_data, _, _, _, _ = _paginate_entity_data(
-            details, platform, entity_page=1, entity_search="", entity_filter=""
+            _compare_entities(ResourceIndex.build(details), platform),
+            entity_page=1,
+            entity_search="",
+            entity_filter="",
         )
         assert len(entities_data["rows"]) == 2
 
@@ -753,7 +913,10 @@ class TestEntityFilter:
             {"entity": 400, "name": "Platform Only"},  # existing
         ]
         *_, category_counts = _paginate_entity_data(
-            details, platform, entity_page=1, entity_search="", entity_filter=""
+            _compare_entities(ResourceIndex.build(details), platform),
+            entity_page=1,
+            entity_search="",
+            entity_filter="",
         )
         assert category_counts == {
             "new": 1,
@@ -762,6 +925,39 @@ class TestEntityFilter:
             "existing": 1,
         }
 
+    def test_search_combines_with_filter_and_matches_prefixes(self):
+        details = [
+            self._make_detail(100, "name", "Oak Street"),  # new
+            self._make_detail(200, "name", "Oak Lane"),  # changed
+            self._make_detail(300, "name", "Elm Road"),  # new
+        ]
+        platform = [
+            {"entity": 200, "name": "Old Oak Lane"},
+            {"entity": 400, "name": "Oakfield", "reference": "CA-OAK"},  # existing
+        ]
+        comparison = _compare_entities(ResourceIndex.build(details), platform)
+
+        def search(query, category=""):
+            entities_data, *_ = _paginate_entity_data(
+                comparison, entity_page=1, entity_search=query, entity_filter=category
+            )
+            return [r["fields"]["entity"] for r in entities_data["rows"]]
+
+        assert search("oak") == ["100", "200", "400"]
+        assert search("OAK", "new") == ["100"]
+        assert search("ca-o") == ["400"]
+        assert search("street lane") == []
+        assert search("", "existing") == ["400"]
+        assert search("elm", "changed") == []
+
+    def test_search_ignores_geometry_text(self):
+        details = [self._make_detail(100, "geometry", "POINT (1 2)")]
+        comparison = _compare_entities(ResourceIndex.build(details), [])
+        entities_data, *_ = _paginate_entity_data(
+            comparison, entity_page=1, entity_search="point", entity_filter=""
+        )
+        assert entities_data["rows"] == []
+
 
 _GEOGRAPHY_TYPOLOGY_PATCH = patch(
     "application.blueprints.datamanager.controllers.transform.get_dataset_typology",
@@ -769,7 +965,25 @@ _GEOGRAPHY_TYPOLOGY_PATCH = patch(
 )
 
 
-class TestBuildGeometryFeatures:
+def _map_features(platform_entities, details):
+    """The review map's (shapes, points) features, every category together."""
+    resource = ResourceIndex.build(details)
+    with _GEOGRAPHY_TYPOLOGY_PATCH:
+        comparison = _compare_entities(resource, platform_entities)
+    entries = _geometry_entries(comparison, resource, platform_entities)
+    layers = []
+    for layer in ("shapes", "points"):
+        items = [
+            item
+            for category in _MAP_CATEGORIES
+            for item in _map_layer_items(entries, layer, category)
+        ]
+        features, _ = geojson_features(items, as_points=layer == "points")
+        layers.append([json.loads(feature) for feature in features])
+    return tuple(layers)
+
+
+class TestMapFeatures:
     def _geometry_detail(self, entity, wkt_value):
         return {
             "entry_number": 1,
@@ -794,10 +1008,7 @@ class TestBuildGeometryFeatures:
 
     def test_resource_geometry_with_no_platform_entities_is_new(self):
         details = [self._geometry_detail(100, "POINT (-2.5 54.5)")]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            features, points = _build_geometry_features(
-                [], details, "article-4-direction-area"
-            )
+        features, points = _map_features([], details)
         assert len(features) == 1
         assert features[0]["properties"]["status"] == "new"
         assert len(points) == 1
@@ -807,20 +1018,14 @@ class TestBuildGeometryFeatures:
     def test_resource_geometry_unchanged_is_in_both(self):
         details = [self._geometry_detail(100, "POINT (-2.5 54.5)")]
         platform = [{"entity": 100, "name": "Area A", "geometry": "POINT (-2.5 54.5)"}]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            features, _ = _build_geometry_features(
-                platform, details, "article-4-direction-area"
-            )
+        features, _ = _map_features(platform, details)
         statuses = {f["properties"]["status"] for f in features}
         assert statuses == {"in_both"}
 
     def test_resource_geometry_moved_is_changed(self):
         details = [self._geometry_detail(100, "POINT (-2.5 54.5)")]
         platform = [{"entity": 100, "name": "Area A", "geometry": "POINT (-3.0 55.0)"}]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            features, _ = _build_geometry_features(
-                platform, details, "article-4-direction-area"
-            )
+        features, _ = _map_features(platform, details)
         statuses = {f["properties"]["status"] for f in features}
         assert statuses == {"changed"}
 
@@ -833,10 +1038,7 @@ class TestBuildGeometryFeatures:
                 "issue_logs": [],
             }
         ]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            features, points = _build_geometry_features(
-                [{"entity": 200, "name": "B"}], details, "article-4-direction-area"
-            )
+        features, points = _map_features([{"entity": 200, "name": "B"}], details)
         assert features == []
         assert points == []
 
@@ -844,10 +1046,7 @@ class TestBuildGeometryFeatures:
         # A square around (0,0); representative point must fall inside it.
         square = "POLYGON ((-1 -1, 1 -1, 1 1, -1 1, -1 -1))"
         details = [self._polygon_detail(100, square)]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            _, points = _build_geometry_features(
-                [], details, "article-4-direction-area"
-            )
+        _, points = _map_features([], details)
         assert len(points) == 1
         assert points[0]["properties"]["has_polygon"] is True
         lon, lat = points[0]["geometry"]["coordinates"]
@@ -866,10 +1065,7 @@ class TestBuildGeometryFeatures:
                 "issue_logs": [],
             }
         ]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            _, points = _build_geometry_features(
-                [], details, "article-4-direction-area"
-            )
+        _, points = _map_features([], details)
         assert points[0]["geometry"]["coordinates"] == [0.5, 0.25]
         assert points[0]["properties"]["has_polygon"] is True
 
@@ -884,10 +1080,7 @@ class TestBuildGeometryFeatures:
                 "issue_logs": [],
             }
         ]
-        with _GEOGRAPHY_TYPOLOGY_PATCH:
-            _, points = _build_geometry_features(
-                [], details, "article-4-direction-area"
-            )
+        _, points = _map_features([], details)
         assert points[0]["properties"]["has_polygon"] is False
 
 
@@ -941,6 +1134,9 @@ class TestEntityPagination:
             status=200,
         )
         with patch(
+            "application.blueprints.datamanager.services.resource_index.iter_response_details",
+            side_effect=lambda *args, **kwargs: iter(details),
+        ), patch(
             "application.blueprints.datamanager.controllers.transform.fetch_response_details",
             return_value=details,
         ):
@@ -963,7 +1159,7 @@ class TestEntityPagination:
                         ):
                             with patch(
                                 "application.blueprints.datamanager.controllers"
-                                ".transform.get_entities_for_organisation_and_dataset",
+                                ".transform.get_platform_entities",
                                 return_value=platform_entities,
                             ):
                                 response = client.get(
@@ -991,6 +1187,9 @@ class TestEntityPagination:
             status=200,
         )
         with patch(
+            "application.blueprints.datamanager.services.resource_index.iter_response_details",
+            side_effect=lambda *args, **kwargs: iter(details),
+        ), patch(
             "application.blueprints.datamanager.controllers.transform.fetch_response_details",
             return_value=details,
         ):
@@ -1033,6 +1232,9 @@ class TestEntityPagination:
             status=200,
         )
         with patch(
+            "application.blueprints.datamanager.services.resource_index.iter_response_details",
+            side_effect=lambda *args, **kwargs: iter(details),
+        ), patch(
             "application.blueprints.datamanager.controllers.transform.fetch_response_details",
             return_value=details,
         ):
@@ -1055,7 +1257,7 @@ class TestEntityPagination:
                         ):
                             with patch(
                                 "application.blueprints.datamanager.controllers"
-                                ".transform.get_entities_for_organisation_and_dataset",
+                                ".transform.get_platform_entities",
                                 return_value=platform_entities,
                             ):
                                 resp1 = client.get(
@@ -1081,6 +1283,9 @@ class TestEntityPagination:
             status=200,
         )
         with patch(
+            "application.blueprints.datamanager.services.resource_index.iter_response_details",
+            side_effect=lambda *args, **kwargs: iter(details),
+        ), patch(
             "application.blueprints.datamanager.controllers.transform.fetch_response_details",
             return_value=details,
         ):
@@ -1099,6 +1304,69 @@ class TestEntityPagination:
                         response = client.get("/datamanager/check-transform/test-id")
         assert b"Showing entities 7010000100 to 7010000109" in response.data
 
+    @rsps.activate
+    def test_large_platform_streamed_and_categorised(self, client, monkeypatch):
+        """Above the platform entity limit, pages are streamed and merge-joined."""
+        monkeypatch.setattr(
+            "application.blueprints.datamanager.controllers.transform._PLATFORM_ENTITY_LIMIT",
+            3,
+        )
+        details = self._make_details(2, start_entity=102)
+        entity_url = "https://www.planning.data.gov.uk/entity.json"
+        rsps.add(
+            rsps.GET,
+            f"{ASYNC_BASE}/test-id",
+            json=COMPLETED_TRANSFORM_REQUEST,
+            status=200,
+        )
+        rsps.add(
+            rsps.GET,
+            entity_url,
+            match=[
+                rsps.matchers.query_param_matcher({"offset": "3"}, strict_match=False)
+            ],
+            json={
+                "entities": [{"entity": n, "name": f"P{n}"} for n in range(103, 106)],
+                "links": {},
+            },
+        )
+        rsps.add(
+            rsps.GET,
+            entity_url,
+            json={
+                "entities": [{"entity": n, "name": f"P{n}"} for n in range(100, 103)],
+                "links": {"next": "/entity.json?dataset=conservation-area&offset=3"},
+            },
+        )
+        with patch(
+            "application.blueprints.datamanager.services.resource_index.iter_response_details",
+            side_effect=lambda *args, **kwargs: iter(details),
+        ), patch(
+            "application.blueprints.datamanager.controllers.transform.fetch_response_details",
+            return_value=details,
+        ), patch(
+            "application.blueprints.datamanager.controllers.transform.get_organisation_name",
+            return_value="Test Org",
+        ), patch(
+            "application.blueprints.datamanager.controllers.transform.get_dataset_name",
+            return_value="Conservation Area",
+        ), patch(
+            "application.blueprints.datamanager.controllers.transform.get_org_entity",
+            return_value=400,
+        ), patch(
+            "application.blueprints.datamanager.controllers"
+            ".transform.get_entity_count_for_organisation_and_dataset",
+            return_value=6,
+        ):
+            response = client.get("/datamanager/check-transform/test-id")
+        html = response.data.decode()
+        assert "could not be read" not in html
+        # 102 and 103 are changed; 100, 101, 104 and 105 are platform only,
+        # of which the first 3 are listed.
+        assert "The table lists the first 3 of 4 platform-only entities." in html
+        assert "P101" in html
+        assert "P105" not in html
+
 
 class TestCheckTransformPostRetireUnretire:
     @rsps.activate
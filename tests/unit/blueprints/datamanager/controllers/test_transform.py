@@ -1,12 +1,35 @@
 import json
+import time
 from unittest.mock import patch
 
+import pytest
+
 from application.utils import compute_hash
+from application.blueprints.datamanager.controllers import transform as transform_module
 from application.blueprints.datamanager.controllers.transform import (
+    _REQUIRED,
     _dedup_candidate_form_value,
+    _entity_comparison,
+    _fetch_platform_entities,
+    _batch_geometries_differ,
+    _gather,
+    _layer_features,
+    _merge_join_platform_entities,
+    _paginate_entity_data,
+    _platform_entity_fields,
     _prepare_duplicate_candidates,
+    _prewarm_check_transform,
+    _prewarm_completed_request,
+    _request_map_entries,
     _resolve_existing_endpoints,
+    _stream_compare_entities,
+)
+from application.blueprints.datamanager.services.resource_index import ResourceIndex
+from application.blueprints.datamanager.utils.geometry import (
+    geojson_features,
+    geometries_differ,
 )
+from application.extensions import process_pool
 
 TRANSFORM_MODULE = "application.blueprints.datamanager.controllers.transform"
 
@@ -209,3 +232,266 @@ def test_resolve_existing_endpoints_enriches_sorts_and_flags():
     assert by_hash[current_hash]["is_current"] is True
     assert by_hash["hash-new"]["latest-status"] == "200"
     assert by_hash["hash-new"]["latest-log-entry-date"] == "2026-07-20"
+
+
+def test_prewarm_check_transform_starts_fetches_and_waits_for_completion(app):
+    params = {
+        "organisation": "local-authority:ABC",
+        "dataset": "conservation-area",
+        "url": "https://example.com/data.csv",
+        "documentation_url": "https://example.gov.uk/docs",
+    }
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}.prewarm.submit"
+    ) as mock_submit, patch(f"{TRANSFORM_MODULE}.when_done") as mock_when_done:
+        _prewarm_check_transform("req-1", params)
+
+    keys = [c.args[0] for c in mock_submit.call_args_list]
+    assert keys == [
+        ("endpoint-in-doc", params["documentation_url"], params["url"]),
+        ("platform-entities", "local-authority:ABC", "conservation-area"),
+        ("boundary", "local-authority:ABC", "conservation-area"),
+    ]
+    mock_when_done.assert_called_once_with(
+        "req-1",
+        ("completed-request", "req-1"),
+        _prewarm_completed_request,
+        "req-1",
+        params["url"],
+    )
+
+
+def test_prewarm_completed_request_warms_summary_and_endpoints(app):
+    req = {
+        "status": "COMPLETE",
+        "response": {"data": {"source-summary": {"pipelines_append_required": 1}}},
+    }
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}.fetch_request", return_value=req
+    ), patch(f"{TRANSFORM_MODULE}.get_resource_index") as mock_summary, patch(
+        f"{TRANSFORM_MODULE}._resolve_existing_endpoints"
+    ) as mock_endpoints:
+        _prewarm_completed_request("req-1", "https://example.com/data.csv")
+    mock_summary.assert_called_once_with("req-1")
+    mock_endpoints.assert_called_once_with(
+        {"pipelines_append_required": 1}, "https://example.com/data.csv"
+    )
+
+
+def test_prewarm_completed_request_skips_failed_jobs(app):
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}.fetch_request", return_value={"status": "FAILED"}
+    ), patch(f"{TRANSFORM_MODULE}.get_resource_index") as mock_summary:
+        _prewarm_completed_request("req-1", "")
+    mock_summary.assert_not_called()
+
+
+def _slow(value, seconds):
+    time.sleep(seconds)
+    return value
+
+
+def _fail():
+    raise RuntimeError("upstream down")
+
+
+def test_gather_runs_calls_concurrently(app):
+    calls = {name: (_slow, (name, 0.2), None) for name in ("a", "b", "c", "d")}
+    started = time.monotonic()
+    with app.test_request_context():
+        results = _gather(calls, deadline=5)
+    assert results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    assert time.monotonic() - started < 0.6
+
+
+def test_gather_falls_back_on_error_and_deadline(app):
+    calls = {
+        "ok": (_slow, ("ok", 0), None),
+        "failing": (_fail, (), "failed-default"),
+        "slow": (_slow, ("late", 2), "slow-default"),
+    }
+    started = time.monotonic()
+    with app.test_request_context():
+        results = _gather(calls, deadline=0.2)
+    assert results == {
+        "ok": "ok",
+        "failing": "failed-default",
+        "slow": "slow-default",
+    }
+    assert time.monotonic() - started < 1
+
+
+def test_gather_required_call_waits_and_raises(app):
+    with app.test_request_context():
+        results = _gather({"slow": (_slow, ("done", 0.3), _REQUIRED)}, deadline=0.1)
+        assert results == {"slow": "done"}
+        with pytest.raises(RuntimeError):
+            _gather({"failing": (_fail, (), _REQUIRED)}, deadline=5)
+
+
+_RESOURCE = ResourceIndex.build(
+    {
+        "entry_number": n,
+        "transformed_row": [
+            {"entity": entity, "field": field, "value": value}
+            for field, value in (
+                ("entity", entity),
+                ("reference", f"R{entity}"),
+                ("name", name),
+            )
+        ],
+    }
+    for n, (entity, name) in enumerate((("100", "New"), ("200", "Changed")), 1)
+)
+
+
+def test_entity_comparison_computed_once_per_platform_snapshot(app):
+    platform = [
+        {
+            "entity": 200,
+            "reference": "R200",
+            "name": "Original",
+            "entry-date": "2024-01-01",
+        }
+    ]
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}._build_entities_data",
+        wraps=transform_module._build_entities_data,
+    ) as mock_build:
+        first = _entity_comparison("req-1", _RESOURCE, platform)
+        second = _entity_comparison("req-1", _RESOURCE, list(platform))
+        assert mock_build.call_count == 1
+        # An edit on the platform moves its latest entry date.
+        changed_platform = [
+            {**platform[0], "name": "Changed", "entry-date": "2024-06-01"}
+        ]
+        third = _entity_comparison("req-1", _RESOURCE, changed_platform)
+        assert mock_build.call_count == 2
+    assert first == second
+    assert first["category_counts"] == {
+        "new": 1,
+        "changed": 1,
+        "in_both": 0,
+        "existing": 0,
+    }
+    assert third["category_counts"]["in_both"] == 1
+
+
+def test_map_layer_requests_reuse_the_page_snapshot(app):
+    req = {"params": {"organisation": "local-authority:ABC", "dataset": "tree"}}
+    platform = ([{"entity": 200, "reference": "R200", "name": "Original"}], False, 1)
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}.get_resource_index", return_value=_RESOURCE
+    ), patch(
+        f"{TRANSFORM_MODULE}._fetch_platform_entities", return_value=platform
+    ) as mock_fetch:
+        # The first layer request finds no map yet and builds it.
+        snapshot, entries = _request_map_entries("req-1", req)
+        assert mock_fetch.call_count == 1
+        assert _request_map_entries("req-1", req) == (snapshot, entries)
+        assert mock_fetch.call_count == 1
+
+
+def test_paginate_entity_data_leaves_comparison_untouched(app):
+    with app.test_request_context():
+        comparison = _entity_comparison("req-1", _RESOURCE, [])
+    entities_data, *_ = _paginate_entity_data(
+        comparison, 1, "", "", include_selection=True
+    )
+    assert all("entity_selection" in row for row in entities_data["rows"])
+    assert not any("entity_selection" in row for row in comparison["rows"])
+
+
+def test_platform_entity_fields_projects_to_dataset_fields():
+    spec = ["reference", "name", "organisation", "tree-preservation-order"]
+    with patch(
+        f"{TRANSFORM_MODULE}.get_field_names_for_dataset", return_value=spec
+    ), patch(f"{TRANSFORM_MODULE}.get_dataset_typology", return_value="geography"):
+        assert _platform_entity_fields("tree") == (
+            "entity",
+            "geometry",
+            "name",
+            "point",
+            "reference",
+            "tree-preservation-order",
+        )
+    with patch(f"{TRANSFORM_MODULE}.get_field_names_for_dataset", return_value=spec):
+        assert "geometry" not in _platform_entity_fields("tree")
+    # Unknown fields: fetch them all.
+    with patch(
+        f"{TRANSFORM_MODULE}.get_field_names_for_dataset",
+        side_effect=Exception("boom"),
+    ):
+        assert _platform_entity_fields("tree") is None
+
+
+def test_failed_entity_count_reads_platform_entities_without_a_count(app):
+    platform = [{"entity": 1}, {"entity": 2}]
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}.get_org_entity", return_value=42
+    ), patch(
+        "application.blueprints.datamanager.services.planning_data._fetch_entity_count",
+        side_effect=Exception("boom"),
+    ), patch(
+        f"{TRANSFORM_MODULE}.get_platform_entities", return_value=platform
+    ) as mock_entities, patch(
+        f"{TRANSFORM_MODULE}._platform_entity_fields", return_value=None
+    ):
+        result = _fetch_platform_entities("local-authority:ABC", "tree")
+    assert mock_entities.call_args.kwargs["count"] is None
+    assert result == (platform, False, 2)
+
+
+def test_merge_join_platform_entities_keeps_matches_and_bounded_existing():
+    platform = ({"entity": n, "reference": f"R{n}"} for n in range(1, 1001))
+    matched, existing, existing_total = _merge_join_platform_entities(
+        {"5", "500", "5000"}, platform, existing_limit=10
+    )
+    assert [e["entity"] for e in matched] == [5, 500]
+    assert [e["entity"] for e in existing] == [1, 2, 3, 4, 6, 7, 8, 9, 10, 11]
+    assert existing_total == 998
+
+
+def test_merge_join_platform_entities_rejects_unordered_stream():
+    with pytest.raises(ValueError):
+        _merge_join_platform_entities(
+            {"2"}, [{"entity": "10"}, {"entity": "9"}], existing_limit=10
+        )
+
+
+def test_stream_compare_entities_categorises_every_entity(app):
+    platform = [{"entity": n, "reference": f"R{n}"} for n in range(150, 260)]
+    platform[50] = {"entity": 200, "reference": "R200", "name": "Original"}
+    with app.test_request_context(), patch(
+        f"{TRANSFORM_MODULE}.iter_entities_for_organisation_and_dataset",
+        return_value=iter(platform),
+    ), patch(f"{TRANSFORM_MODULE}._PLATFORM_ENTITY_LIMIT", 5):
+        comparison = _stream_compare_entities(_RESOURCE, 42, "tree")
+    assert comparison["category_counts"] == {
+        "new": 1,
+        "changed": 1,
+        "in_both": 0,
+        "existing": 109,
+    }
+    assert comparison["existing_rows_shown"] == 5
+    assert len(comparison["rows"]) == 7
+    assert len(comparison["platform_entities"]) == 6
+
+
+def test_large_batches_split_across_processes_match_one_call(monkeypatch):
+    wkts = [
+        f"POLYGON (({x} 52, {x + 0.01} 52, {x + 0.01} 52.01, {x} 52))" for x in range(6)
+    ]
+    moved = wkts[:3] + [w.replace("52.01", "52.02") for w in wkts[3:]]
+    items = [(wkt, {"entity": str(i)}) for i, wkt in enumerate(wkts)]
+    monkeypatch.setattr(process_pool, "workers", 2)
+    monkeypatch.setattr(process_pool, "min_items", 2)
+    try:
+        differs = _batch_geometries_differ(wkts, moved)
+        features, bounds = _layer_features(items, zoom=10, as_points=False)
+    finally:
+        process_pool.shutdown()
+    assert differs == geometries_differ(wkts, moved) == [False] * 3 + [True] * 3
+    expected_features, expected_bounds = geojson_features(items, zoom=10)
+    assert features == expected_features
+    assert (bounds == expected_bounds).all()
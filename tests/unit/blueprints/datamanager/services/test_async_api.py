@@ -1,3 +1,4 @@
+import time
 from unittest.mock import patch, Mock
 
 import pytest
@@ -5,8 +6,12 @@ import pytest
 from application.blueprints.datamanager.services.async_api import (
     AsyncAPIError,
     fetch_request,
+    _BatchSizer,
+    fetch_response_details,
+    iter_response_details,
     submit_request,
 )
+from application.http_client import CircuitOpenError
 
 
 class TestSubmitRequest:
@@ -15,7 +20,7 @@ class TestSubmitRequest:
         mock_response.status_code = 202
         mock_response.json.return_value = {"id": "abc123"}
         with patch(
-            "application.blueprints.datamanager.services.async_api.requests.post",
+            "application.blueprints.datamanager.services.async_api.async_api_http.post",
             return_value=mock_response,
         ):
             result = submit_request(
@@ -28,7 +33,7 @@ class TestSubmitRequest:
         mock_response.status_code = 500
         mock_response.json.return_value = {"error": "server error"}
         with patch(
-            "application.blueprints.datamanager.services.async_api.requests.post",
+            "application.blueprints.datamanager.services.async_api.async_api_http.post",
             return_value=mock_response,
         ):
             with pytest.raises(AsyncAPIError):
@@ -36,7 +41,7 @@ class TestSubmitRequest:
 
     def test_raises_on_request_exception(self):
         with patch(
-            "application.blueprints.datamanager.services.async_api.requests.post",
+            "application.blueprints.datamanager.services.async_api.async_api_http.post",
             side_effect=Exception("timeout"),
         ):
             with pytest.raises(Exception):
@@ -49,7 +54,7 @@ class TestFetchRequest:
         mock_response.status_code = 200
         mock_response.json.return_value = {"id": "abc123", "status": "COMPLETE"}
         with patch(
-            "application.blueprints.datamanager.services.async_api.requests.get",
+            "application.blueprints.datamanager.services.async_api.async_api_http.get",
             return_value=mock_response,
         ):
             result = fetch_request("abc123")
@@ -60,7 +65,7 @@ class TestFetchRequest:
         mock_response = Mock()
         mock_response.status_code = 404
         with patch(
-            "application.blueprints.datamanager.services.async_api.requests.get",
+            "application.blueprints.datamanager.services.async_api.async_api_http.get",
             return_value=mock_response,
         ):
             with pytest.raises(AsyncAPIError):
@@ -70,8 +75,224 @@ class TestFetchRequest:
         mock_response = Mock()
         mock_response.status_code = 400
         with patch(
-            "application.blueprints.datamanager.services.async_api.requests.get",
+            "application.blueprints.datamanager.services.async_api.async_api_http.get",
             return_value=mock_response,
         ):
             with pytest.raises(AsyncAPIError):
                 fetch_request("bad-id")
+
+
+class TestFetchRequestCaching:
+    def _response(self, status):
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"id": "abc123", "status": status, "params": {}}
+        return response
+
+    def _get(self, status):
+        return patch(
+            "application.blueprints.datamanager.services.async_api.async_api_http.get",
+            return_value=self._response(status),
+        )
+
+    def test_fetched_once_per_app_request(self, app):
+        with app.test_request_context(), self._get("PENDING") as mock_get:
+            fetch_request("abc123")
+            fetch_request("abc123")
+        assert mock_get.call_count == 1
+
+    def test_callers_get_independent_copies(self, app):
+        with app.test_request_context(), self._get("PENDING"):
+            fetch_request("abc123")["params"]["organisation_display"] = "Changed"
+            assert fetch_request("abc123")["params"] == {}
+
+    def test_pending_request_refetched_on_next_app_request(self, app):
+        with self._get("PENDING") as mock_get:
+            for _ in range(2):
+                with app.test_request_context():
+                    fetch_request("abc123")
+        assert mock_get.call_count == 2
+
+    @pytest.mark.parametrize("status", ["COMPLETE", "FAILED"])
+    def test_terminal_request_cached_across_app_requests(self, app, status):
+        with self._get(status) as mock_get:
+            for _ in range(2):
+                with app.test_request_context():
+                    assert fetch_request("abc123")["status"] == status
+        assert mock_get.call_count == 1
+
+
+def _details_page(offset, size):
+    return [{"entry_number": offset + i + 1} for i in range(size)]
+
+
+def _details_response(rows):
+    response = Mock()
+    response.status_code = 200
+    response.content = b"[]"
+    response.json.return_value = rows
+    return response
+
+
+class TestFetchResponseDetails:
+    @pytest.fixture(autouse=True)
+    def fixed_batch_size(self, app, monkeypatch):
+        # Exercise the upstream paging on its own: fixed 100-row pages and no
+        # result store.
+        monkeypatch.setitem(app.config, "ASYNC_API_DETAILS_BATCH_MIN", 100)
+        monkeypatch.setitem(app.config, "ASYNC_API_DETAILS_BATCH_MAX", 100)
+        monkeypatch.setitem(app.config, "RESULT_STORE_DIR", "")
+
+    def _fetch(self, app, get, workers=4, **kwargs):
+        app.config["ASYNC_API_FETCH_WORKERS"] = workers
+        try:
+            with app.test_request_context(), patch(
+                "application.blueprints.datamanager.services.async_api.async_api_http.get",
+                side_effect=get,
+            ) as mock_get:
+                rows = fetch_response_details("req-1", **kwargs)
+        finally:
+            app.config["ASYNC_API_FETCH_WORKERS"] = 4
+        return rows, mock_get
+
+    def test_concurrent_pages_reassembled_in_offset_order(self, app):
+        total = 1050
+
+        def get(url, params):
+            offset, limit = params["offset"], params["limit"]
+            # Later pages answer first, to prove ordering is by offset.
+            time.sleep(0.001 * (total - offset) / 100)
+            return _details_response(
+                _details_page(offset, max(0, min(limit, total - offset)))
+            )
+
+        rows, _ = self._fetch(app, get)
+        assert [r["entry_number"] for r in rows] == list(range(1, total + 1))
+
+    def test_small_result_makes_a_single_request(self, app):
+        rows, mock_get = self._fetch(
+            app, lambda url, params: _details_response(_details_page(0, 3))
+        )
+        assert len(rows) == 3
+        assert mock_get.call_count == 1
+
+    def test_respects_start_offset_and_max_rows(self, app):
+        def get(url, params):
+            return _details_response(_details_page(params["offset"], params["limit"]))
+
+        rows, _ = self._fetch(app, get, start_offset=200, max_rows=250)
+        assert [r["entry_number"] for r in rows] == list(range(201, 451))
+
+    def test_truncates_at_first_failed_page(self, app):
+        def get(url, params):
+            if params["offset"] == 200:
+                raise Exception("boom")
+            return _details_response(_details_page(params["offset"], params["limit"]))
+
+        rows, _ = self._fetch(app, get, max_rows=600)
+        assert [r["entry_number"] for r in rows] == list(range(1, 201))
+
+    def test_open_circuit_fails_instead_of_truncating(self, app):
+        def get(url, params):
+            if params["offset"] == 200:
+                raise CircuitOpenError("async API is unavailable (circuit open)")
+            return _details_response(_details_page(params["offset"], params["limit"]))
+
+        with pytest.raises(CircuitOpenError):
+            self._fetch(app, get, max_rows=600)
+
+    def test_failed_page_is_retried(self, app):
+        attempts = {}
+
+        def get(url, params):
+            offset = params["offset"]
+            attempts[offset] = attempts.get(offset, 0) + 1
+            if offset == 100 and attempts[offset] == 1:
+                raise Exception("transient")
+            return _details_response(_details_page(offset, min(100, 150 - offset)))
+
+        rows, _ = self._fetch(app, get)
+        assert len(rows) == 150
+        assert attempts[100] == 2
+
+    def test_serial_when_single_worker(self, app):
+        offsets = []
+
+        def get(url, params):
+            offsets.append(params["offset"])
+            return _details_response(
+                _details_page(params["offset"], min(100, 250 - params["offset"]))
+            )
+
+        rows, _ = self._fetch(app, get, workers=1)
+        assert len(rows) == 250
+        assert offsets == [0, 100, 200]
+
+    def test_iterator_fetches_pages_lazily(self, app):
+        def get(url, params):
+            return _details_response(_details_page(params["offset"], params["limit"]))
+
+        app.config["ASYNC_API_FETCH_WORKERS"] = 1
+        try:
+            with app.test_request_context(), patch(
+                "application.blueprints.datamanager.services.async_api.async_api_http.get",
+                side_effect=get,
+            ) as mock_get:
+                rows = iter_response_details("req-1")
+                assert next(rows)["entry_number"] == 1
+                assert mock_get.call_count == 1
+                rows.close()
+        finally:
+            app.config["ASYNC_API_FETCH_WORKERS"] = 4
+
+
+class TestBatchSizer:
+    @pytest.fixture(autouse=True)
+    def batch_config(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "ASYNC_API_DETAILS_BATCH_MIN", 25)
+        monkeypatch.setitem(app.config, "ASYNC_API_DETAILS_BATCH_MAX", 1000)
+        monkeypatch.setitem(app.config, "ASYNC_API_DETAILS_BATCH_TARGET_BYTES", 100_000)
+        monkeypatch.setitem(app.config, "ASYNC_API_DETAILS_BATCH_TARGET_SECONDS", 4)
+        with app.app_context():
+            yield
+
+    def test_small_fast_rows_grow_page_size_up_to_max(self):
+        sizer = _BatchSizer(100)
+        for _ in range(10):
+            sizer.observe(sizer.size, nbytes=sizer.size * 10, seconds=0.01)
+        assert sizer.size == 1000
+
+    def test_large_rows_shrink_page_size_to_byte_target(self):
+        sizer = _BatchSizer(100)
+        for _ in range(10):
+            sizer.observe(sizer.size, nbytes=sizer.size * 2000, seconds=0.1)
+        assert sizer.size == 50
+
+    def test_slow_pages_shrink_page_size_down_to_min(self):
+        sizer = _BatchSizer(100)
+        for _ in range(10):
+            sizer.observe(sizer.size, nbytes=sizer.size, seconds=sizer.size * 1.0)
+        assert sizer.size == 25
+
+    def test_size_changes_at_most_twofold_per_page(self):
+        sizer = _BatchSizer(100)
+        sizer.observe(100, nbytes=100, seconds=0.001)
+        assert sizer.size == 200
+
+    def test_pages_grow_while_fetching(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "ASYNC_API_FETCH_WORKERS", 1)
+        monkeypatch.setitem(app.config, "RESULT_STORE_DIR", "")
+        limits = []
+
+        def get(url, params):
+            limits.append(params["limit"])
+            size = max(0, min(params["limit"], 1500 - params["offset"]))
+            return _details_response(_details_page(params["offset"], size))
+
+        with app.test_request_context(), patch(
+            "application.blueprints.datamanager.services.async_api.async_api_http.get",
+            side_effect=get,
+        ):
+            rows = fetch_response_details("req-1")
+        assert len(rows) == 1500
+        assert limits[:4] == [100, 200, 400, 800]
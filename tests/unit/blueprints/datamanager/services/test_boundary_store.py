@@ -0,0 +1,103 @@
+import json
+from unittest.mock import patch
+
+import pytest
+import shapely
+
+from application.blueprints.datamanager.services import boundary_store
+
+_FETCH = (
+    "application.blueprints.datamanager.services.boundary_store"
+    ".fetch_lpa_boundary_geojson"
+)
+_SUBMIT = "application.blueprints.datamanager.services.boundary_store.prewarm.submit"
+
+# A detailed boundary: a circle with far more vertices than a map can show.
+_BOUNDARY = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"name": "Somewhere"},
+            "geometry": json.loads(
+                shapely.to_geojson(shapely.Point(-1.5, 52.5).buffer(0.05, 512))
+            ),
+        }
+    ],
+}
+
+
+def _ring(collection):
+    return collection["features"][0]["geometry"]["coordinates"][0]
+
+
+class TestBoundaryStore:
+    def test_fetched_once_then_served_from_store(self, app):
+        with app.test_request_context(), patch(_FETCH, return_value=_BOUNDARY) as fetch:
+            first = boundary_store.get_boundary("local-authority:ABC", 14)
+            second = boundary_store.get_boundary("local-authority:ABC", 14)
+            full = boundary_store.get_boundary("local-authority:ABC")
+        assert fetch.call_count == 1
+        assert second == first
+        assert first["features"][0]["properties"] == {"name": "Somewhere"}
+        assert len(_ring(first)) < len(_ring(full)) == len(_ring(_BOUNDARY))
+
+    def test_other_zooms_simplified_from_stored_copy(self, app):
+        with app.test_request_context(), patch(_FETCH, return_value=_BOUNDARY) as fetch:
+            boundary_store.get_boundary("local-authority:ABC", 14)
+            coarse = boundary_store.get_boundary("local-authority:ABC", 8)
+            again = boundary_store.get_boundary("local-authority:ABC", 8)
+        assert fetch.call_count == 1
+        assert again == coarse
+        assert len(_ring(coarse)) < len(
+            _ring(boundary_store.simplify_feature_collection(_BOUNDARY, 14))
+        )
+
+    def test_old_boundary_served_and_refreshed_in_background(self, app, monkeypatch):
+        with app.test_request_context(), patch(_FETCH, return_value=_BOUNDARY):
+            boundary_store.get_boundary("local-authority:ABC")
+            monkeypatch.setitem(app.config, "BOUNDARY_STORE_REFRESH_AFTER", -1)
+            with patch(_SUBMIT) as submit, patch(_FETCH) as fetch:
+                assert boundary_store.get_boundary("local-authority:ABC") == _BOUNDARY
+        fetch.assert_not_called()
+        submit.assert_called_once_with(
+            ("boundary-refresh", "local-authority:ABC"),
+            boundary_store.refresh,
+            "local-authority:ABC",
+        )
+
+    def test_expired_boundary_kept_when_refetch_fails(self, app, monkeypatch):
+        with app.test_request_context():
+            with patch(_FETCH, return_value=_BOUNDARY):
+                boundary_store.get_boundary("local-authority:ABC")
+            monkeypatch.setitem(app.config, "BOUNDARY_STORE_TTL", -1)
+            with patch(_FETCH, side_effect=Exception("boom")) as fetch:
+                assert boundary_store.get_boundary("local-authority:ABC") == _BOUNDARY
+        fetch.assert_called_once()
+
+    def test_failed_fetch_raises_and_is_not_stored(self, app):
+        with app.test_request_context():
+            with patch(_FETCH, side_effect=Exception("boom")):
+                with pytest.raises(Exception, match="boom"):
+                    boundary_store.get_boundary("local-authority:ABC", 14)
+            with patch(_FETCH, return_value=_BOUNDARY) as fetch:
+                boundary_store.get_boundary("local-authority:ABC", 14)
+        fetch.assert_called_once()
+
+    def test_unwritable_store_directory_fetches_boundary(self, app):
+        with app.test_request_context(), patch(
+            _FETCH, return_value=_BOUNDARY
+        ) as fetch, patch(
+            "application.blueprints.datamanager.services.boundary_store.os.makedirs",
+            side_effect=PermissionError("read-only file system"),
+        ):
+            boundary = boundary_store.get_boundary("local-authority:ABC")
+        assert fetch.call_count == 1
+        assert boundary == _BOUNDARY
+
+    def test_disabled_store_caches_in_process(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "BOUNDARY_STORE_DIR", "")
+        with app.test_request_context(), patch(_FETCH, return_value=_BOUNDARY) as fetch:
+            boundary_store.get_boundary("local-authority:ABC", 14)
+            boundary_store.get_boundary("local-authority:ABC", 14)
+        fetch.assert_called_once()
@@ -105,7 +105,7 @@ class TestCheckEndpointInDoc:
         ep = "https://maps.example.gov.uk/layer-found.geojson"
         html = f'<html><body><a href="{ep}">link</a></body></html>'
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             return_value=_mock_response(html),
         ):
             with app.app_context():
@@ -120,7 +120,7 @@ class TestCheckEndpointInDoc:
         ep = "https://maps.example.gov.uk/layer-access-error.geojson"
         exc = requests_lib.exceptions.RequestException("403 Forbidden")
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             side_effect=exc,
         ):
             with app.app_context():
@@ -134,7 +134,7 @@ class TestCheckEndpointInDoc:
         doc = "https://www.example.gov.uk/data/timeout/"
         ep = "https://maps.example.gov.uk/layer-timeout.geojson"
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             side_effect=requests_lib.exceptions.Timeout(),
         ):
             with app.app_context():
@@ -148,7 +148,7 @@ class TestCheckEndpointInDoc:
         ep = "https://maps.example.gov.uk/layer-govuk-notfound.geojson"
         html = "<html><body><a href='https://other.example.gov.uk/unrelated'>x</a></body></html>"
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             return_value=_mock_response(html),
         ):
             with app.app_context():
@@ -164,7 +164,7 @@ class TestCheckEndpointInDoc:
         ep = "https://services.arcgis.com/data/layer-nongov.geojson"
         html = "<html><body><a href='https://other.example.gov.uk/unrelated'>x</a></body></html>"
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             return_value=_mock_response(html),
         ):
             with app.app_context():
@@ -179,7 +179,7 @@ class TestCheckEndpointInDoc:
         ep = "https://maps.example.gov.uk/layer-nongov-doc-found.geojson"
         html = f'<html><body><a href="{ep}">link</a></body></html>'
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             return_value=_mock_response(html),
         ):
             with app.app_context():
@@ -194,7 +194,7 @@ class TestCheckEndpointInDoc:
         ep = "https://maps.example.gov.uk/layer-nongov-doc-notfound.geojson"
         html = "<html><body><a href='https://unrelated.org.uk/page'>x</a></body></html>"
         with patch(
-            "application.blueprints.datamanager.services.doc_crawler.requests.get",
+            "application.blueprints.datamanager.services.doc_crawler.doc_http.get",
             return_value=_mock_response(html),
         ):
             with app.app_context():
@@ -29,7 +29,7 @@ class TestGetEndpointUrlsForHashes:
             }
         ]
         with app.app_context():
-            with patch(f"{ENDPOINT_MODULE}.requests.get") as mock_get:
+            with patch(f"{ENDPOINT_MODULE}.datasette_http.get") as mock_get:
                 mock_get.return_value = _objects_response(rows)
                 result = get_endpoint_info_for_hashes(["hash-a"])
 
@@ -47,7 +47,7 @@ class TestGetEndpointUrlsForHashes:
     def test_exception_returns_empty_dict(self, app):
         with app.app_context():
             with patch(
-                f"{ENDPOINT_MODULE}.requests.get", side_effect=Exception("boom")
+                f"{ENDPOINT_MODULE}.datasette_http.get", side_effect=Exception("boom")
             ):
                 assert get_endpoint_info_for_hashes(["hash-a"]) == {}
 
@@ -71,7 +71,7 @@ class TestGetEndpointLogSummaryForHashes:
             },
         ]
         with app.app_context():
-            with patch(f"{ENDPOINT_MODULE}.requests.get") as mock_get:
+            with patch(f"{ENDPOINT_MODULE}.datasette_http.get") as mock_get:
                 mock_get.return_value = _objects_response(rows)
                 result = get_endpoint_log_summary_for_hashes(["hash-a", "hash-b"])
 
@@ -90,6 +90,6 @@ class TestGetEndpointLogSummaryForHashes:
     def test_exception_returns_empty_dict(self, app):
         with app.app_context():
             with patch(
-                f"{ENDPOINT_MODULE}.requests.get", side_effect=Exception("slow")
+                f"{ENDPOINT_MODULE}.datasette_http.get", side_effect=Exception("slow")
             ):
                 assert get_endpoint_log_summary_for_hashes(["hash-a"]) == {}
@@ -0,0 +1,123 @@
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+from application.blueprints.datamanager.services.entity_store import (
+    get_platform_entities,
+)
+from application.extensions import cache
+
+_GET = "application.blueprints.datamanager.services.planning_data.planning_http.get"
+
+
+class _Platform:
+    """Fake /entity.json over a dict of entities, honouring entry_date since."""
+
+    def __init__(self, n):
+        self.entities = {
+            str(i): {"entity": str(i), "name": f"n{i}", "entry-date": "2024-01-01"}
+            for i in range(1, n + 1)
+        }
+        self.since_reads = []
+        self.fail_since = False
+
+    def get(self, url):
+        query = parse_qs(urlparse(url).query)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query["limit"][0])
+        entities = sorted(self.entities.values(), key=lambda e: int(e["entity"]))
+        if query.get("entry_date_match") == ["since"]:
+            if self.fail_since:
+                raise Exception("boom")
+            since = "{}-{:02d}-{:02d}".format(
+                *(
+                    int(query[f"entry_date_{part}"][0])
+                    for part in ("year", "month", "day")
+                )
+            )
+            self.since_reads.append(since)
+            entities = [e for e in entities if e["entry-date"] >= since]
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {
+            "entities": entities[offset : offset + limit],
+            "links": {},
+        }
+        return response
+
+
+def _read(platform, count=None):
+    cache.clear()  # past the in-process memo, to the store
+    with patch(_GET, side_effect=platform.get) as mock_get:
+        entities = get_platform_entities(
+            1, "tree", count=len(platform.entities) if count is None else count
+        )
+    return entities, mock_get.call_count
+
+
+class TestEntityStore:
+    def test_repeat_read_only_asks_for_changes(self, app):
+        platform = _Platform(3)
+        with app.test_request_context():
+            first, _ = _read(platform)
+            second, calls = _read(platform)
+        assert second == first
+        assert [e["entity"] for e in first] == ["1", "2", "3"]
+        assert calls == 1
+        assert platform.since_reads == ["2024-01-01"]
+
+    def test_changed_entities_are_merged(self, app):
+        platform = _Platform(3)
+        with app.test_request_context():
+            _read(platform)
+            platform.entities["2"] = {
+                "entity": "2",
+                "name": "renamed",
+                "entry-date": "2024-06-01",
+            }
+            platform.entities["4"] = {
+                "entity": "4",
+                "name": "n4",
+                "entry-date": "2024-06-01",
+            }
+            entities, _ = _read(platform)
+            _read(platform)
+        assert [e["name"] for e in entities] == ["n1", "renamed", "n3", "n4"]
+        assert platform.since_reads == ["2024-01-01", "2024-06-01"]
+
+    def test_removed_entity_reloads_in_full(self, app):
+        platform = _Platform(3)
+        with app.test_request_context():
+            _read(platform)
+            del platform.entities["2"]
+            entities, calls = _read(platform)
+            again, _ = _read(platform)
+        assert [e["entity"] for e in entities] == ["1", "3"]
+        assert again == entities
+        assert calls == 2  # the incremental read, then the full one
+
+    def test_failed_incremental_read_serves_snapshot(self, app):
+        platform = _Platform(3)
+        with app.test_request_context():
+            first, _ = _read(platform)
+            platform.fail_since = True
+            entities, _ = _read(platform)
+        assert entities == first
+
+    def test_truncated_full_read_is_not_stored(self, app):
+        platform = _Platform(3)
+        with app.test_request_context():
+            # The platform claims more entities than it returns.
+            _read(platform, count=5)
+            _, calls = _read(platform)
+        assert platform.since_reads == []
+        assert calls == 1
+
+    def test_unwritable_store_directory_reads_platform(self, app):
+        platform = _Platform(3)
+        with app.test_request_context(), patch(
+            "application.blueprints.datamanager.services.entity_store.os.makedirs",
+            side_effect=PermissionError("read-only file system"),
+        ):
+            entities, calls = _read(platform)
+        assert [e["entity"] for e in entities] == ["1", "2", "3"]
+        assert calls == 1
@@ -66,7 +66,7 @@ class TestTriggerAddDataAsyncWorkflow:
                     return_value="access-token",
                 ):
                     with patch(
-                        "application.blueprints.datamanager.services.github.requests.post",
+                        "application.blueprints.datamanager.services.github.github_http.post",
                         return_value=mock_dispatch,
                     ):
                         result = trigger_add_data_async_workflow("request-123")
@@ -92,7 +92,7 @@ class TestTriggerAddDataAsyncWorkflow:
                     return_value="access-token",
                 ):
                     with patch(
-                        "application.blueprints.datamanager.services.github.requests.post",
+                        "application.blueprints.datamanager.services.github.github_http.post",
                         return_value=mock_dispatch,
                     ):
                         result = trigger_add_data_async_workflow("request-123")
@@ -117,7 +117,7 @@ class TestTriggerAddDataAsyncWorkflow:
                     return_value="access-token",
                 ):
                     with patch(
-                        "application.blueprints.datamanager.services.github.requests.post",
+                        "application.blueprints.datamanager.services.github.github_http.post",
                         return_value=mock_dispatch,
                     ) as post:
                         trigger_add_data_async_workflow("request-123")
@@ -135,7 +135,7 @@ class TestGetBranchHeadSha:
         with app.app_context():
             _with_app_creds(app)
             with jwt_p, token_p, patch(
-                "application.blueprints.datamanager.services.github.requests.get",
+                "application.blueprints.datamanager.services.github.github_http.get",
                 return_value=resp,
             ):
                 assert get_branch_head_sha("config-manager-update") == "abc123"
@@ -147,7 +147,7 @@ class TestGetBranchHeadSha:
         with app.app_context():
             _with_app_creds(app)
             with jwt_p, token_p, patch(
-                "application.blueprints.datamanager.services.github.requests.get",
+                "application.blueprints.datamanager.services.github.github_http.get",
                 return_value=resp,
             ):
                 assert get_branch_head_sha("missing-branch") is None
@@ -162,7 +162,7 @@ class TestAddDataWorkflowRunning:
         with app.app_context():
             _with_app_creds(app)
             with jwt_p, token_p, patch(
-                "application.blueprints.datamanager.services.github.requests.get",
+                "application.blueprints.datamanager.services.github.github_http.get",
                 return_value=resp,
             ):
                 return add_data_workflow_running()
@@ -190,7 +190,7 @@ class TestAddDataWorkflowRunning:
         with app.app_context():
             _with_app_creds(app)
             with jwt_p, token_p, patch(
-                "application.blueprints.datamanager.services.github.requests.get",
+                "application.blueprints.datamanager.services.github.github_http.get",
                 return_value=resp,
             ):
                 assert add_data_workflow_running() is False
@@ -279,7 +279,7 @@ class TestConfigBranchChangedForCollection:
                 "application.blueprints.datamanager.services.github.get_branch_head_sha",
                 return_value=("head-sha" if branch_exists else None),
             ), patch(
-                "application.blueprints.datamanager.services.github.requests.get",
+                "application.blueprints.datamanager.services.github.github_http.get",
                 return_value=resp,
             ) as get:
                 result = config_branch_changed_for_collection(
@@ -338,7 +338,7 @@ class TestConfigBranchChangedForCollection:
                 "application.blueprints.datamanager.services.github.get_branch_head_sha",
                 return_value="head-sha",
             ), patch(
-                "application.blueprints.datamanager.services.github.requests.get",
+                "application.blueprints.datamanager.services.github.github_http.get",
                 return_value=resp,
             ):
                 assert (
@@ -57,7 +57,7 @@ class TestGetProvisionOrgsForDataset:
     def test_returns_unique_orgs_for_dataset(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.specification_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_provision_response(PROVISION_CSV)
                 result = get_provision_orgs_for_dataset("brownfield-land")
@@ -68,7 +68,7 @@ class TestGetProvisionOrgsForDataset:
     def test_does_not_include_other_datasets(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.specification_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_provision_response(PROVISION_CSV)
                 result = get_provision_orgs_for_dataset("conservation-area")
@@ -78,7 +78,7 @@ class TestGetProvisionOrgsForDataset:
     def test_cache_hit_does_not_refetch(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.specification_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_provision_response(PROVISION_CSV)
                 get_provision_orgs_for_dataset("brownfield-land")
@@ -90,7 +90,7 @@ class TestGetProvisionOrgsForDataset:
     def test_http_error_returns_empty_list(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.specification_http.get"
             ) as mock_get:
                 mock_get.side_effect = Exception("Network error")
                 result = get_provision_orgs_for_dataset("brownfield-land")
@@ -105,7 +105,7 @@ class TestGetProvisionOrgsForDataset:
         }
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.specification_http.get"
             ) as mock_get:
                 mock_get.side_effect = Exception("Network error")
                 result = get_provision_orgs_for_dataset("brownfield-land")
@@ -115,7 +115,7 @@ class TestGetProvisionOrgsForDataset:
     def test_returns_empty_list_for_unknown_dataset(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.specification_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_provision_response(PROVISION_CSV)
                 result = get_provision_orgs_for_dataset("unknown-dataset")
@@ -127,7 +127,7 @@ class TestGetOrgMapping:
     def test_normal_fetch_builds_mapping(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 name = get_organisation_name("local-authority:ABC")
@@ -151,7 +151,7 @@ class TestGetOrgMapping:
 
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.side_effect = [page1_resp, page2_resp]
                 abc_name = get_organisation_name("local-authority:ABC")
@@ -165,7 +165,7 @@ class TestGetOrgMapping:
     def test_unknown_code_returns_code_itself(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 name = get_organisation_name("local-authority:UNKNOWN")
@@ -181,7 +181,7 @@ class TestGetOrgMapping:
 
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.side_effect = Exception("Network error")
                 name = get_organisation_name("local-authority:CACHED")
@@ -191,7 +191,7 @@ class TestGetOrgMapping:
     def test_cache_hit_does_not_refetch(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 get_organisation_name("local-authority:ABC")
@@ -204,7 +204,7 @@ class TestIsValidOrganisation:
     def test_valid_org_returns_true(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 result = is_valid_organisation("local-authority:ABC")
@@ -214,7 +214,7 @@ class TestIsValidOrganisation:
     def test_invalid_org_returns_false(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 result = is_valid_organisation("local-authority:NONEXISTENT")
@@ -226,7 +226,7 @@ class TestFormatOrgOptions:
     def test_returns_correct_code_and_label_dicts(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 result = format_org_options(
@@ -247,7 +247,7 @@ class TestFormatOrgOptions:
     def test_unknown_code_falls_back_to_code_in_label(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 result = format_org_options(["local-authority:UNKNOWN"])
@@ -262,7 +262,7 @@ class TestFormatOrgOptions:
     def test_empty_list_returns_empty_list(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.services.organisation.requests.get"
+                "application.blueprints.datamanager.services.organisation.datasette_http.get"
             ) as mock_get:
                 mock_get.return_value = _make_org_mapping_response(ORG_ROWS)
                 result = format_org_options([])
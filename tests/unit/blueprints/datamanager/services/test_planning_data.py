@@ -0,0 +1,84 @@
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+from application.blueprints.datamanager.services.planning_data import (
+    get_entities_for_organisation_and_dataset,
+)
+
+_GET = "application.blueprints.datamanager.services.planning_data.planning_http.get"
+
+
+def _upstream(total, fail_at=None):
+    """Fake /entity.json holding `total` entities, paged by offset."""
+
+    def get(url):
+        query = parse_qs(urlparse(url).query)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query["limit"][0])
+        if offset == fail_at:
+            raise Exception("boom")
+        fields = query.get("field")
+        entities = [
+            {
+                k: v
+                for k, v in {"entity": str(n), "name": f"n{n}", "geometry": "x"}.items()
+                if fields is None or k in fields
+            }
+            for n in range(offset, min(offset + limit, total))
+        ]
+        next_offset = offset + limit
+        response = Mock()
+        response.json.return_value = {
+            "entities": entities,
+            "links": (
+                {"next": f"{url.split('&offset')[0]}&offset={next_offset}"}
+                if next_offset < total
+                else {}
+            ),
+        }
+        return response
+
+    return get
+
+
+def _offsets(mock_get):
+    return sorted(
+        int(parse_qs(urlparse(c.args[0]).query).get("offset", ["0"])[0])
+        for c in mock_get.call_args_list
+    )
+
+
+class TestGetEntities:
+    def test_counted_entities_fetched_in_offset_windows(self, app):
+        with app.test_request_context(), patch(
+            _GET, side_effect=_upstream(1200)
+        ) as mock_get:
+            entities = get_entities_for_organisation_and_dataset(
+                1, "tree", count=1200, fields=("entity", "name")
+            )
+        assert [e["entity"] for e in entities] == [str(n) for n in range(1200)]
+        assert entities[0] == {"entity": "0", "name": "n0"}
+        assert _offsets(mock_get) == [0, 500, 1000]
+
+    def test_entities_added_since_the_count_are_followed(self, app):
+        with app.test_request_context(), patch(
+            _GET, side_effect=_upstream(1700)
+        ) as mock_get:
+            entities = get_entities_for_organisation_and_dataset(1, "tree", count=1000)
+        assert len(entities) == 1700
+        assert _offsets(mock_get) == [0, 500, 1000, 1500]
+
+    def test_failed_window_truncates(self, app):
+        with app.test_request_context(), patch(
+            _GET, side_effect=_upstream(1200, fail_at=500)
+        ):
+            entities = get_entities_for_organisation_and_dataset(1, "tree", count=1200)
+        assert len(entities) == 500
+
+    def test_without_count_follows_links(self, app):
+        with app.test_request_context(), patch(
+            _GET, side_effect=_upstream(1200)
+        ) as mock_get:
+            entities = get_entities_for_organisation_and_dataset(1, "tree")
+        assert len(entities) == 1200
+        assert mock_get.call_count == 3
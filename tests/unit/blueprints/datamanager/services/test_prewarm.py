@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+from flask import current_app
+
+from application.blueprints.datamanager.services import prewarm
+
+
+@pytest.fixture
+def prewarm_enabled(app, monkeypatch):
+    monkeypatch.setitem(app.config, "PREWARM_WORKERS", 2)
+    return app
+
+
+class TestSubmit:
+    def test_runs_in_background_under_the_app(self, prewarm_enabled):
+        seen = {}
+        ran = threading.Event()
+
+        def task(value):
+            seen["value"] = value
+            seen["app"] = current_app.name
+            seen["thread"] = threading.current_thread().name
+            ran.set()
+
+        with prewarm_enabled.app_context():
+            assert prewarm.submit("task", task, 42) is True
+        assert ran.wait(5)
+        assert seen["value"] == 42
+        assert seen["app"] == prewarm_enabled.name
+        assert seen["thread"].startswith("prewarm")
+
+    def test_key_in_flight_not_submitted_again(self, prewarm_enabled):
+        release = threading.Event()
+        calls = []
+
+        def task():
+            calls.append(1)
+            release.wait(5)
+
+        with prewarm_enabled.app_context():
+            assert prewarm.submit("same", task) is True
+            assert prewarm.submit("same", task) is False
+            release.set()
+        for _ in range(100):
+            if "same" not in prewarm._in_flight:
+                break
+            threading.Event().wait(0.01)
+        with prewarm_enabled.app_context():
+            assert prewarm.submit("same", release.set) is True
+        assert len(calls) == 1
+
+    def test_failure_is_logged_not_raised(self, prewarm_enabled, caplog):
+        done = threading.Event()
+
+        def task():
+            try:
+                raise ValueError("boom")
+            finally:
+                done.set()
+
+        with prewarm_enabled.app_context():
+            prewarm.submit("failing", task)
+        assert done.wait(5)
+        for _ in range(100):
+            if "failing" not in prewarm._in_flight:
+                break
+            threading.Event().wait(0.01)
+        assert "Pre-warm failing failed: boom" in caplog.text
+
+    def test_disabled_when_no_workers(self, app):
+        with app.app_context():
+            assert prewarm.submit("task", pytest.fail) is False
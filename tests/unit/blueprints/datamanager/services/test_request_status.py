@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import requests
+
+import application.blueprints.datamanager.services.request_status as status_module
+from application.blueprints.datamanager.services.async_api import AsyncAPIError
+from application.blueprints.datamanager.services.request_status import (
+    get_request_status,
+    when_done,
+)
+
+_POLL = "application.blueprints.datamanager.services.request_status.poll_request"
+_GET = "application.blueprints.datamanager.services.async_api.async_api_http.get"
+_SUBMIT = "application.blueprints.datamanager.services.prewarm.submit"
+
+
+@pytest.fixture(autouse=True)
+def clear_pollers():
+    """Reset the module-level pollers between tests."""
+    status_module._pollers.clear()
+    yield
+    status_module._pollers.clear()
+
+
+@pytest.fixture
+def status_config(app, monkeypatch):
+    monkeypatch.setitem(app.config, "ASYNC_STATUS_POLL_INTERVAL", 0.05)
+    monkeypatch.setitem(app.config, "ASYNC_STATUS_MAX_WAIT", 5)
+    return app
+
+
+def _request(status, response=None):
+    return {"id": "req-1", "status": status, "response": response}
+
+
+class TestGetRequestStatus:
+    def test_pending_request_not_done(self, status_config):
+        with status_config.test_request_context(), patch(
+            _POLL, return_value=_request("PENDING")
+        ):
+            assert get_request_status("req-1") == {"status": "PENDING", "done": False}
+
+    @pytest.mark.parametrize(
+        "req",
+        [_request("COMPLETE", {"data": {}}), _request("FAILED")],
+    )
+    def test_finished_request_done(self, status_config, req):
+        with status_config.test_request_context(), patch(_POLL, return_value=req):
+            assert get_request_status("req-1")["done"] is True
+
+    def test_complete_without_response_not_done(self, status_config):
+        with status_config.test_request_context(), patch(
+            _POLL, return_value=_request("COMPLETE")
+        ):
+            assert get_request_status("req-1")["done"] is False
+
+    def test_concurrent_polls_share_one_fetch(self, status_config, monkeypatch):
+        monkeypatch.setitem(status_config.config, "ASYNC_STATUS_POLL_INTERVAL", 60)
+
+        def poll():
+            with status_config.test_request_context():
+                return get_request_status("req-1")
+
+        with patch(_POLL, return_value=_request("PENDING")) as mock_poll:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                states = list(pool.map(lambda _: poll(), range(8)))
+        assert all(state["status"] == "PENDING" for state in states)
+        assert mock_poll.call_count == 1
+
+    def test_long_poll_returns_when_done(self, status_config):
+        responses = iter(
+            [_request("PENDING"), _request("PROCESSING")]
+            + [_request("COMPLETE", {"data": {}})] * 10
+        )
+        with status_config.test_request_context(), patch(
+            _POLL, side_effect=lambda request_id: next(responses)
+        ):
+            state = get_request_status("req-1", wait=5)
+        # Returns on the first change of status rather than waiting for "done".
+        assert state == {"status": "PROCESSING", "done": False}
+
+    def test_wait_capped_by_config(self, status_config, monkeypatch):
+        monkeypatch.setitem(status_config.config, "ASYNC_STATUS_MAX_WAIT", 0)
+        with status_config.test_request_context(), patch(
+            _POLL, return_value=_request("PENDING")
+        ) as mock_poll:
+            get_request_status("req-1", wait=30)
+        assert mock_poll.call_count == 1
+
+    def test_api_error_reported_as_not_done(self, status_config):
+        with status_config.test_request_context(), patch(
+            _POLL, side_effect=AsyncAPIError("boom", status_code=502)
+        ):
+            assert get_request_status("req-1") == {"status": "UNKNOWN", "done": False}
+
+    def test_upstream_timeout_reported_as_not_done(self, status_config):
+        with status_config.test_request_context(), patch(
+            _GET, side_effect=requests.exceptions.Timeout("timed out")
+        ):
+            assert get_request_status("req-1") == {"status": "UNKNOWN", "done": False}
+
+
+class TestWhenDone:
+    @pytest.fixture(autouse=True)
+    def prewarm_enabled(self, status_config, monkeypatch):
+        monkeypatch.setitem(status_config.config, "PREWARM_WORKERS", 2)
+
+    def test_runs_once_a_poll_sees_the_request_finish(self, status_config):
+        responses = iter(
+            [_request("PENDING")] + [_request("COMPLETE", {"data": {}})] * 2
+        )
+        with status_config.test_request_context(), patch(
+            _POLL, side_effect=lambda request_id: next(responses)
+        ), patch(_SUBMIT) as mock_submit:
+            get_request_status("req-1")
+            when_done("req-1", "key", print, "arg")
+            assert mock_submit.call_count == 0
+            status_config.config["ASYNC_STATUS_POLL_INTERVAL"] = 0
+            get_request_status("req-1")
+            get_request_status("req-1")
+        mock_submit.assert_called_once_with("key", print, "arg")
+
+    def test_runs_straight_away_if_already_seen_done(self, status_config):
+        with status_config.test_request_context(), patch(
+            _POLL, return_value=_request("FAILED")
+        ), patch(_SUBMIT) as mock_submit:
+            get_request_status("req-1")
+            when_done("req-1", "key", print)
+        mock_submit.assert_called_once_with("key", print)
@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from application.blueprints.datamanager.services.resource_index import (
+    ResourceIndex,
+    ResourceIndexCache,
+    get_resource_index,
+)
+
+_ITER = (
+    "application.blueprints.datamanager.services.resource_index"
+    ".iter_response_details"
+)
+
+
+def _row(entry_number, entity, facts, converted_row=None):
+    return {
+        "entry_number": entry_number,
+        "converted_row": converted_row or {},
+        "transformed_row": [
+            {"entity": entity, "field": field, "value": value} for field, value in facts
+        ],
+        "issue_logs": [],
+    }
+
+
+class TestResourceIndex:
+    def test_entries_follow_rows_with_their_shape(self):
+        index = ResourceIndex.build(
+            [
+                _row(1, "100.0", [("name", "A"), ("point", "POINT (1 2)")]),
+                _row(2, None, []),
+                _row(
+                    3,
+                    101,
+                    [
+                        ("geometry", "POINT (3 4)"),
+                        ("point", "POINT (5 6)"),
+                        ("geometry", "POINT (7 8)"),
+                    ],
+                    {"Reference": "R3", "name": "C"},
+                ),
+            ]
+        )
+        assert [e.entity for e in index.entries] == ["100", "", "101"]
+        first, _, third = index.entries
+        assert (first.shape_wkt, first.point, first.reference) == (
+            "POINT (1 2)",
+            "POINT (1 2)",
+            "Entry 1",
+        )
+        # The first geometry fact is the shape; fields keep the last value.
+        assert (third.shape_wkt, third.point) == ("POINT (3 4)", "POINT (5 6)")
+        assert third.fields["geometry"] == "POINT (7 8)"
+        assert (third.reference, third.name) == ("R3", "C")
+        assert index.shapes == [first, third]
+        assert index.row_count == 3
+
+    def test_first_shape_is_the_first_geometry_or_point_fact(self):
+        point_first, empty_geometry_first = ResourceIndex.build(
+            [
+                _row(1, 100, [("point", "POINT (1 2)"), ("geometry", "POINT (3 4)")]),
+                _row(2, 101, [("geometry", ""), ("point", "POINT (5 6)")]),
+            ]
+        ).entries
+        assert point_first.first_shape_wkt == "POINT (1 2)"
+        assert point_first.shape_wkt == "POINT (3 4)"
+        assert empty_geometry_first.first_shape_wkt == ""
+        assert empty_geometry_first.shape_wkt == "POINT (5 6)"
+
+    def test_later_rows_of_an_entity_replace_its_fields(self):
+        index = ResourceIndex.build(
+            [_row(1, 100, [("name", "Old")]), _row(2, 100, [("name", "New")])]
+        )
+        assert index.entities == {"100": {"name": "New"}}
+
+
+class TestGetResourceIndex:
+    def test_built_once_per_request(self, app):
+        rows = [_row(1, 100, [("name", "A")])]
+        with app.test_request_context(), patch(_ITER, return_value=rows) as iterate:
+            first = get_resource_index("req-1")
+            assert get_resource_index("req-1") is first
+        iterate.assert_called_once_with("req-1")
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ResourceIndexCache(maxsize=2)
+        indexes = {key: ResourceIndex([]) for key in ("a", "b", "c")}
+        cache.set("a", indexes["a"])
+        cache.set("b", indexes["b"])
+        cache.get("a")
+        cache.set("c", indexes["c"])
+        assert cache.get("b") is None
+        assert cache.get("a") is indexes["a"]
+        assert len(cache) == 2
+
+    def test_expired_index_is_rebuilt(self):
+        cache = ResourceIndexCache(timeout=-1)
+        cache.set("a", ResourceIndex([]))
+        assert cache.get("a") is None
@@ -0,0 +1,98 @@
+import json
+import pickle
+import tracemalloc
+
+import pytest
+
+from application.blueprints.datamanager.services.response_rows import (
+    Fact,
+    ResponseRow,
+    compact_row,
+)
+
+
+def _raw_row(n):
+    return {
+        "entry_number": n,
+        "converted_row": {"reference": f"REF-{n}", "name": f"Site {n}"},
+        "transformed_row": [
+            {
+                "entity": str(1000 + n),
+                "field": field,
+                "value": f"{field}-{n}",
+                "start-date": "",
+                "end-date": "",
+                "entry-date": "2024-01-01",
+                "reference-entity": "",
+            }
+            for field in ("reference", "name", "notes", "organisation", "geometry")
+        ],
+        "issue_logs": [{"field": "name", "issue-type": "invalid", "value": ""}],
+    }
+
+
+class TestResponseRow:
+    def test_reads_like_the_raw_row(self):
+        raw = _raw_row(1)
+        row = ResponseRow(raw)
+        assert row["entry_number"] == 1
+        assert row.get("converted_row") == raw["converted_row"]
+        assert row.get("missing", "x") == "x"
+        fact = row.get("transformed_row")[0]
+        assert fact["field"] == "reference"
+        assert fact.get("start-date") == ""
+        assert fact.get("resource") is None
+        with pytest.raises(KeyError):
+            fact["resource"]
+        assert row.to_dict() == raw
+        assert row == raw
+
+    def test_unknown_keys_are_kept(self):
+        row = ResponseRow({"entry_number": 1, "entity": "42"})
+        fact = Fact({"field": "name", "value": "x", "priority": 2})
+        assert row.get("entity") == "42"
+        assert fact["priority"] == 2
+        assert fact.to_dict() == {"field": "name", "value": "x", "priority": 2}
+
+    def test_non_object_entries_are_dropped(self):
+        row = ResponseRow(
+            {"transformed_row": [None, "x", {"field": "name"}], "issue_logs": None}
+        )
+        assert [fact.get("field") for fact in row.transformed_row] == ["name"]
+        assert row.issue_logs == ()
+        assert row.converted_row == {}
+
+    def test_repeated_values_are_shared(self):
+        pool = {}
+        a = ResponseRow(json.loads(json.dumps(_raw_row(1))), pool)
+        b = ResponseRow(json.loads(json.dumps(_raw_row(2))), pool)
+        assert a.transformed_row[0].field is b.transformed_row[0].field
+        fact_a, fact_b = a.transformed_row[0], b.transformed_row[0]
+        assert fact_a.get("entry-date") is fact_b.get("entry-date")
+
+    def test_compact_row_passes_compact_rows_through(self):
+        row = ResponseRow(_raw_row(1))
+        assert compact_row(row) is row
+        assert compact_row(_raw_row(1)) == row
+
+    def test_survives_pickling(self):
+        row = ResponseRow(_raw_row(1))
+        assert pickle.loads(pickle.dumps(row)) == row
+
+    def test_uses_a_fraction_of_the_memory_of_raw_rows(self):
+        payloads = [json.dumps(_raw_row(n)) for n in range(2000)]
+
+        tracemalloc.start()
+        try:
+            raw = [json.loads(p) for p in payloads]
+            raw_bytes = tracemalloc.get_traced_memory()[0]
+            del raw
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            pool = {}
+            compact = [ResponseRow(json.loads(p), pool) for p in payloads]
+            compact_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        assert len(compact) == 2000
+        assert compact_bytes * 2 < raw_bytes
@@ -0,0 +1,180 @@
+from unittest.mock import Mock, patch
+
+from application.blueprints.datamanager.services import result_store
+from application.blueprints.datamanager.services.async_api import (
+    fetch_response_details,
+)
+
+_GET = "application.blueprints.datamanager.services.async_api.async_api_http.get"
+
+
+def _upstream(total, fail_at=None):
+    """Fake response-details endpoint holding `total` rows."""
+
+    def get(url, params):
+        offset, limit = params["offset"], params["limit"]
+        if offset == fail_at:
+            raise Exception("boom")
+        response = Mock()
+        response.status_code = 200
+        response.content = b"[]"
+        response.json.return_value = [
+            {"entry_number": n + 1, "url": url}
+            for n in range(offset, min(offset + limit, total))
+        ]
+        return response
+
+    return get
+
+
+def _fetch(get, request_id="req-1", **kwargs):
+    with patch(_GET, side_effect=get) as mock_get:
+        rows = fetch_response_details(request_id, **kwargs)
+    return rows, mock_get.call_count
+
+
+def _offsets(mock_get):
+    return [c.kwargs["params"]["offset"] for c in mock_get.call_args_list]
+
+
+class TestResultStore:
+    def test_full_read_is_stored_and_served_without_upstream(self, app):
+        with app.test_request_context():
+            first, _ = _fetch(_upstream(250))
+            assert result_store.stored_row_count("req-1") == 250
+            second, calls = _fetch(_upstream(250))
+        assert second == first
+        assert calls == 0
+
+    def test_overlapping_slice_fetches_only_missing_rows(self, app):
+        offsets = []
+        get = _upstream(1000)
+
+        def recording_get(url, params):
+            offsets.append((params["offset"], params["limit"]))
+            return get(url, params)
+
+        with app.test_request_context():
+            rows, _ = _fetch(recording_get, start_offset=100, max_rows=50)
+            assert [r["entry_number"] for r in rows] == list(range(101, 151))
+            offsets.clear()
+            rows, _ = _fetch(recording_get, start_offset=0, max_rows=200)
+        assert [r["entry_number"] for r in rows] == list(range(1, 201))
+        assert offsets == [(0, 100), (150, 50)]
+
+    def test_full_read_after_slice_reuses_stored_rows(self, app):
+        with app.test_request_context():
+            _fetch(_upstream(250), start_offset=0, max_rows=100)
+            assert result_store.stored_row_count("req-1") is None
+            with patch(_GET, side_effect=_upstream(250)) as mock_get:
+                rows = fetch_response_details("req-1")
+            assert result_store.stored_row_count("req-1") == 250
+        assert [r["entry_number"] for r in rows] == list(range(1, 251))
+        assert min(_offsets(mock_get)) == 100
+
+    def test_slice_past_the_end_served_from_store(self, app):
+        with app.test_request_context():
+            _fetch(_upstream(250))
+            rows, calls = _fetch(_upstream(250), start_offset=200, max_rows=500)
+        assert [r["entry_number"] for r in rows] == list(range(201, 251))
+        assert calls == 0
+
+    def test_truncated_read_resumes_from_failed_page(self, app):
+        with app.test_request_context():
+            rows, _ = _fetch(_upstream(250, fail_at=100))
+            assert len(rows) == 100
+            assert result_store.stored_row_count("req-1") is None
+            with patch(_GET, side_effect=_upstream(250)) as mock_get:
+                rows = fetch_response_details("req-1")
+        assert [r["entry_number"] for r in rows] == list(range(1, 251))
+        assert min(_offsets(mock_get)) == 100
+
+    def test_store_shared_between_workers(self, app):
+        with app.test_request_context():
+            _fetch(_upstream(10))
+        # A second worker sees the same file through a fresh connection.
+        with app.test_request_context():
+            rows, calls = _fetch(_upstream(10))
+        assert len(rows) == 10
+        assert calls == 0
+
+    def test_least_recently_read_request_evicted_over_size_limit(
+        self, app, monkeypatch
+    ):
+        with app.test_request_context():
+            _fetch(_upstream(50), request_id="old")
+            _fetch(_upstream(50), request_id="recent")
+            result_store.stored_row_count("recent")
+            monkeypatch.setitem(app.config, "RESULT_STORE_MAX_BYTES", 10000)
+            _fetch(_upstream(50), request_id="new")
+            assert result_store.stored_row_count("old") is None
+            assert result_store.stored_row_count("recent") == 50
+            assert result_store.stored_row_count("new") == 50
+
+    def test_disabled_store_always_reads_upstream(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "RESULT_STORE_DIR", "")
+        with app.test_request_context():
+            _fetch(_upstream(10))
+            _, calls = _fetch(_upstream(10))
+            assert result_store.stored_row_count("req-1") is None
+        assert calls == 1
+
+    def test_rows_evicted_mid_read_are_fetched_again(self, app):
+        with app.test_request_context():
+            _fetch(_upstream(250))
+            # Another worker evicts the request after its ranges were looked up.
+            with patch.object(result_store, "iter_stored_rows", return_value=iter([])):
+                with patch(_GET, side_effect=_upstream(250)) as mock_get:
+                    rows = fetch_response_details("req-1", max_rows=150)
+        assert [r["entry_number"] for r in rows] == list(range(1, 151))
+        assert min(_offsets(mock_get)) == 0
+
+    def test_unreadable_store_falls_back_to_upstream(self, app):
+        with app.test_request_context():
+            _fetch(_upstream(250))
+            with patch.object(
+                result_store, "_connect", side_effect=result_store.sqlite3.Error("io")
+            ):
+                rows, calls = _fetch(_upstream(250))
+        assert [r["entry_number"] for r in rows] == list(range(1, 251))
+        assert calls > 0
+
+    def test_failed_write_releases_the_store_and_keeps_rows(self, app):
+        writer_class = result_store._RowWriter
+        with app.test_request_context(), patch.object(
+            writer_class, "add", side_effect=result_store.sqlite3.Error("locked")
+        ), patch.object(
+            writer_class, "abort", autospec=True, side_effect=writer_class.abort
+        ) as mock_abort:
+            rows, _ = _fetch(_upstream(50))
+        assert len(rows) == 50
+        assert mock_abort.call_count == 1
+
+    def test_unwritable_store_directory_reads_upstream(self, app):
+        with app.test_request_context(), patch(
+            "application.blueprints.datamanager.services.result_store.os.makedirs",
+            side_effect=PermissionError("read-only file system"),
+        ):
+            rows, calls = _fetch(_upstream(250))
+            assert result_store.stored_row_count("req-1") is None
+        assert len(rows) == 250
+        assert calls > 0
+
+    def test_rows_already_stored_do_not_count_towards_size(self, app):
+        with app.test_request_context():
+            _fetch(_upstream(50))
+            size = _stored_size("req-1")
+            # A second worker storing the same rows concurrently adds nothing.
+            writer = result_store._RowWriter("req-1", 0)
+            for n in range(50):
+                writer.add({"entry_number": n + 1})
+            writer.close()
+            assert _stored_size("req-1") == size
+
+
+def _stored_size(request_id):
+    with result_store.closing(result_store._connect(result_store._store_path())) as c:
+        row = c.execute(
+            "SELECT size_bytes FROM stored_request WHERE request_id = ?", (request_id,)
+        ).fetchone()
+    return row[0]
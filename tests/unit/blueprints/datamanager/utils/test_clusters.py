@@ -0,0 +1,60 @@
+import numpy as np
+
+from application.blueprints.datamanager.utils.clusters import (
+    CLUSTER_MAX_ZOOM,
+    ClusterIndex,
+    abbreviate_count,
+)
+
+
+def _points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(-2, -1, n), rng.uniform(52, 53, n)])
+
+
+class TestClusterIndex:
+    def test_every_zoom_accounts_for_every_point(self):
+        index = ClusterIndex(_points(2000))
+        previous = 0
+        for zoom in range(CLUSTER_MAX_ZOOM + 2):
+            clusters = index.clusters(zoom)
+            assert sum(count for _, _, count, _, _ in clusters) == 2000
+            # Zooming in only ever splits clusters.
+            assert len(clusters) >= previous
+            previous = len(clusters)
+        assert len(index.clusters(CLUSTER_MAX_ZOOM + 1)) == 2000
+
+    def test_single_point_clusters_name_their_point(self):
+        points = _points(50)
+        index = ClusterIndex(points)
+        for lon, lat, count, point, _ in index.clusters(CLUSTER_MAX_ZOOM + 5):
+            assert count == 1
+            assert (lon, lat) == tuple(points[point])
+        real = [c for c in index.clusters(0) if c[2] > 1]
+        assert real and all(point == -1 for _, _, _, point, _ in real)
+
+    def test_cluster_splits_at_its_expansion_zoom(self):
+        index = ClusterIndex([[-1.5, 52.5], [-1.5001, 52.5001], [1.0, 51.0]])
+        near = next(c for c in index.clusters(4) if c[2] == 2)
+        expansion_zoom = near[4]
+        assert len([c for c in index.clusters(expansion_zoom - 1) if c[2] == 2]) == 1
+        assert all(c[2] == 1 for c in index.clusters(expansion_zoom))
+
+    def test_bbox_limits_clusters(self):
+        index = ClusterIndex([[-1.5, 52.5], [1.0, 51.0]])
+        assert index.bbox == (-1.5, 51.0, 1.0, 52.5)
+        [(lon, lat, *_)] = index.clusters(14, (-2, 52, -1, 53))
+        assert (lon, lat) == (-1.5, 52.5)
+
+    def test_empty(self):
+        index = ClusterIndex([])
+        assert len(index) == 0
+        assert index.bbox is None
+        assert index.clusters(5) == []
+
+
+def test_abbreviate_count():
+    assert abbreviate_count(999) == "999"
+    assert abbreviate_count(1000) == "1k"
+    assert abbreviate_count(1234) == "1.2k"
+    assert abbreviate_count(12345) == "12k"
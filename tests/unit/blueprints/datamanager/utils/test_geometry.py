@@ -0,0 +1,190 @@
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+import shapely
+from shapely import wkt
+from shapely.errors import ShapelyError
+
+from application.blueprints.datamanager.utils.geometry import (
+    GEO_TOLERANCE,
+    GeometryCache,
+    geojson_features,
+    geometries_differ,
+    simplify_feature_collection,
+    zoom_precision,
+    zoom_tolerance,
+)
+
+_SQUARE = "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))"
+
+
+def _hausdorff_differs(res_wkt, plat_wkt):
+    """The one-pair-at-a-time comparison the batch must agree with."""
+    try:
+        g1, g2 = wkt.loads(res_wkt), wkt.loads(plat_wkt)
+    except Exception:
+        return res_wkt.strip() != plat_wkt.strip()
+    if g1.is_empty or g2.is_empty:
+        return g1.is_empty != g2.is_empty
+    return g1.hausdorff_distance(g2) > GEO_TOLERANCE
+
+
+class TestGeometriesDiffer:
+    def test_identical_text_never_differs(self):
+        assert geometries_differ([" POINT (1 2)"], ["POINT (1 2) "]) == [False]
+
+    def test_reprocessing_noise_ignored(self):
+        assert geometries_differ(
+            ["POINT (1 2)", _SQUARE],
+            [
+                "MULTIPOINT ((1.000000 2.000000))",
+                "POLYGON ((1 0.00001, 1 1, 0 1, 0 0, 1 0.00001))",
+            ],
+        ) == [False, False]
+
+    def test_moved_geometry_differs(self):
+        assert geometries_differ(
+            ["POINT (1 2)", _SQUARE],
+            ["POINT (5 6)", "POLYGON ((0 0, 1 0, 1 1.01, 0 1, 0 0))"],
+        ) == [True, True]
+
+    def test_unparseable_falls_back_to_text(self):
+        assert geometries_differ(
+            ["not wkt", "not wkt"], ["not wkt ", "POINT (1 2)"]
+        ) == [False, True]
+
+    def test_empty_only_differs_from_non_empty(self):
+        assert geometries_differ(
+            ["POINT EMPTY", "POINT EMPTY"], ["POLYGON EMPTY", "POINT (1 2)"]
+        ) == [False, True]
+
+    def test_prefilters_skip_hausdorff(self):
+        with patch(
+            "application.blueprints.datamanager.utils.geometry.shapely.hausdorff_distance"
+        ) as mock_hausdorff:
+            result = geometries_differ(
+                [_SQUARE, _SQUARE, "POINT (1 2)"],
+                [
+                    "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))",  # same text
+                    "POLYGON ((5 5, 6 5, 6 6, 5 6, 5 5))",  # bounding boxes apart
+                    "POINT (1.00001 2)",  # vertices within tolerance
+                ],
+            )
+        assert result == [False, True, False]
+        mock_hausdorff.assert_not_called()
+
+    def test_matches_pairwise_hausdorff(self):
+        rng = random.Random(1)
+        res, plat = [], []
+        for _ in range(300):
+            x, y = rng.uniform(-3, 1), rng.uniform(50, 55)
+            size = rng.uniform(0.0005, 0.01)
+            square = shapely.box(x, y, x + size, y + size)
+            shift = rng.choice([0, 0.00005, 0.0002, 0.01])
+            moved = shapely.box(x + shift, y, x + size + shift, y + size)
+            # Same shape drawn from a different starting vertex.
+            rotated = shapely.Polygon(list(square.exterior.coords)[1:] + [(x, y)])
+            res.append(square.wkt)
+            plat.append(rng.choice([moved, rotated]).wkt)
+        assert geometries_differ(res, plat) == [
+            _hausdorff_differs(a, b) for a, b in zip(res, plat)
+        ]
+
+
+class TestGeometryCache:
+    def test_parses_each_text_once(self):
+        cache = GeometryCache(maxsize=10)
+        first = cache.get(_SQUARE)
+        assert cache.get(f" {_SQUARE}\n") is first
+        assert cache.get_many([_SQUARE, "POINT (1 2)"])[0] is first
+        assert len(cache) == 2
+
+    def test_derived_values(self):
+        parsed = GeometryCache().get(_SQUARE)
+        assert parsed.geom_type == "Polygon"
+        assert parsed.bounds == (0.0, 0.0, 1.0, 1.0)
+        assert parsed.geojson["type"] == "Polygon"
+        assert parsed.geojson is parsed.geojson
+        assert shapely.Point(parsed.point).within(parsed.geometry)
+
+    def test_evicts_least_recently_used(self):
+        cache = GeometryCache(maxsize=2)
+        a = cache.get("POINT (1 1)")
+        cache.get("POINT (2 2)")
+        cache.get("POINT (1 1)")
+        cache.get("POINT (3 3)")
+        assert len(cache) == 2
+        assert cache.get("POINT (1 1)") is a
+        assert cache.get_many(["POINT (2 2)"])[0] is not None
+        assert len(cache) == 2
+
+    def test_invalid_wkt_is_not_cached(self):
+        cache = GeometryCache()
+        with pytest.raises(ShapelyError):
+            cache.get("not wkt")
+        assert cache.get_many(["not wkt", "POINT (1 2)", "not wkt"])[::2] == [
+            None,
+            None,
+        ]
+        assert len(cache) == 1
+
+
+_CIRCLE = shapely.Point(-1.5, 52.1).buffer(0.01, 64).wkt
+
+
+class TestGeojsonFeatures:
+    def test_zoom_helpers(self):
+        assert zoom_tolerance(1) == zoom_tolerance(0) / 2
+        assert zoom_precision(0) == 2
+        assert zoom_precision(14) == 6
+        assert zoom_precision(22) == 7
+
+    def test_simplifies_by_zoom_and_rounds(self):
+        def coordinates(zoom):
+            [feature], _ = geojson_features([(_CIRCLE, {"entity": "1"})], zoom)
+            return json.loads(feature)["geometry"]["coordinates"][0]
+
+        far, near, full = coordinates(6), coordinates(16), coordinates(None)
+        assert len(far) < len(near) < len(full) + 1
+        assert len(full) == 257
+        assert all(round(x, 3) == x and round(y, 3) == y for x, y in far)
+
+    def test_tiny_shapes_kept_whole(self):
+        tiny = "POLYGON ((0 0, 0.00001 0, 0.00001 0.00001, 0 0))"
+        [feature], _ = geojson_features([(tiny, {})], zoom=2)
+        assert json.loads(feature)["geometry"]["type"] == "Polygon"
+
+    def test_points_bounds_and_invalid_items(self):
+        features, bounds = geojson_features(
+            [(_CIRCLE, {"entity": "1"}), ("not wkt", {}), ("POINT EMPTY", {})],
+            as_points=True,
+        )
+        [feature] = [json.loads(f) for f in features]
+        assert feature["geometry"]["type"] == "Point"
+        assert feature["properties"] == {"entity": "1"}
+        # A point's bounds are the point itself, for bbox filtering.
+        assert bounds.tolist() == [
+            pytest.approx(feature["geometry"]["coordinates"] * 2, abs=1e-7)
+        ]
+
+    def test_simplify_feature_collection(self):
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"name": "a"},
+                    "geometry": json.loads(shapely.to_geojson(wkt.loads(_CIRCLE))),
+                },
+                {"type": "Feature", "properties": {}, "geometry": None},
+            ],
+        }
+        simplified = simplify_feature_collection(collection, 8)
+        ring = simplified["features"][0]["geometry"]["coordinates"][0]
+        assert len(ring) < 257
+        assert simplified["features"][0]["properties"] == {"name": "a"}
+        assert simplified["features"][1] == collection["features"][1]
+        # The original is left as it was.
+        assert len(collection["features"][0]["geometry"]["coordinates"][0]) == 257
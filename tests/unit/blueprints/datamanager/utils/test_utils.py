@@ -2,9 +2,11 @@ from unittest.mock import patch, Mock
 
 from application.blueprints.datamanager.utils import (
     get_spec_fields_union,
+    handle_error,
     order_table_fields,
     read_raw_csv_preview,
 )
+from application.http_client import CircuitOpenError
 
 
 class TestOrderTableFields:
@@ -62,7 +64,7 @@ class TestReadRawCsvPreview:
         mock_response = Mock()
         mock_response.content = csv_content.encode("utf-8")
         with patch(
-            "application.blueprints.datamanager.utils.requests.get",
+            "application.blueprints.datamanager.utils.source_http.get",
             return_value=mock_response,
         ):
             headers, rows = read_raw_csv_preview("http://example.com/test.csv")
@@ -79,7 +81,7 @@ class TestReadRawCsvPreview:
         mock_response = Mock()
         mock_response.content = csv_content.encode("utf-8")
         with patch(
-            "application.blueprints.datamanager.utils.requests.get",
+            "application.blueprints.datamanager.utils.source_http.get",
             return_value=mock_response,
         ):
             headers, rows = read_raw_csv_preview("http://example.com/test.csv")
@@ -90,7 +92,7 @@ class TestReadRawCsvPreview:
         mock_response = Mock()
         mock_response.content = csv_content.encode("utf-8")
         with patch(
-            "application.blueprints.datamanager.utils.requests.get",
+            "application.blueprints.datamanager.utils.source_http.get",
             return_value=mock_response,
         ):
             _, rows = read_raw_csv_preview("http://example.com/test.csv", max_rows=5)
@@ -98,7 +100,7 @@ class TestReadRawCsvPreview:
 
     def test_request_failure_returns_empty(self):
         with patch(
-            "application.blueprints.datamanager.utils.requests.get",
+            "application.blueprints.datamanager.utils.source_http.get",
             side_effect=Exception("timeout"),
         ):
             headers, rows = read_raw_csv_preview("http://example.com/test.csv")
@@ -117,7 +119,7 @@ class TestGetSpecFieldsUnion:
         mock_response.raise_for_status.return_value = None
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.utils.requests.get",
+                "application.blueprints.datamanager.utils.datasette_http.get",
                 return_value=mock_response,
             ):
                 result = get_spec_fields_union("test-dataset")
@@ -129,7 +131,7 @@ class TestGetSpecFieldsUnion:
         mock_response.raise_for_status.return_value = None
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.utils.requests.get",
+                "application.blueprints.datamanager.utils.datasette_http.get",
                 return_value=mock_response,
             ) as mock_get:
                 result = get_spec_fields_union(None)
@@ -139,8 +141,25 @@ class TestGetSpecFieldsUnion:
     def test_request_failure_returns_empty(self, app):
         with app.app_context():
             with patch(
-                "application.blueprints.datamanager.utils.requests.get",
+                "application.blueprints.datamanager.utils.datasette_http.get",
                 side_effect=Exception("Network error"),
             ):
                 result = get_spec_fields_union("test-dataset")
         assert result == []
+
+
+class TestHandleError:
+    def test_unexpected_error_is_a_500(self, app):
+        with app.test_request_context():
+            body, status = handle_error(ValueError("boom"))
+        assert status == 500
+        assert "boom" in body
+
+    def test_open_circuit_is_a_503_with_retry_after(self, app):
+        with app.test_request_context():
+            body, status, headers = handle_error(CircuitOpenError("circuit open"))
+        assert status == 503
+        assert headers["Retry-After"] == str(
+            int(app.config["ASYNC_API_BREAKER_OPEN_SECONDS"])
+        )
+        assert "temporarily unavailable" in body
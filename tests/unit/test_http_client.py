@@ -0,0 +1,161 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from urllib3 import Retry
+
+from application.http_client import CircuitBreaker, CircuitOpenError, HTTPClient
+
+
+class TestServiceClient:
+    def test_applies_default_timeout_and_headers(self):
+        client = HTTPClient()
+        service = client.service("svc", timeout=5, headers={"User-Agent": "ua"})
+        with patch.object(client.session(), "request", return_value=Mock()) as req:
+            service.get("https://example.com", headers={"Accept": "text/csv"})
+        req.assert_called_once_with(
+            "GET",
+            "https://example.com",
+            timeout=5,
+            headers={"User-Agent": "ua", "Accept": "text/csv"},
+        )
+
+    def test_per_call_timeout_overrides_default(self):
+        client = HTTPClient()
+        service = client.service("svc", timeout=5)
+        with patch.object(client.session(), "request", return_value=Mock()) as req:
+            service.post("https://example.com", json={}, timeout=1)
+        assert req.call_args.kwargs["timeout"] == 1
+
+    def test_service_is_registered_once(self):
+        client = HTTPClient()
+        assert client.service("svc", timeout=5) is client.service("svc")
+
+
+class TestHTTPClient:
+    def test_services_share_one_pooled_session(self):
+        client = HTTPClient()
+        a = client.service("a")
+        b = client.service("b")
+        assert a.session is b.session
+
+    def test_retrying_service_gets_its_own_session(self):
+        client = HTTPClient()
+        plain = client.service("plain")
+        retrying = client.service("retrying", retries=Retry(total=3))
+        assert retrying.session is not plain.session
+        adapter = retrying.session.get_adapter("https://example.com")
+        assert adapter.max_retries.total == 3
+
+    def test_pool_sizes_read_from_app_config(self, app):
+        client = HTTPClient()
+        app.config["HTTP_POOL_MAXSIZE"] = 4
+        try:
+            client.init_app(app)
+        finally:
+            app.config["HTTP_POOL_MAXSIZE"] = 10
+        adapter = client.session().get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 4
+
+    def test_sessions_rebuilt_after_fork(self):
+        client = HTTPClient()
+        parent_session = client.session()
+        with patch("application.http_client.os.getpid", return_value=-1):
+            assert client.session() is not parent_session
+
+
+def _breaker(**kwargs):
+    settings = dict(failure_rate=0.5, min_calls=4, window=30, open_seconds=30)
+    settings.update(kwargs)
+    return CircuitBreaker("svc", **settings)
+
+
+def _response(status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    return response
+
+
+class TestCircuitBreaker:
+    def test_opens_once_failure_rate_reached(self):
+        client = HTTPClient()
+        service = client.service("svc", breaker=_breaker())
+        responses = [_response(200), _response(500), _response(200), _response(502)]
+        with patch.object(client.session(), "request", side_effect=responses):
+            for _ in responses:
+                service.get("https://example.com")
+        assert service.breaker.state == CircuitBreaker.OPEN
+
+    def test_open_breaker_fails_fast(self):
+        client = HTTPClient()
+        service = client.service("svc", breaker=_breaker())
+        error = requests.exceptions.ConnectTimeout("timed out")
+        with patch.object(client.session(), "request", side_effect=error) as req:
+            for _ in range(4):
+                with pytest.raises(requests.exceptions.ConnectTimeout):
+                    service.get("https://example.com")
+            with pytest.raises(CircuitOpenError):
+                service.get("https://example.com")
+        assert req.call_count == 4
+
+    def test_stays_closed_below_min_calls(self):
+        breaker = _breaker()
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record(failed=True, seconds=0.1)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = _breaker(slow_call_seconds=5)
+        for _ in range(4):
+            breaker.before_call()
+            breaker.record(failed=False, seconds=6)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probe_closes_breaker(self):
+        breaker = _breaker(min_calls=1)
+        breaker.before_call()
+        breaker.record(failed=True, seconds=0.1)
+        with patch("application.http_client.time.monotonic", return_value=1e9):
+            assert breaker.before_call() is True
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            # Only one probe at a time.
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+            breaker.record(failed=False, seconds=0.1, probe=True)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens_breaker(self):
+        breaker = _breaker(min_calls=1)
+        breaker.before_call()
+        breaker.record(failed=True, seconds=0.1)
+        with patch("application.http_client.time.monotonic", return_value=1e9):
+            probe = breaker.before_call()
+            breaker.record(failed=True, seconds=0.1, probe=probe)
+            assert breaker.state == CircuitBreaker.OPEN
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+
+    def test_only_probe_outcome_leaves_half_open(self):
+        breaker = _breaker(min_calls=1)
+        # A call that started while the breaker was still closed...
+        assert breaker.before_call() is False
+        breaker.before_call()
+        breaker.record(failed=True, seconds=0.1)
+        with patch("application.http_client.time.monotonic", return_value=1e9):
+            probe = breaker.before_call()
+            # ...finishes while the probe is in flight, and is ignored.
+            breaker.record(failed=False, seconds=0.1)
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+            breaker.record(failed=True, seconds=0.1, probe=probe)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_settings_read_from_app_config(self, app):
+        client = HTTPClient()
+        breaker = CircuitBreaker("svc", config_prefix="ASYNC_API_BREAKER")
+        client.service("svc", breaker=breaker)
+        client.init_app(app)
+        assert breaker.min_calls == app.config["ASYNC_API_BREAKER_MIN_CALLS"]
+        assert breaker.open_seconds == app.config["ASYNC_API_BREAKER_OPEN_SECONDS"]
@@ -0,0 +1,47 @@
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+
+from application.blueprints.datamanager.utils.geometry import geometries_differ
+from application.process_pool import ProcessPool
+
+_RES = ["POINT (1 2)", "POINT (3 4)", "not wkt", "POINT (5 6)", "POINT (7 8)"]
+_PLAT = ["POINT (1 2)", "POINT (3 5)", "POINT (0 0)", "POINT (5 6.00001)", ""]
+
+
+def _pool(workers, min_items=2):
+    pool = ProcessPool()
+    pool.init_app(
+        Mock(
+            config={
+                "COMPUTE_PROCESS_WORKERS": workers,
+                "COMPUTE_PROCESS_MIN_ITEMS": min_items,
+            },
+            extensions={},
+        )
+    )
+    return pool
+
+
+class TestProcessPool:
+    def test_small_batch_runs_in_thread(self):
+        pool = _pool(workers=2, min_items=10)
+        fn = Mock(return_value="result")
+        assert pool.map_chunks(fn, [1, 2], [3, 4], tolerance=1) == ["result"]
+        fn.assert_called_once_with([1, 2], [3, 4], tolerance=1)
+        assert pool._executor is None
+
+    def test_chunks_run_in_processes_in_batch_order(self):
+        pool = _pool(workers=2)
+        try:
+            chunks = pool.map_chunks(geometries_differ, _RES, _PLAT)
+        finally:
+            pool.shutdown()
+        assert len(chunks) == 3
+        assert [d for chunk in chunks for d in chunk] == geometries_differ(_RES, _PLAT)
+
+    def test_broken_pool_runs_batch_in_thread(self):
+        pool = _pool(workers=2)
+        with patch.object(pool, "_get_executor", side_effect=BrokenProcessPool()):
+            assert pool.map_chunks(geometries_differ, _RES, _PLAT) == [
+                geometries_differ(_RES, _PLAT)
+            ]